@@ -0,0 +1,139 @@
+"""
+Paginated Adzuna harvester with several requests in flight behind a token bucket
+
+The free API tier allows 25 requests a minute and 250 a day (1,000 a week, 2,500 a month).
+The defaults stay inside them: 14 queries of up to 2 pages at 25 requests a minute is at
+most 28 requests, which fits the 72s harvest budget (80% of ADZUNA_SOURCE_TIMEOUT)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from rate_limiter import TokenBucket, parse_retry_after
+
+
+class AdzunaHarvester:
+    BASE_URL = "https://api.adzuna.com/v1/api/jobs/gb/search"
+    SEARCH_TERMS = ['python', 'javascript', 'java', 'developer', 'software engineer']
+    LOCATIONS = [None, 'London', 'Manchester', 'Birmingham', 'Leeds', 'Bristol', 'Edinburgh', 'Glasgow', 'Cambridge']
+    CATEGORY = 'it-jobs'
+    # Free tier: 25 requests a minute
+    RATE_LIMIT = 25 / 60
+
+    def __init__(self, session, app_id, app_key, max_pages=None, concurrency=None,
+                 rate_limit=None, results_per_page=50, time_budget=None, max_retries=3):
+        self.session = session
+        self.app_id = app_id
+        self.app_key = app_key
+        self.max_pages = max_pages or int(os.environ.get('ADZUNA_MAX_PAGES', 2))
+        self.concurrency = concurrency or int(os.environ.get('ADZUNA_CONCURRENCY', 4))
+        if rate_limit is None:
+            rate_limit = float(os.environ.get('ADZUNA_RATE_LIMIT', self.RATE_LIMIT))
+        # No burst allowance: a full bucket of requests at the start would break the per-minute quota
+        self.limiter = TokenBucket(rate_limit)
+        self.results_per_page = results_per_page
+        self.time_budget = time_budget
+        self.max_retries = max_retries
+        self.stats = {'requests': 0, 'failed': 0, 'pages': 0, 'postings': 0, 'elapsed': 0.0}
+        self.stats_lock = threading.Lock()
+
+    def build_queries(self):
+        """A category-only sweep of every location facet, then each search term UK-wide.
+        First pages are requested in this order, so a run the time budget or quota cuts short
+        still covers every location before it spends requests on search terms"""
+        queries = []
+        for where in self.LOCATIONS:
+            params = {'category': self.CATEGORY}
+            if where:
+                params['where'] = where
+            queries.append(params)
+        queries.extend({'category': self.CATEGORY, 'what': term} for term in self.SEARCH_TERMS)
+        return queries
+
+    def fetch_page(self, query, page, deadline):
+        """Fetch one results page, retrying throttled or failed responses"""
+        params = {
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'results_per_page': self.results_per_page,
+            'content-type': 'application/json',
+            **query
+        }
+
+        for attempt in range(self.max_retries + 1):
+            if not self.limiter.acquire(deadline):
+                return None
+            # A request never waits past the harvest budget
+            timeout = 15 if deadline is None else max(1.0, min(15, deadline - time.monotonic()))
+            with self.stats_lock:
+                self.stats['requests'] += 1
+            response = self.session.get(f"{self.BASE_URL}/{page}", params=params, timeout=timeout)
+
+            if response.status_code == 429 or response.status_code >= 500:
+                self.limiter.throttle(parse_retry_after(response.headers.get('Retry-After')))
+                continue
+            if response.status_code != 200:
+                print(f"   ❌ Adzuna page {page} for {query} returned {response.status_code}")
+                with self.stats_lock:
+                    self.stats['failed'] += 1
+                return None
+
+            self.limiter.recover()
+            return response.json().get('results', [])
+
+        print(f"   ❌ Adzuna page {page} for {query} still throttled after {self.max_retries} retries")
+        with self.stats_lock:
+            self.stats['failed'] += 1
+        return None
+
+    def iter_pages(self):
+        """Yield ((query index, page), results) as pages arrive, paging each query until
+        results run out, the page cap or the time budget"""
+        queries = self.build_queries()
+        start = time.monotonic()
+        deadline = start + self.time_budget if self.time_budget else None
+
+        print(f"🔍 Adzuna: Harvesting {len(queries)} queries (up to {self.max_pages} pages each, "
+              f"{self.concurrency} in flight)...")
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='adzuna')
+        try:
+            futures = {executor.submit(self.fetch_page, query, 1, deadline): (index, 1)
+                       for index, query in enumerate(queries)}
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, page = futures.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        self.stats['failed'] += 1
+                        print(f"   ❌ Adzuna request failed: {e}")
+                        continue
+                    if not results:
+                        continue
+
+                    self.stats['pages'] += 1
+                    self.stats['postings'] += len(results)
+
+                    out_of_time = deadline is not None and time.monotonic() >= deadline
+                    if len(results) == self.results_per_page and page < self.max_pages and not out_of_time:
+                        next_future = executor.submit(self.fetch_page, queries[index], page + 1, deadline)
+                        futures[next_future] = (index, page + 1)
+
+                    self.stats['elapsed'] = time.monotonic() - start
+                    yield (index, page), results
+        finally:
+            # A consumer that stops early should not wait for queued first pages
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self.stats['elapsed'] = time.monotonic() - start
+
+    def harvest(self):
+        """Every page of every query, assembled in query/page order so the output does not
+        depend on completion order"""
+        pages = dict(self.iter_pages())
+        return [job for key in sorted(pages) for job in pages[key]]
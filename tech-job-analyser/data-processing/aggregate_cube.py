@@ -0,0 +1,284 @@
+"""
+Aggregate cube
+Materializes posting counts, salary sums and salary histograms for every combination
+of skill, location, seniority level and work arrangement, including each roll-up where some
+of them are left open, so a cross-question such as "fully remote Python roles in Manchester"
+is one dict lookup instead of a rescan of the postings. A posting counts once per skill it
+mentions, so the cells that roll skills up are built from the postings themselves rather
+than summed from the per-skill cells. Histogram bins are £1 wide and sparse, so a cell's
+median is the exact (whole-pound) median of its salaries. The dashboard's flat lists are
+projections of it
+"""
+
+import os
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from analysis_engine import (
+    MAX_LOCATIONS,
+    REMOTE_ORDER,
+    experience_records,
+    finish_language_salaries,
+    remote_arrangements
+)
+from seniority import SENIORITY_LEVELS
+from skill_tagger import SKILL_TAGGER
+
+DIMENSIONS = ('skill', 'location', 'seniority', 'remote')
+# Code of a dimension that is rolled up in a cell
+ALL = -1
+
+DEFAULT_CUBE_PATH = 'output/aggregate_cube.npz'
+# One bin per pound: a sparse row only stores the salaries a cell actually has
+BIN_WIDTH = 1
+
+
+class AggregateCube:
+    """Cells keyed by one member code per dimension (ALL where rolled up), each with its
+    posting count, salaried posting count, salary sum and a sparse salary histogram row"""
+
+    def __init__(self, members, codes, postings, salaried, salary_sum, histograms, bin_width=BIN_WIDTH):
+        self.members = members
+        self.codes = codes
+        self.postings = postings
+        self.salaried = salaried
+        self.salary_sum = salary_sum
+        self.histograms = histograms.tocsr()
+        self.histograms.sort_indices()
+        self.bin_width = bin_width
+        self.member_codes = {dimension: {name: code for code, name in enumerate(names)}
+                             for dimension, names in members.items()}
+        self.index = dict(zip(map(tuple, codes.tolist()), range(len(codes))))
+
+    @classmethod
+    def from_frame(cls, jobs_df, skill_hits, seniority=None):
+        """Cube of an analysis frame (with its remote column, when classified), its skill matrix and
+        seniority levels"""
+        return cls.from_columns(
+            jobs_df['salary_avg'].to_numpy(dtype=float),
+            jobs_df['location'].to_numpy(),
+            jobs_df['remote'].to_numpy() if 'remote' in jobs_df else remote_arrangements(jobs_df['text']),
+            skill_hits,
+            seniority
+        )
+
+    @classmethod
+    def from_columns(cls, salaries, locations, arrangements, skill_hits, levels=None, bin_width=BIN_WIDTH,
+                     max_value=500000):
+        """Cube of per-posting columns: one pass per grouping set over the postings (or the
+        posting x skill pairs when skills are grouped), then one combine over all of them"""
+        salaries = np.asarray(salaries, dtype=float)
+        count = len(salaries)
+        location_codes, location_names = pd.factorize(pd.Series(locations, dtype=object))
+        level_codes = (pd.Categorical(np.asarray(levels, dtype=object), categories=SENIORITY_LEVELS).codes
+                       if levels is not None else np.full(count, ALL))
+        members = {
+            'skill': list(SKILL_TAGGER.skills),
+            'location': list(location_names),
+            'seniority': list(SENIORITY_LEVELS),
+            'remote': list(REMOTE_ORDER)
+        }
+
+        posting_codes = np.column_stack([
+            np.full(count, ALL),
+            location_codes,
+            level_codes,
+            pd.Categorical(arrangements, categories=REMOTE_ORDER).codes
+        ]).astype(np.int32)
+        hits = sparse.csr_matrix(skill_hits).tocoo()
+        pair_codes = posting_codes[hits.row]
+        pair_codes[:, 0] = hits.col
+
+        cell_codes, cell_rows = [], []
+        for grouped in product((False, True), repeat=len(DIMENSIONS)):
+            grouped = np.array(grouped)
+            rows, codes = (hits.row, pair_codes) if grouped[0] else (np.arange(count), posting_codes)
+            # Postings with no value for a grouped dimension stay out of that grouping
+            keep = (codes[:, grouped] != ALL).all(axis=1)
+            cell_codes.append(np.where(grouped, codes[keep], ALL))
+            cell_rows.append(rows[keep])
+        rows = np.concatenate(cell_rows)
+
+        values = salaries[rows]
+        paid = ~np.isnan(values)
+        bins = int(max_value // bin_width) + 1
+        salary_bins = np.clip((values[paid] // bin_width).astype(np.int64), 0, bins - 1)
+        histograms = sparse.csr_matrix(
+            (np.ones(int(paid.sum()), dtype=np.int32), (np.flatnonzero(paid), salary_bins)),
+            shape=(len(rows), bins)
+        )
+        return cls.combine(
+            members, np.concatenate(cell_codes).astype(np.int32), np.ones(len(rows), dtype=np.int64),
+            paid.astype(np.int64), np.where(paid, values, 0.0), histograms, bin_width
+        )
+
+    @classmethod
+    def combine(cls, members, codes, postings, salaried, salary_sum, histograms, bin_width=BIN_WIDTH):
+        """Cube whose cells sum the given rows that share the same codes"""
+        radix = np.array([len(members[dimension]) + 1 for dimension in DIMENSIONS], dtype=np.int64)
+        weights = np.concatenate([np.cumprod(radix[::-1])[::-1][1:], [1]])
+        keys, inverse = np.unique((codes.astype(np.int64) + 1) @ weights, return_inverse=True)
+        inverse = inverse.ravel()
+        cells = len(keys)
+        cell_codes = ((keys[:, None] // weights) % radix - 1).astype(np.int32)
+
+        # Sparse indicator (cell x row) sums the histogram rows of each cell in one product
+        indicator = sparse.csr_matrix(
+            (np.ones(len(inverse), dtype=np.int32), (inverse, np.arange(len(inverse)))),
+            shape=(cells, len(inverse))
+        )
+        return cls(
+            members, cell_codes,
+            np.bincount(inverse, weights=postings, minlength=cells).astype(np.int64),
+            np.bincount(inverse, weights=salaried, minlength=cells).astype(np.int64),
+            np.bincount(inverse, weights=salary_sum, minlength=cells),
+            indicator @ histograms,
+            bin_width
+        )
+
+    def merge(self, other):
+        """Cube over the postings of both cubes; shards of one run combine exactly"""
+        members = {dimension: list(names) for dimension, names in self.members.items()}
+        other_codes = other.codes.copy()
+        for axis, dimension in enumerate(DIMENSIONS):
+            lookup = dict(self.member_codes[dimension])
+            for name in other.members[dimension]:
+                if name not in lookup:
+                    lookup[name] = len(members[dimension])
+                    members[dimension].append(name)
+            # The trailing ALL maps ALL (-1) to itself
+            remap = np.array([lookup[name] for name in other.members[dimension]] + [ALL], dtype=np.int32)
+            other_codes[:, axis] = remap[other.codes[:, axis]]
+        return AggregateCube.combine(
+            members,
+            np.concatenate([self.codes, other_codes]),
+            np.concatenate([self.postings, other.postings]),
+            np.concatenate([self.salaried, other.salaried]),
+            np.concatenate([self.salary_sum, other.salary_sum]),
+            sparse.vstack([self.histograms, other.histograms], format='csr'),
+            self.bin_width
+        )
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _row(self, filters):
+        key = [ALL] * len(DIMENSIONS)
+        for dimension, name in filters.items():
+            if dimension not in self.member_codes:
+                raise ValueError(f"Unknown cube dimension {dimension!r}; expected one of {', '.join(DIMENSIONS)}")
+            if name is None:
+                continue
+            code = self.member_codes[dimension].get(name)
+            if code is None:
+                return None
+            key[DIMENSIONS.index(dimension)] = code
+        return self.index.get(tuple(key))
+
+    def quantile(self, row, p=0.5):
+        """Salary quantile of one cell, interpolated between the two salaries around it as
+        numpy and pandas do; each salary is read as the lower edge of its bin"""
+        start, end = self.histograms.indptr[row], self.histograms.indptr[row + 1]
+        bins = self.histograms.indices[start:end]
+        cumulative = np.cumsum(self.histograms.data[start:end])
+        position = p * (cumulative[-1] - 1)
+        lower, upper = bins[np.searchsorted(cumulative, [np.floor(position), np.ceil(position)], side='right')]
+        return float(lower + (upper - lower) * (position - np.floor(position))) * self.bin_width
+
+    def cell(self, **filters):
+        """Postings, salaried postings, mean and median salary of one cell, e.g.
+        cell(skill='Python', location='Manchester', remote='Fully remote'); dimensions left
+        out (or None) are rolled up"""
+        row = self._row(filters)
+        salaried = int(self.salaried[row]) if row is not None else 0
+        return {
+            'postings': int(self.postings[row]) if row is not None else 0,
+            'salaried': salaried,
+            'mean_salary': float(self.salary_sum[row] / salaried) if salaried else None,
+            'median_salary': float(self.quantile(row)) if salaried else None
+        }
+
+    def rollup(self, dimension, **filters):
+        """cell() per member of one dimension under the other filters, for members with postings"""
+        if dimension not in self.members:
+            raise ValueError(f"Unknown cube dimension {dimension!r}; expected one of {', '.join(DIMENSIONS)}")
+        cells = {}
+        for name in self.members[dimension]:
+            cell = self.cell(**{**filters, dimension: name})
+            if cell['postings']:
+                cells[name] = cell
+        return cells
+
+    @property
+    def total(self):
+        return self.cell()['postings']
+
+    def median_salary(self):
+        return self.cell()['median_salary']
+
+    def language_salaries(self, itjobs_data=None):
+        records = [
+            {'LanguageWorkedWith': skill, 'median': int(round(cell['median_salary'])), 'count': cell['salaried']}
+            for skill, cell in sorted(self.rollup('skill').items()) if cell['salaried']
+        ]
+        return finish_language_salaries(records, itjobs_data)
+
+    def location_data(self):
+        salaried = [(location, cell) for location, cell in self.rollup('location').items() if cell['salaried']]
+        busiest = sorted(salaried, key=lambda item: (-item[1]['salaried'], item[0]))[:MAX_LOCATIONS]
+        busiest.sort(key=lambda item: item[1]['median_salary'], reverse=True)
+        return [{'Country': location, 'median': int(round(cell['median_salary'])), 'count': cell['salaried']}
+                for location, cell in busiest]
+
+    def experience_salaries(self):
+        return experience_records(
+            (level, cell['median_salary'], cell['salaried']) for level, cell in self.rollup('seniority').items()
+        )
+
+    def remote_trends(self):
+        total = self.total
+        if not total:
+            return []
+        postings = {arrangement: cell['postings'] for arrangement, cell in self.rollup('remote').items()}
+        return [{'index': arrangement, 'count': int(round(postings.get(arrangement, 0) / total * 100))}
+                for arrangement in REMOTE_ORDER]
+
+    def save(self, path=None):
+        """Write the cube as one compressed .npz of plain arrays (no pickled objects)"""
+        path = path or os.environ.get('AGGREGATE_CUBE_PATH', DEFAULT_CUBE_PATH)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(
+            path,
+            codes=self.codes,
+            postings=self.postings.astype(np.int32),
+            salaried=self.salaried.astype(np.int32),
+            salary_sum=self.salary_sum,
+            histogram_data=self.histograms.data.astype(np.int32),
+            histogram_indices=self.histograms.indices.astype(np.int32),
+            histogram_indptr=self.histograms.indptr.astype(np.int64),
+            histogram_bins=np.int64(self.histograms.shape[1]),
+            bin_width=np.int64(self.bin_width),
+            **{f'members_{dimension}': np.array(self.members[dimension], dtype=str) for dimension in DIMENSIONS}
+        )
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.environ.get('AGGREGATE_CUBE_PATH', DEFAULT_CUBE_PATH)
+        with np.load(path) as archive:
+            histograms = sparse.csr_matrix(
+                (archive['histogram_data'], archive['histogram_indices'], archive['histogram_indptr']),
+                shape=(len(archive['codes']), int(archive['histogram_bins']))
+            )
+            return cls(
+                {dimension: archive[f'members_{dimension}'].tolist() for dimension in DIMENSIONS},
+                archive['codes'],
+                archive['postings'].astype(np.int64),
+                archive['salaried'].astype(np.int64),
+                archive['salary_sum'],
+                histograms,
+                int(archive['bin_width'])
+            )
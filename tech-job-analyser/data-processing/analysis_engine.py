@@ -0,0 +1,158 @@
+"""
+Vectorized analysis engine
+Loads the combined postings into one DataFrame and computes the language, location,
+seniority and remote-work aggregates the dashboard consumes with groupby instead of Python loops
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from gazetteer import GAZETTEER
+from postings import POSTING_FIELDS, posting_columns
+from seniority import LEVEL_LABELS, SENIORITY_LEVELS
+from skill_tagger import SKILL_TAGGER
+
+REMOTE_PATTERNS = {
+    'Hybrid': re.compile(r'\bhybrid\b', re.IGNORECASE),
+    'Fully remote': re.compile(r'\b(?:fully\s+remote|remote|work(?:ing)?\s+from\s+home|wfh|home[\s-]based)\b', re.IGNORECASE)
+}
+REMOTE_ORDER = ['Fully remote', 'Hybrid', 'Office']
+
+HIGH_DEMAND_COUNT = 10
+MAX_LOCATIONS = 15
+
+
+def build_jobs_frame(all_jobs):
+    """Load postings into a single typed DataFrame with normalized locations and a searchable text column"""
+    # Columns come straight off the JobPosting slots, with no per-posting dict in between
+    jobs_df = pd.DataFrame(posting_columns(all_jobs), columns=list(POSTING_FIELDS), copy=False)
+
+    for column in ('salary_min', 'salary_max', 'salary_avg'):
+        jobs_df[column] = pd.to_numeric(jobs_df[column], errors='coerce')
+    for column in ('source_id', 'title', 'company', 'location', 'category', 'description', 'source'):
+        jobs_df[column] = jobs_df[column].fillna('').astype(str)
+    jobs_df['fetched_at'] = pd.to_datetime(jobs_df['fetched_at'], errors='coerce')
+
+    # Display names roll up to gazetteer city buckets, with their NUTS 1 region alongside
+    locations, regions = GAZETTEER.normalize_column(jobs_df['location'])
+    jobs_df['location'] = pd.Series(locations, index=jobs_df.index).astype(str)
+    jobs_df['region'] = regions
+    jobs_df['text'] = jobs_df['title'] + ' ' + jobs_df['description']
+    return jobs_df
+
+
+def _records(stats, key_name):
+    return [
+        {key_name: key, 'median': int(round(row['median'])), 'count': int(row['count'])}
+        for key, row in stats.iterrows()
+    ]
+
+
+def tag_skills(jobs_df):
+    """Sparse job x skill matrix aligned with jobs_df rows, shared by every stage of a run"""
+    return SKILL_TAGGER.tag_matrix(jobs_df['text'])
+
+
+def impute_salaries(jobs_df, skill_hits, reference):
+    """Fill missing salary_avg from the reference medians of each posting's skills; returns
+    how many were filled (flagged in salary_imputed)"""
+    estimates = reference.estimate_matrix(skill_hits)
+    missing = jobs_df['salary_avg'].isna().to_numpy() & ~np.isnan(estimates)
+    jobs_df['salary_imputed'] = missing
+    jobs_df.loc[missing, 'salary_avg'] = estimates[missing]
+    return int(missing.sum())
+
+
+def analyze_language_salaries(jobs_df, itjobs_data=None, skill_hits=None):
+    """Median salary and posting count per technology"""
+    if skill_hits is None:
+        skill_hits = tag_skills(jobs_df)
+    has_salary = jobs_df['salary_avg'].notna().to_numpy()
+    salaried = jobs_df[has_salary]
+    hits = skill_hits[has_salary].tocoo()
+
+    pairs = pd.DataFrame({
+        'skill': np.asarray(SKILL_TAGGER.skills, dtype=object)[hits.col],
+        'salary': salaried['salary_avg'].to_numpy()[hits.row]
+    })
+    stats = pairs.groupby('skill')['salary'].agg(['median', 'count'])
+
+    return finish_language_salaries(_records(stats, 'LanguageWorkedWith'), itjobs_data)
+
+
+def finish_language_salaries(language_salaries, itjobs_data=None):
+    """Add demand labels and IT Jobs Watch fallbacks to per-skill records, highest median first"""
+    for record in language_salaries:
+        record['demand'] = 'High' if record['count'] >= HIGH_DEMAND_COUNT else 'Medium'
+
+    # Technologies with no salaried postings fall back to the IT Jobs Watch figures
+    covered = {record['LanguageWorkedWith'] for record in language_salaries}
+    for trend in itjobs_data or []:
+        skill = SKILL_TAGGER.canonical(trend.get('skill', ''))
+        if skill and skill not in covered:
+            covered.add(skill)
+            language_salaries.append({
+                'LanguageWorkedWith': skill,
+                'median': int(trend['median_salary']),
+                'count': 0,
+                'demand': trend.get('demand', 'Medium')
+            })
+
+    language_salaries.sort(key=lambda record: record['median'], reverse=True)
+    return language_salaries
+
+
+def analyze_location_data(jobs_df):
+    """Median salary and posting count for the busiest locations"""
+    salaried = jobs_df[jobs_df['salary_avg'].notna()]
+    stats = salaried.groupby('location')['salary_avg'].agg(['median', 'count'])
+    stats = stats.nlargest(MAX_LOCATIONS, 'count').sort_values('median', ascending=False)
+    return _records(stats, 'Country')
+
+
+def analyze_experience_salaries(jobs_df, seniority):
+    """Median salary and posting count per seniority level, junior to senior"""
+    salaried = jobs_df['salary_avg'].notna().to_numpy()
+    levels = pd.Categorical(np.asarray(seniority)[salaried], categories=SENIORITY_LEVELS)
+    stats = jobs_df.loc[salaried, 'salary_avg'].groupby(levels, observed=True).agg(['median', 'count'])
+    return experience_records(stats.itertuples())
+
+
+def experience_records(rows):
+    """Dashboard records from (level, median, count) rows, in SENIORITY_LEVELS order"""
+    found = {level: (median, count) for level, median, count in rows if count}
+    return [
+        {'level': LEVEL_LABELS[level], 'salary': int(round(found[level][0])), 'count': int(found[level][1])}
+        for level in SENIORITY_LEVELS if level in found
+    ]
+
+
+def classify_remote(text):
+    """Work arrangement of a single posting, matching analyze_remote_trends"""
+    if REMOTE_PATTERNS['Hybrid'].search(text):
+        return 'Hybrid'
+    if REMOTE_PATTERNS['Fully remote'].search(text):
+        return 'Fully remote'
+    return 'Office'
+
+
+def remote_arrangements(text):
+    """Work arrangement per posting of a text column, matching classify_remote"""
+    text = pd.Series(text, dtype=object)
+    return np.select(
+        [text.str.contains(REMOTE_PATTERNS['Hybrid']), text.str.contains(REMOTE_PATTERNS['Fully remote'])],
+        ['Hybrid', 'Fully remote'],
+        default='Office'
+    )
+
+
+def analyze_remote_trends(jobs_df):
+    """Share of postings per work arrangement, as whole percentages"""
+    if jobs_df.empty:
+        return []
+
+    arrangement = remote_arrangements(jobs_df['text'])
+    shares = pd.Series(arrangement).value_counts(normalize=True).reindex(REMOTE_ORDER, fill_value=0)
+    return [{'index': index, 'count': int(round(share * 100))} for index, share in shares.items()]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark on synthetic Adzuna-shaped postings
+Each corpus size runs in a fresh interpreter so peak RSS is per size; results are saved
+per commit under output/benchmarks/ and can be compared with --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_OUTPUT_DIR = 'output/benchmarks'
+
+SENIORITY = [('Graduate', 0.6, 5), ('Junior', 0.75, 15), ('', 1.0, 40), ('Senior', 1.25, 25),
+             ('Lead', 1.45, 10), ('Principal', 1.6, 5)]
+ROLES = ['Developer', 'Engineer', 'Software Engineer', 'Consultant', 'Architect', 'Specialist']
+LOCATIONS = [('London', 30), ('Manchester', 9), ('Birmingham', 6), ('Leeds', 6), ('Bristol', 6),
+             ('Edinburgh', 5), ('Glasgow', 4), ('Cambridge', 4), ('Reading', 3), ('Newcastle upon Tyne', 3),
+             ('Sheffield', 3), ('Nottingham', 3), ('Belfast', 3), ('Cardiff', 3), ('Oxford', 2),
+             ('Milton Keynes', 2), ('Brighton', 2), ('Remote', 6)]
+COMPANY_WORDS = ['Blue', 'Northern', 'Quantum', 'Bright', 'Apex', 'Harbour', 'Vertex', 'Oak', 'Signal', 'Cobalt',
+                 'Digital', 'Data', 'Cloud', 'Systems', 'Labs', 'Solutions', 'Software', 'Analytics', 'Networks']
+COMPANY_SUFFIXES = ['Ltd', 'Limited', 'plc', 'Group', 'UK Ltd', '']
+WORK_PATTERNS = ['', '', '', 'This is a hybrid role with two days a week in the office.',
+                 'Fully remote within the UK.', 'Working from home is supported.']
+SENTENCES = [
+    'You will build and run services using {0} and {1}.',
+    'Strong experience with {0} is essential; {1} would be a bonus.',
+    'Our platform team works daily with {0}, {1} and modern CI/CD practices.',
+    'We are looking for someone comfortable with {0} who wants to learn {1}.',
+    'The role involves designing APIs, mentoring colleagues and improving observability.',
+    'We offer 25 days holiday, a pension scheme, private healthcare and a learning budget.'
+]
+
+
+def skill_salary_ranges():
+    from salary_reference import SALARY_RANGES
+    return SALARY_RANGES
+
+
+def synthetic_postings(size, seed=42, duplicate_rate=0.1):
+    """Adzuna API `results` entries; about duplicate_rate of them re-post an earlier job"""
+    rng = random.Random(seed)
+    ranges = skill_salary_ranges()
+    skills = list(ranges)
+    seniority_weights = [weight for _, _, weight in SENIORITY]
+    location_weights = [weight for _, weight in LOCATIONS]
+    companies = [f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}".strip()
+                 for _ in range(max(50, size // 40))]
+
+    postings = []
+    for index in range(size):
+        if postings and rng.random() < duplicate_rate:
+            # Syndicated copy: same job, different board formatting
+            original = postings[rng.randrange(len(postings))]
+            copy = dict(original, id=str(10_000_000 + index))
+            company = original['company']['display_name']
+            copy['company'] = {'display_name': company.replace(' Ltd', '') if ' Ltd' in company else company + ' Ltd'}
+            copy['title'] = original['title'].replace(' - ', ' ').strip() + rng.choice(['', ' (Permanent)'])
+            postings.append(copy)
+            continue
+
+        level, multiplier, _ = rng.choices(SENIORITY, weights=seniority_weights)[0]
+        primary, secondary = rng.sample(skills, 2)
+        location = rng.choices(LOCATIONS, weights=location_weights)[0][0]
+        low, high = ranges[primary]
+        salary_min = round(low * multiplier * rng.uniform(0.9, 1.1), -3)
+        salary_max = round(max(salary_min + 5000, high * multiplier * rng.uniform(0.85, 1.05)), -3)
+        if rng.random() < 0.15:
+            salary_max = None
+
+        sentences = rng.sample(SENTENCES, 4) + [rng.choice(WORK_PATTERNS)]
+        description = ' '.join(sentence.format(primary, secondary) for sentence in sentences).strip()
+        postings.append({
+            'id': str(1_000_000 + index),
+            'title': ' '.join(part for part in (level, primary, rng.choice(ROLES)) if part) + f" - {location}",
+            'company': {'display_name': rng.choice(companies)},
+            'location': {'display_name': location},
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'description': description,
+            'created': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T09:00:00Z"
+        })
+    return postings
+
+
+def run_stages(size, seed):
+    """Run the pipeline's offline stages once on a fresh corpus and return per-stage measurements"""
+    from run_report import RUN_PROFILER
+    from process_data import EnhancedUKJobDataFetcher, analyze_jobs, generate_enhanced_insights
+    from dedup import deduplicate_jobs
+
+    # The analysis is timed as the pipeline runs it, minus the Parquet and cube files
+    os.environ.update({'JOBS_EXPORT': '0', 'CUBE_EXPORT': '0'})
+    fetcher = EnhancedUKJobDataFetcher()
+
+    with RUN_PROFILER.stage('generate') as stage:
+        postings = synthetic_postings(size, seed)
+        stage['records'] = len(postings)
+    with RUN_PROFILER.stage('normalize') as stage:
+        jobs = fetcher.adzuna_jobs(postings)
+        stage['records'] = len(postings)
+    del postings
+    with RUN_PROFILER.stage('dedup') as stage:
+        stage['records'] = len(jobs)
+        jobs, _ = deduplicate_jobs(jobs)
+    processed = analyze_jobs(jobs, {}, fetcher.get_fallback_itjobs_data())
+    with RUN_PROFILER.stage('insights') as stage:
+        generate_enhanced_insights(processed)
+        stage['records'] = len(processed['language_salaries'])
+
+    report = RUN_PROFILER.report()
+    stages = {}
+    # RUN_PROFILER.stages is in execution order, the report is sorted by name
+    for stage in RUN_PROFILER.stages:
+        seconds = stage['seconds']
+        stages[stage['name']] = {
+            'seconds': seconds,
+            'records': stage.get('records'),
+            'records_per_second': round(stage['records'] / seconds, 1) if stage.get('records') and seconds else None,
+            'peak_rss_mb': stage['peak_rss_mb']
+        }
+    return {
+        'size': size,
+        'total_seconds': round(sum(stage['seconds'] for name, stage in stages.items() if name != 'generate'), 4),
+        'peak_rss_mb': report['peak_rss_mb'],
+        'stages': stages
+    }
+
+
+def git_revision():
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return sha, bool(dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def compare(current, previous_path):
+    """Print per-stage time ratios against an earlier results file"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {run['size']: run for run in previous['runs']}
+    print(f"📊 Compared with {previous['git_sha'][:10]} ({previous['created_at']}):")
+    for run in current['runs']:
+        old = before.get(run['size'])
+        if not old:
+            continue
+        for name, stage in run['stages'].items():
+            old_stage = old['stages'].get(name)
+            if old_stage and old_stage['seconds']:
+                ratio = stage['seconds'] / old_stage['seconds']
+                marker = '🐢' if ratio > 1.2 else '🚀' if ratio < 0.8 else '  '
+                print(f"   {marker} {run['size']:>9,} {name:<18} {old_stage['seconds']:>9.3f}s -> {stage['seconds']:>9.3f}s "
+                      f"(x{ratio:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the offline pipeline stages on synthetic postings')
+    parser.add_argument('--sizes', default='1k,100k',
+                        help=f"comma-separated corpus sizes ({', '.join(SIZES)} or plain numbers)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_stages(args.worker, args.seed)))
+        return
+
+    sizes = [SIZES.get(size.strip().lower()) or int(size) for size in args.sizes.split(',')]
+    sha, dirty = git_revision()
+    results = {
+        'git_sha': sha,
+        'dirty': dirty,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'runs': []
+    }
+
+    print(f"🏁 Benchmarking {', '.join(f'{size:,}' for size in sizes)} postings at {sha[:10]}{' (dirty)' if dirty else ''}")
+    for size in sizes:
+        start = time.perf_counter()
+        worker = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', str(size), '--seed', str(args.seed)],
+            capture_output=True, text=True, env={**os.environ, 'HTTP_CACHE': '0', 'FETCH_MODE': 'live'}
+        )
+        if worker.returncode != 0:
+            print(f"❌ {size:,} postings failed:\n{worker.stderr[-2000:]}")
+            continue
+        run = json.loads(worker.stdout.strip().splitlines()[-1])
+        results['runs'].append(run)
+
+        print(f"✅ {size:,} postings in {time.perf_counter() - start:.1f}s (peak RSS {run['peak_rss_mb']} MB)")
+        for name, stage in run['stages'].items():
+            rate = f"{stage['records_per_second']:>12,.0f}/s" if stage['records_per_second'] else ' ' * 14
+            print(f"   {name:<18} {stage['seconds']:>9.3f}s {rate}  {stage['peak_rss_mb']} MB")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"{sha[:12]}{'-dirty' if dirty else ''}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
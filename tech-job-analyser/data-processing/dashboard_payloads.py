@@ -0,0 +1,122 @@
+"""
+Per-panel dashboard payloads
+Splits the dashboard data into compact JSON files (one per panel) plus a manifest of
+content hashes, and leaves files alone when their content has not changed
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Panel file name -> path of the panel's data inside the dashboard payload
+PANELS = {
+    'summary': ('summary',),
+    'metadata': ('metadata',),
+    'language_salary': ('analytics', 'language_salary'),
+    'location_salary': ('analytics', 'location_salary'),
+    'remote_work_stats': ('analytics', 'remote_work_stats'),
+    'experience_salary': ('analytics', 'experience_salary'),
+    'recommendations': ('recommendations',),
+    'predictions': ('predictions',),
+    'salary_model': ('salary_model',)
+}
+
+# Panel fields that change on every run whether or not the data did; a run that changes no
+# other panel keeps their previous values, so a no-op rerun rewrites nothing
+VOLATILE_FIELDS = {'metadata': ('last_updated',)}
+
+
+def compact_json(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def write_if_changed(path, content):
+    """Write bytes unless the file already holds exactly them; returns True if written"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+
+def compressed_variants(content, encodings):
+    """Deterministic pre-compressed copies (.gz with a fixed mtime, .br when brotli is installed)"""
+    variants = {}
+    if 'gzip' in encodings:
+        variants['.gz'] = gzip.compress(content, compresslevel=9, mtime=0)
+    if 'br' in encodings:
+        if brotli is None:
+            print("⚠️ brotli not installed, skipping .br payloads")
+        else:
+            variants['.br'] = brotli.compress(content)
+    return variants
+
+
+def _previous_panel(path):
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _without(payload, fields):
+    return {key: value for key, value in payload.items() if key not in fields}
+
+
+def write_panels(data, output_dir, encodings=None):
+    """Write one compact file per panel and a manifest; returns the names of rewritten files.
+    Panels with volatile fields are written last; when nothing else changed, those fields are
+    set back (in data too) to the values already on disk"""
+    if encodings is None:
+        encodings = [e for e in os.environ.get('DASHBOARD_COMPRESS', '').split(',') if e]
+    panels_dir = os.path.join(output_dir, 'panels')
+    os.makedirs(panels_dir, exist_ok=True)
+
+    entries = {}
+    written = []
+
+    for panel in sorted(PANELS, key=lambda name: name in VOLATILE_FIELDS):
+        payload = data
+        for key in PANELS[panel]:
+            payload = payload.get(key, {}) if isinstance(payload, dict) else {}
+
+        file_name = f'{panel}.json'
+        fields = VOLATILE_FIELDS.get(panel, ())
+        if fields and not written and isinstance(payload, dict):
+            previous = _previous_panel(os.path.join(panels_dir, file_name))
+            unchanged = isinstance(previous, dict) and \
+                compact_json(_without(previous, fields)) == compact_json(_without(payload, fields))
+            if unchanged:
+                payload.update({field: previous[field] for field in fields if field in previous})
+
+        content = compact_json(payload)
+        entry = {'file': f'panels/{file_name}', 'hash': content_hash(content), 'bytes': len(content)}
+
+        if write_if_changed(os.path.join(panels_dir, file_name), content):
+            written.append(file_name)
+        for suffix, compressed in compressed_variants(content, encodings).items():
+            entry[f'bytes{suffix}'] = len(compressed)
+            if write_if_changed(os.path.join(panels_dir, file_name + suffix), compressed):
+                written.append(file_name + suffix)
+
+        entries[panel] = entry
+
+    # The manifest only changes when some panel's hash does
+    manifest = {'panels': {panel: entries[panel] for panel in PANELS}}
+    if write_if_changed(os.path.join(output_dir, 'manifest.json'), compact_json(manifest)):
+        written.append('manifest.json')
+
+    return written
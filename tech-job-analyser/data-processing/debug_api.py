@@ -4,16 +4,22 @@ Debug script to see exactly what the Adzuna API is returning
 """
 
 import os
-import requests
 import json
 from dotenv import load_dotenv
 
+from fetch_archive import create_session, get_fetch_mode
+
 load_dotenv()
 
 def debug_adzuna_api():
     app_id = os.environ.get('ADZUNA_APP_ID')
     app_key = os.environ.get('ADZUNA_APP_KEY')
     
+    # FETCH_MODE=record/replay shares the fixture archive used by process_data.py
+    session = create_session()
+    if get_fetch_mode() == 'replay':
+        app_id, app_key = app_id or 'replay', app_key or 'replay'
+    
     print("🔧 Debugging Adzuna API...")
     print(f"App ID: {app_id[:8]}...")
     print(f"App Key: {app_key[:8]}...")
@@ -39,7 +45,7 @@ def debug_adzuna_api():
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = session.get(url, params=params, timeout=10)
             print(f"   Status: {response.status_code}")
             
             if response.status_code == 200:
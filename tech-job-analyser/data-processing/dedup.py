@@ -0,0 +1,353 @@
+"""
+Near-duplicate job detection with MinHash signatures and locality-sensitive hashing
+Catches the same posting syndicated across boards with slightly different titles or
+company names, without comparing every pair of postings. Duplicates must also share the
+normalized company name, seniority level and the skills named in the title, and must not
+conflict on location, pay or the opening of the description; clusters only grow through
+postings that still match the cluster's first posting
+"""
+
+import re
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from gazetteer import GAZETTEER, REMOTE_BUCKET, UK_BUCKET
+from seniority import SENIORITY_CLASSIFIER
+from skill_tagger import SKILL_TAGGER
+
+# Company suffixes and filler that differ between boards for the same employer
+COMPANY_NOISE = re.compile(r'\b(?:ltd|limited|plc|llp|llc|inc|group|uk|the|recruitment|holdings)\b')
+NON_WORD = re.compile(r'[^a-z0-9#+]+')
+# Gazetteer buckets that say nothing about where the job is
+GENERIC_LOCATIONS = {UK_BUCKET, REMOTE_BUCKET}
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.75
+# Copies of one posting quote the same pay; salaries further apart than this are different jobs
+SALARY_TOLERANCE = 0.05
+# Characters of normalized description compared; boards truncate descriptions, not reword them
+DESCRIPTION_PREFIX = 80
+MAX_BUCKET_PAIRWISE = 64
+NEIGHBOURS = 8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_BAND_MIX = _rng.randint(1, 1 << 62, size=ROWS, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+
+
+def normalize_text(value):
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return NON_WORD.sub(' ', str(value or '').lower()).strip()
+
+
+def company_key(job):
+    """Company name without legal suffixes and filler words"""
+    return ' '.join(COMPANY_NOISE.sub(' ', normalize_text(job.get('company'))).split())
+
+
+def location_key(job):
+    """Gazetteer bucket of the location, so "Manchester" and "Salford, Greater Manchester"
+    agree; generic locations match anything"""
+    bucket = GAZETTEER.normalize(job.get('location'))[0]
+    return normalize_text(bucket) if bucket not in GENERIC_LOCATIONS else ''
+
+
+def job_keys(jobs):
+    """(company, seniority code, title skill indices, location, salary, description opening)
+    per posting. The first three must be equal for two postings to be duplicates; the rest
+    are open fields, where a missing value agrees with anything"""
+    titles = [job.get('title') or '' for job in jobs]
+    descriptions = [job.get('description') or '' for job in jobs]
+    levels = SENIORITY_CLASSIFIER.classify_many(titles, descriptions).tolist()
+    return [
+        (company_key(job), level, tuple(sorted(SKILL_TAGGER.tag_indices(title))),
+         location_key(job), job.get('salary_avg') or None, normalize_text(description[:2 * DESCRIPTION_PREFIX])[:DESCRIPTION_PREFIX])
+        for job, title, description, level in zip(jobs, titles, descriptions, levels)
+    ]
+
+
+def job_shingles(job, company, location):
+    """Character 3-grams of the normalized title (location words removed) plus company words"""
+    title = normalize_text(job.get('title'))
+    if location:
+        location_words = set(location.split())
+        title = ' '.join(token for token in title.split() if token not in location_words)
+    shingles = {title[i:i + 3] for i in range(max(1, len(title) - 2))}
+    shingles.update(f'c:{token}' for token in company.split())
+    return shingles
+
+
+def open_fields_agree(first, second):
+    """Same location and description opening and salaries within SALARY_TOLERANCE, where a
+    missing value agrees with anything"""
+    (location_a, salary_a, text_a), (location_b, salary_b, text_b) = first, second
+    return ((not location_a or not location_b or location_a == location_b)
+            and (not salary_a or not salary_b or abs(salary_a - salary_b) <= SALARY_TOLERANCE * max(salary_a, salary_b))
+            and (not text_a or not text_b or text_a == text_b))
+
+
+def merge_open_fields(first, second):
+    """Open fields of a cluster: its first non-missing value of each"""
+    return tuple(value_a or value_b for value_a, value_b in zip(first, second))
+
+
+def compatible(first, second):
+    """Same named employer, seniority and title skills, and no conflicting open field; a
+    company name that is empty once filler is removed matches nothing"""
+    return bool(first[0]) and first[:3] == second[:3] and open_fields_agree(first[3:], second[3:])
+
+
+def minhash_signatures(shingle_sets, chunk_size=2000):
+    """(jobs x NUM_PERM) MinHash matrix from stable CRC32 shingle hashes, computed in chunks"""
+    signatures = np.zeros((len(shingle_sets), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(shingle_sets), chunk_size):
+        chunk = shingle_sets[start:start + chunk_size]
+        lengths = np.fromiter((len(shingles) for shingles in chunk), dtype=np.int64, count=len(chunk))
+        if not lengths.any():
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingles in chunk for shingle in shingles),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        # (a * x + b) mod p for every permutation and shingle at once, then the minimum per job
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        filled = lengths > 0
+        signatures[start + np.flatnonzero(filled)] = np.minimum.reduceat(permuted, offsets[filled], axis=0)
+    return signatures
+
+
+def candidate_pairs(signatures, min_matches, salt=None):
+    """(firsts, seconds) of every pair of postings that share a whole LSH band (and salt, a
+    code postings must share to be compared at all) and agree on at least min_matches
+    signature positions, each pair once, ordered by first posting"""
+    firsts, seconds = [], []
+    for band in range(BANDS):
+        keys = (signatures[:, band * ROWS:(band + 1) * ROWS] * _BAND_MIX).sum(axis=1)
+        if salt is not None:
+            keys = keys ^ salt
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bucket_of = np.concatenate(([0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])))
+        sizes = np.bincount(bucket_of)
+        # Buckets of up to NEIGHBOURS + 1 postings: every pair is some offset apart in sort order
+        small = sizes[bucket_of] <= NEIGHBOURS + 1
+        for offset in range(1, NEIGHBOURS + 1):
+            close = np.flatnonzero(small[offset:] & (bucket_of[offset:] == bucket_of[:-offset]))
+            firsts.append(order[close])
+            seconds.append(order[close + offset])
+        for bucket in np.flatnonzero(sizes > NEIGHBOURS + 1):
+            members = order[bucket_of == bucket]
+            bucket_firsts, bucket_seconds = similar_pairs(members, signatures, min_matches)
+            firsts.append(bucket_firsts)
+            seconds.append(bucket_seconds)
+
+    firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+    firsts, seconds = np.minimum(firsts, seconds), np.maximum(firsts, seconds)
+    pairs = np.unique(firsts * len(signatures) + seconds)
+    firsts, seconds = pairs // len(signatures), pairs % len(signatures)
+    similar = (signatures[firsts] == signatures[seconds]).sum(axis=1) >= min_matches
+    return firsts[similar], seconds[similar]
+
+
+def similar_pairs(members, signatures, min_matches):
+    """Pairs within a bucket whose signatures agree on at least min_matches positions"""
+    bucket = signatures[members]
+    if len(members) <= MAX_BUCKET_PAIRWISE:
+        agreement = (bucket[:, None, :] == bucket[None, :, :]).sum(axis=2)
+        firsts, seconds = np.nonzero(np.triu(agreement >= min_matches, k=1))
+    else:
+        # Oversized buckets: sort by signature and only compare near neighbours
+        order = np.lexsort(bucket.T[::-1])
+        members, bucket = members[order], bucket[order]
+        firsts, seconds = [], []
+        for offset in range(1, min(NEIGHBOURS, len(members) - 1) + 1):
+            close = np.flatnonzero((bucket[:-offset] == bucket[offset:]).sum(axis=1) >= min_matches)
+            firsts.append(close)
+            seconds.append(close + offset)
+        firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+    return members[firsts], members[seconds]
+
+
+def richness(job):
+    """Score used to keep the most informative record of a cluster"""
+    filled = sum(1 for value in job.values() if value not in (None, '', 'Unknown', 'UK'))
+    has_range = bool(job.get('salary_min') and job.get('salary_max'))
+    return (filled, has_range, len(job.get('description') or ''))
+
+
+class _Clusters:
+    """Union-find whose roots are each cluster's first posting. A cluster keeps the first
+    value of each open field any member has, so a posting missing one cannot link two
+    different places, pay levels or descriptions"""
+
+    def __init__(self, open_fields):
+        self.parent = list(range(len(open_fields)))
+        self.open_fields = list(open_fields)
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, root_a, root_b):
+        root, other = min(root_a, root_b), max(root_a, root_b)
+        self.parent[other] = root
+        self.open_fields[root] = merge_open_fields(self.open_fields[root], self.open_fields[other])
+
+
+def _open_codes(values):
+    return np.array([hash(value) if value else 0 for value in values], dtype=np.int64)
+
+
+def deduplicate_jobs(jobs, threshold=SIMILARITY_THRESHOLD):
+    """Collapse near-duplicate postings; returns (unique_jobs, duplicates dropped per source)"""
+    if not jobs:
+        return [], {}
+
+    keys = job_keys(jobs)
+    signatures = minhash_signatures([job_shingles(job, key[0], key[3]) for job, key in zip(jobs, keys)])
+
+    # Integer codes let candidate pairs be accepted or rejected without Python calls
+    exact_codes = np.array([hash(key[:3]) for key in keys], dtype=np.int64)
+    named = np.array([bool(key[0]) for key in keys])
+    location_codes = _open_codes(key[3] for key in keys)
+    text_codes = _open_codes(key[5] for key in keys)
+    salaries = np.array([key[4] or np.nan for key in keys], dtype=float)
+
+    # Only named postings sharing an LSH band and the company/seniority/skills code are compared
+    min_matches = int(np.ceil(threshold * NUM_PERM))
+    named_rows = np.flatnonzero(named)
+    firsts, seconds = candidate_pairs(signatures[named_rows], min_matches, exact_codes[named_rows].view(np.uint64))
+    firsts, seconds = named_rows[firsts], named_rows[seconds]
+
+    def open_code_agrees(codes):
+        return (codes[firsts] == codes[seconds]) | (codes[firsts] == 0) | (codes[seconds] == 0)
+
+    with np.errstate(invalid='ignore'):
+        salary_gap = np.abs(salaries[firsts] - salaries[seconds]) \
+            > SALARY_TOLERANCE * np.fmax(salaries[firsts], salaries[seconds])
+    candidates = ((exact_codes[firsts] == exact_codes[seconds]) & ~salary_gap
+                  & open_code_agrees(location_codes) & open_code_agrees(text_codes))
+
+    clusters = _Clusters([key[3:] for key in keys])
+    for first, second in zip(firsts[candidates].tolist(), seconds[candidates].tolist()):
+        root_a, root_b = clusters.find(first), clusters.find(second)
+        if root_a == root_b:
+            continue
+        # No chaining: the clusters' open fields must agree and their first postings must be
+        # near-duplicates themselves
+        if not open_fields_agree(clusters.open_fields[root_a], clusters.open_fields[root_b]):
+            continue
+        if (root_a, root_b) != (first, second) and \
+                int((signatures[root_a] == signatures[root_b]).sum()) < min_matches:
+            continue
+        clusters.union(root_a, root_b)
+
+    grouped = defaultdict(list)
+    for index in range(len(jobs)):
+        grouped[clusters.find(index)].append(index)
+
+    unique_jobs = []
+    dropped = Counter()
+    for root in sorted(grouped):
+        members = grouped[root]
+        if len(members) == 1:
+            unique_jobs.append(jobs[root])
+            continue
+        keep = max(members, key=lambda index: (richness(jobs[index]), -index))
+        unique_jobs.append(jobs[keep])
+        for index in members:
+            if index != keep:
+                dropped[jobs[index].get('source', 'Unknown')] += 1
+
+    return unique_jobs, dict(dropped)
+
+
+class StreamingDeduplicator:
+    """Drops near-duplicates from a stream, remembering only the most recent unique postings
+
+    Unlike deduplicate_jobs, the first posting of a cluster is the one kept, and duplicates
+    are only caught within a window of the last `window` unique postings, so memory stays
+    bounded however long the stream runs.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, window=50000, chunk_size=1000):
+        self.min_matches = int(np.ceil(threshold * NUM_PERM))
+        self.window = window
+        self.chunk_size = chunk_size
+        # Ring buffer of the remembered postings: low 32 bits of each signature are plenty for equality
+        self.signatures = np.zeros((window, NUM_PERM), dtype=np.uint32)
+        self.band_keys = np.zeros((window, BANDS), dtype=np.int64)
+        self.keys = [None] * window
+        self.band_tables = [{} for _ in range(BANDS)]
+        self.next_slot = 0
+        self.seen = 0
+        self.dropped = Counter()
+
+    def _forget(self, slot):
+        for band, key in enumerate(self.band_keys[slot].tolist()):
+            if self.band_tables[band].get(key) == slot:
+                del self.band_tables[band][key]
+
+    def _duplicate_of(self, signature, band_keys, key):
+        """Slot of a remembered posting this one duplicates, or None"""
+        candidates = {self.band_tables[band].get(band_key) for band, band_key in enumerate(band_keys)}
+        candidates.discard(None)
+        for slot in sorted(candidates):
+            if (int((self.signatures[slot] == signature).sum()) >= self.min_matches
+                    and compatible(self.keys[slot], key)):
+                return slot
+        return None
+
+    def _remember(self, signature, band_keys, key):
+        slot = self.next_slot % self.window
+        if self.next_slot >= self.window:
+            self._forget(slot)
+        self.signatures[slot] = signature
+        self.band_keys[slot] = band_keys
+        self.keys[slot] = key
+        for band, band_key in enumerate(band_keys):
+            self.band_tables[band][band_key] = slot
+        self.next_slot += 1
+
+    def filter(self, jobs):
+        """Yield the postings of an iterable that are not near-duplicates of earlier ones"""
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) >= self.chunk_size:
+                yield from self._filter_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._filter_chunk(chunk)
+
+    def _filter_chunk(self, jobs):
+        # Signatures and band keys are computed for the whole chunk at once
+        keys = job_keys(jobs)
+        signatures = minhash_signatures([job_shingles(job, key[0], key[3]) for job, key in zip(jobs, keys)])
+        band_keys = np.stack([
+            (signatures[:, band * ROWS:(band + 1) * ROWS] * _BAND_MIX).sum(axis=1).astype(np.int64)
+            for band in range(BANDS)
+        ], axis=1)
+        signatures = signatures.astype(np.uint32)
+
+        for job, key, signature, job_bands in zip(jobs, keys, signatures, band_keys.tolist()):
+            self.seen += 1
+            slot = self._duplicate_of(signature, job_bands, key)
+            if slot is not None:
+                # A remembered posting missing an open field takes the value it matched, so it
+                # cannot go on to absorb postings from another place, pay level or description
+                remembered = self.keys[slot]
+                self.keys[slot] = remembered[:3] + merge_open_fields(remembered[3:], key[3:])
+                self.dropped[job.get('source', 'Unknown')] += 1
+                continue
+            self._remember(signature, job_bands, key)
+            yield job
@@ -2,9 +2,40 @@
 Fallback data processor for when real APIs are unavailable
 """
 
-import numpy as np
+import json
+import os
 from datetime import datetime
 
+FALLBACK_EXPERIENCE_SALARIES = [
+    {'level': 'Graduate (0-1 yrs)', 'salary': 28000},
+    {'level': 'Junior (1-3 yrs)', 'salary': 38000},
+    {'level': 'Mid-level (3-5 yrs)', 'salary': 52000},
+    {'level': 'Senior (5-8 yrs)', 'salary': 68000},
+    {'level': 'Lead (8+ yrs)', 'salary': 82000}
+]
+
+DEFAULT_EXPERIENCE_PATH = '.cache/experience_salaries.json'
+
+def save_experience_salaries(levels, path=None):
+    """Keep an analysed run's seniority salary medians for later fallback runs"""
+    path = path or os.environ.get('EXPERIENCE_SALARIES_PATH', DEFAULT_EXPERIENCE_PATH)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(levels, f, ensure_ascii=False)
+
+def load_experience_salaries(path=None):
+    """Seniority salary medians saved by the last analysed run, or [] when none can be read"""
+    path = path or os.environ.get('EXPERIENCE_SALARIES_PATH', DEFAULT_EXPERIENCE_PATH)
+    try:
+        with open(path, encoding='utf-8') as f:
+            levels = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(levels, list) or not all(isinstance(entry, dict) and 'level' in entry and 'salary' in entry
+                                                for entry in levels):
+        return []
+    return levels
+
 def create_fallback_data():
     """Create realistic fallback UK data"""
     print("🔄 Using fallback data (APIs unavailable)")
@@ -23,7 +54,8 @@ def create_fallback_data():
             'total_data_points': 1000,
             'region': 'United Kingdom',
             'update_frequency': 'weekly',
-            'data_quality': 'fallback'
+            'data_quality': 'fallback',
+            'sources_integrated': 1
         },
         'analytics': {
             'language_salary': [
@@ -48,13 +80,8 @@ def create_fallback_data():
                 {'index': 'Hybrid', 'count': 35},
                 {'index': 'Office', 'count': 20}
             ],
-            'experience_salary': [
-                {'level': 'Graduate (0-1 yrs)', 'salary': 28000},
-                {'level': 'Junior (1-3 yrs)', 'salary': 38000},
-                {'level': 'Mid-level (3-5 yrs)', 'salary': 52000},
-                {'level': 'Senior (5-8 yrs)', 'salary': 68000},
-                {'level': 'Lead (8+ yrs)', 'salary': 82000}
-            ]
+            # The last analysed run's medians, so the panel still reflects real postings
+            'experience_salary': load_experience_salaries() or FALLBACK_EXPERIENCE_SALARIES
         },
         'recommendations': {
             'top_roi_skills': [
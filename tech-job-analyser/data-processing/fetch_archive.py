@@ -0,0 +1,144 @@
+"""
+Record / replay of raw source responses
+FETCH_MODE=record stores every response the session receives in a gzipped JSON-lines
+archive; FETCH_MODE=replay serves the whole fetch layer from that archive with no network
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+
+from http_cache import request_key, normalize_url, build_response, install_cache
+
+FETCH_MODES = ('live', 'record', 'replay')
+DEFAULT_ARCHIVE = 'fixtures/fetch_archive.jsonl.gz'
+
+# Only headers the fetchers actually look at are kept, which keeps the archive small
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+class FetchArchive:
+    """Responses keyed like the HTTP cache, loaded from and saved to one gzip file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries[entry['key']] = entry
+
+    def add(self, request, response):
+        body = response.content
+        try:
+            stored_body = body.decode('utf-8')
+        except UnicodeDecodeError:
+            stored_body = {'b64': base64.b64encode(body).decode('ascii')}
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        with self.lock:
+            self.entries[request_key(request.method, request.url)] = {
+                'key': request_key(request.method, request.url),
+                'url': normalize_url(request.url),
+                'status': response.status_code,
+                'headers': headers,
+                'body': stored_body
+            }
+
+    def response_for(self, request):
+        entry = self.entries.get(request_key(request.method, request.url))
+        if entry is None:
+            return None
+        body = entry['body']
+        body = base64.b64decode(body['b64']) if isinstance(body, dict) else body.encode('utf-8')
+        return build_response(request, entry['status'], entry['headers'], body)
+
+    def save(self):
+        """Write entries sorted by key with a fixed gzip mtime so re-recording is diff-stable"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self.lock:
+            lines = [json.dumps(self.entries[key], ensure_ascii=False, separators=(',', ':'))
+                     for key in sorted(self.entries)]
+        with open(self.path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        print(f"📼 Recorded {len(lines)} responses to {self.path}")
+
+
+class RecordingAdapter(BaseAdapter):
+    """Passes requests to the wrapped adapter and archives each response"""
+
+    def __init__(self, inner, archive):
+        super().__init__()
+        self.inner = inner
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        self.archive.add(request, response)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers every request from the archive and never touches the network"""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.archive.response_for(request)
+        if response is None:
+            raise requests.ConnectionError(f"Not in fetch archive: {normalize_url(request.url)}")
+        # Nothing crossed the network, same as a cache hit
+        response.from_cache = True
+        return response
+
+    def close(self):
+        pass
+
+
+def get_fetch_mode():
+    mode = os.environ.get('FETCH_MODE', 'live').lower()
+    if mode not in FETCH_MODES:
+        raise ValueError(f"FETCH_MODE must be one of {', '.join(FETCH_MODES)}, got '{mode}'")
+    return mode
+
+
+def install_archive(session, mode=None, path=None):
+    """Wrap the session's adapters for record/replay; returns the archive or None when live"""
+    mode = mode or get_fetch_mode()
+    if mode == 'live':
+        return None
+
+    archive = FetchArchive(path or os.environ.get('FETCH_ARCHIVE', DEFAULT_ARCHIVE))
+    for prefix in ('https://', 'http://'):
+        if mode == 'replay':
+            session.mount(prefix, ReplayAdapter(archive))
+        else:
+            session.mount(prefix, RecordingAdapter(session.get_adapter(prefix), archive))
+
+    if mode == 'replay':
+        print(f"📼 Replaying {len(archive.entries)} recorded responses from {archive.path}")
+    else:
+        atexit.register(archive.save)
+    return archive
+
+
+def create_session():
+    """Session with the same cache and record/replay behaviour as the main fetcher"""
+    session = requests.Session()
+    mode = get_fetch_mode()
+    if mode != 'replay':
+        install_cache(session)
+    install_archive(session, mode)
+    return session
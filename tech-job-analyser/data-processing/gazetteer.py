@@ -0,0 +1,248 @@
+"""
+UK location gazetteer
+Maps Adzuna-style display names ("Shoreditch, East London", "Salford, Greater Manchester",
+"EC2A", "Reading, Berkshire") to a city bucket and its NUTS 1 region. Every alias is a key
+of one precomputed hash index; whole columns are normalized once per distinct string and
+the results, unknown strings included, are cached
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# City bucket -> NUTS 1 region
+CITY_REGIONS = {
+    'London': 'London',
+    'Manchester': 'North West', 'Liverpool': 'North West', 'Warrington': 'North West',
+    'Preston': 'North West', 'Chester': 'North West', 'Lancaster': 'North West', 'Blackburn': 'North West',
+    'Birmingham': 'West Midlands', 'Coventry': 'West Midlands', 'Wolverhampton': 'West Midlands',
+    'Stoke-on-Trent': 'West Midlands', 'Worcester': 'West Midlands', 'Telford': 'West Midlands',
+    'Leeds': 'Yorkshire and The Humber', 'Sheffield': 'Yorkshire and The Humber',
+    'Bradford': 'Yorkshire and The Humber', 'York': 'Yorkshire and The Humber',
+    'Hull': 'Yorkshire and The Humber', 'Wakefield': 'Yorkshire and The Humber',
+    'Huddersfield': 'Yorkshire and The Humber', 'Harrogate': 'Yorkshire and The Humber',
+    'Newcastle upon Tyne': 'North East', 'Sunderland': 'North East', 'Middlesbrough': 'North East',
+    'Durham': 'North East',
+    'Nottingham': 'East Midlands', 'Leicester': 'East Midlands', 'Derby': 'East Midlands',
+    'Lincoln': 'East Midlands', 'Northampton': 'East Midlands', 'Loughborough': 'East Midlands',
+    'Cambridge': 'East of England', 'Norwich': 'East of England', 'Ipswich': 'East of England',
+    'Peterborough': 'East of England', 'Luton': 'East of England', 'Chelmsford': 'East of England',
+    'Watford': 'East of England', 'Stevenage': 'East of England', 'St Albans': 'East of England',
+    'Colchester': 'East of England', 'Hemel Hempstead': 'East of England', 'Bedford': 'East of England',
+    'Reading': 'South East', 'Oxford': 'South East', 'Milton Keynes': 'South East',
+    'Brighton': 'South East', 'Southampton': 'South East', 'Portsmouth': 'South East',
+    'Guildford': 'South East', 'Basingstoke': 'South East', 'Slough': 'South East',
+    'Maidstone': 'South East', 'Crawley': 'South East', 'Canterbury': 'South East',
+    'Bracknell': 'South East', 'High Wycombe': 'South East', 'Farnborough': 'South East',
+    'Woking': 'South East', 'Tunbridge Wells': 'South East',
+    'Bristol': 'South West', 'Bath': 'South West', 'Exeter': 'South West', 'Plymouth': 'South West',
+    'Bournemouth': 'South West', 'Swindon': 'South West', 'Gloucester': 'South West',
+    'Cheltenham': 'South West', 'Poole': 'South West', 'Taunton': 'South West',
+    'Edinburgh': 'Scotland', 'Glasgow': 'Scotland', 'Aberdeen': 'Scotland', 'Dundee': 'Scotland',
+    'Inverness': 'Scotland', 'Stirling': 'Scotland',
+    'Cardiff': 'Wales', 'Swansea': 'Wales', 'Newport': 'Wales', 'Wrexham': 'Wales',
+    'Belfast': 'Northern Ireland', 'Derry': 'Northern Ireland'
+}
+
+# Boroughs, districts, business parks and neighbouring towns that roll up to a city bucket
+CITY_PLACES = {
+    'London': [
+        'city of london', 'the city', 'westminster', 'city of westminster', 'shoreditch', 'canary wharf',
+        'docklands', 'camden', 'islington', 'hackney', 'tower hamlets', 'southwark', 'lambeth', 'wandsworth',
+        'hammersmith', 'fulham', 'hammersmith and fulham', 'kensington', 'chelsea', 'kensington and chelsea',
+        'croydon', 'bromley', 'barnet', 'brent', 'ealing', 'enfield', 'greenwich', 'haringey', 'harrow',
+        'havering', 'hillingdon', 'hounslow', 'kingston upon thames', 'lewisham', 'merton', 'newham',
+        'redbridge', 'richmond upon thames', 'sutton', 'waltham forest', 'barking', 'dagenham',
+        'barking and dagenham', 'bexley', 'stratford', 'holborn', 'soho', 'mayfair', 'farringdon',
+        'clerkenwell', 'kings cross', 'old street', 'aldgate', 'liverpool street', 'moorgate', 'paddington',
+        'victoria', 'marylebone', 'covent garden', 'south bank', 'southbank', 'london bridge', 'battersea',
+        'wimbledon', 'uxbridge', 'heathrow', 'whitechapel', 'angel', 'euston', 'vauxhall', 'brixton',
+        'clapham', 'chiswick', 'acton', 'white city', 'wembley', 'st pauls', 'blackfriars', 'bloomsbury',
+        'fitzrovia', 'knightsbridge', 'belgravia', 'pimlico', 'bermondsey', 'borough', 'waterloo',
+        'spitalfields', 'hoxton', 'dalston', 'canada water', 'elephant and castle', 'putney', 'twickenham',
+        'feltham', 'brentford', 'park royal', 'romford', 'ilford', 'walthamstow', 'tottenham', 'wood green',
+        'finchley', 'hendon', 'kingston', 'middlesex'
+    ],
+    'Manchester': [
+        'salford', 'salford quays', 'mediacityuk', 'media city', 'trafford', 'trafford park', 'old trafford',
+        'stockport', 'oldham', 'rochdale', 'bury', 'wigan', 'bolton', 'tameside', 'altrincham', 'sale',
+        'didsbury', 'ancoats', 'spinningfields', 'northern quarter', 'manchester airport', 'cheadle',
+        'greater manchester'
+    ],
+    'Liverpool': ['birkenhead', 'wirral', 'st helens', 'bootle', 'knowsley', 'speke', 'merseyside'],
+    'Birmingham': [
+        'solihull', 'sutton coldfield', 'edgbaston', 'digbeth', 'west bromwich', 'walsall', 'dudley',
+        'sandwell', 'brindleyplace', 'birmingham business park'
+    ],
+    'Leeds': ['headingley', 'holbeck', 'kirkstall', 'morley', 'pudsey', 'horsforth', 'thorpe park'],
+    'Sheffield': ['rotherham', 'meadowhall', 'barnsley', 'doncaster'],
+    'Newcastle upon Tyne': [
+        'newcastle', 'gateshead', 'tyneside', 'north tyneside', 'south shields', 'jesmond', 'tyne and wear',
+        'cobalt business park'
+    ],
+    'Hull': ['kingston upon hull'],
+    'Nottingham': ['beeston', 'west bridgford', 'long eaton'],
+    'Bristol': [
+        'clifton', 'filton', 'temple meads', 'aztec west', 'bradley stoke', 'portishead', 'almondsbury',
+        'avonmouth', 'keynsham'
+    ],
+    'Reading': ['green park', 'thames valley park', 'wokingham', 'theale'],
+    'Cambridge': ['cambridge science park', 'cambourne', 'granta park', 'babraham'],
+    'Oxford': ['abingdon', 'didcot', 'harwell', 'milton park', 'kidlington'],
+    'Brighton': ['hove', 'brighton and hove'],
+    'Edinburgh': ['leith', 'livingston', 'musselburgh'],
+    'Glasgow': ['paisley', 'clydebank', 'renfrew', 'east kilbride', 'hamilton'],
+    'Cardiff': ['penarth', 'caerphilly', 'cardiff bay'],
+    'Belfast': ['lisburn', 'newtownabbey', 'holywood'],
+    'Derry': ['londonderry'],
+    'Bournemouth': ['christchurch'],
+    'Milton Keynes': ['bletchley'],
+    'Stoke-on-Trent': ['stoke', 'hanley', 'newcastle under lyme'],
+    'St Albans': ['saint albans'],
+    'Hemel Hempstead': ['maylands']
+}
+
+# Postcode areas -> city bucket
+POSTCODE_AREAS = {
+    'E': 'London', 'EC': 'London', 'N': 'London', 'NW': 'London', 'SE': 'London', 'SW': 'London',
+    'W': 'London', 'WC': 'London', 'BR': 'London', 'CR': 'London', 'EN': 'London', 'HA': 'London',
+    'IG': 'London', 'KT': 'London', 'RM': 'London', 'SM': 'London', 'TW': 'London', 'UB': 'London',
+    'M': 'Manchester', 'BL': 'Manchester', 'OL': 'Manchester', 'SK': 'Manchester', 'WN': 'Manchester',
+    'L': 'Liverpool', 'CH': 'Chester', 'WA': 'Warrington', 'PR': 'Preston', 'LA': 'Lancaster',
+    'BB': 'Blackburn', 'B': 'Birmingham', 'CV': 'Coventry', 'WV': 'Wolverhampton', 'WS': 'Birmingham',
+    'DY': 'Birmingham', 'ST': 'Stoke-on-Trent', 'WR': 'Worcester', 'TF': 'Telford', 'LS': 'Leeds',
+    'S': 'Sheffield', 'DN': 'Sheffield', 'BD': 'Bradford', 'YO': 'York', 'HU': 'Hull', 'WF': 'Wakefield',
+    'HD': 'Huddersfield', 'HG': 'Harrogate', 'NE': 'Newcastle upon Tyne', 'SR': 'Sunderland',
+    'TS': 'Middlesbrough', 'DH': 'Durham', 'NG': 'Nottingham', 'LE': 'Leicester', 'DE': 'Derby',
+    'LN': 'Lincoln', 'NN': 'Northampton', 'CB': 'Cambridge', 'NR': 'Norwich', 'IP': 'Ipswich',
+    'PE': 'Peterborough', 'LU': 'Luton', 'CM': 'Chelmsford', 'WD': 'Watford', 'SG': 'Stevenage',
+    'AL': 'St Albans', 'CO': 'Colchester', 'HP': 'Hemel Hempstead', 'MK': 'Milton Keynes', 'RG': 'Reading',
+    'OX': 'Oxford', 'BN': 'Brighton', 'SO': 'Southampton', 'PO': 'Portsmouth', 'GU': 'Guildford',
+    'SL': 'Slough', 'ME': 'Maidstone', 'RH': 'Crawley', 'CT': 'Canterbury', 'TN': 'Tunbridge Wells',
+    'BS': 'Bristol', 'BA': 'Bath', 'EX': 'Exeter', 'PL': 'Plymouth', 'BH': 'Bournemouth', 'SN': 'Swindon',
+    'GL': 'Gloucester', 'TA': 'Taunton', 'EH': 'Edinburgh', 'G': 'Glasgow', 'PA': 'Glasgow', 'ML': 'Glasgow',
+    'AB': 'Aberdeen', 'DD': 'Dundee', 'IV': 'Inverness', 'FK': 'Stirling', 'CF': 'Cardiff', 'SA': 'Swansea',
+    'NP': 'Newport', 'LL': 'Wrexham', 'BT': 'Belfast'
+}
+
+# Counties and region names -> NUTS 1 region, used when no town in the name is known
+COUNTY_REGIONS = {
+    'North East': ['north east', 'north east england', 'county durham', 'northumberland'],
+    'North West': ['north west', 'north west england', 'lancashire', 'cheshire', 'cumbria'],
+    'Yorkshire and The Humber': [
+        'yorkshire', 'yorkshire and the humber', 'yorkshire and humberside', 'west yorkshire', 'south yorkshire',
+        'north yorkshire', 'east yorkshire', 'east riding of yorkshire', 'humberside'
+    ],
+    'East Midlands': [
+        'east midlands', 'nottinghamshire', 'leicestershire', 'derbyshire', 'lincolnshire', 'northamptonshire',
+        'rutland'
+    ],
+    'West Midlands': [
+        'west midlands', 'midlands', 'staffordshire', 'warwickshire', 'worcestershire', 'shropshire',
+        'herefordshire'
+    ],
+    'East of England': [
+        'east of england', 'east anglia', 'eastern england', 'hertfordshire', 'essex', 'cambridgeshire',
+        'norfolk', 'suffolk', 'bedfordshire'
+    ],
+    'South East': [
+        'south east', 'south east england', 'home counties', 'thames valley', 'surrey', 'kent', 'sussex',
+        'east sussex', 'west sussex', 'hampshire', 'berkshire', 'buckinghamshire', 'oxfordshire', 'isle of wight'
+    ],
+    'South West': [
+        'south west', 'south west england', 'somerset', 'devon', 'cornwall', 'dorset', 'wiltshire',
+        'gloucestershire', 'avon'
+    ],
+    'Scotland': ['scotland', 'lothian', 'fife', 'lanarkshire', 'aberdeenshire', 'highlands', 'scottish borders'],
+    'Wales': ['wales', 'south wales', 'north wales', 'glamorgan', 'vale of glamorgan', 'gwent', 'pembrokeshire'],
+    'Northern Ireland': ['northern ireland', 'county antrim', 'county down', 'county armagh', 'county tyrone']
+}
+
+UK_BUCKET = 'UK'
+REMOTE_BUCKET = 'Remote'
+# Names that say nothing more specific than the country, or that the job is not office based
+COUNTRY_NAMES = ['uk', 'united kingdom', 'great britain', 'gb', 'britain', 'england']
+REMOTE_NAMES = ['remote', 'fully remote', 'home based', 'home working', 'work from home', 'anywhere']
+
+# Qualifiers dropped from the front of a name: "East London", "Greater Manchester", "City of Leeds"
+QUALIFIERS = re.compile(r'^(?:(?:north|south|east|west|central|inner|outer|greater|city of|city centre|county)\s+)+')
+POSTCODE = re.compile(r'^([a-z]{1,2})\d[a-z\d]?(?:\s*\d[a-z]{2})?$')
+NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def place_key(name):
+    """Lowercase words of a name with punctuation and apostrophes removed"""
+    return NON_WORD.sub(' ', str(name).lower().replace("'", '').replace('&', ' and ')).strip()
+
+
+class Gazetteer:
+    """(location bucket, NUTS 1 region) for UK place names, postcodes and display names"""
+
+    def __init__(self, cities=None, places=None, postcode_areas=None, counties=None):
+        cities = cities or CITY_REGIONS
+        # Key -> (bucket, region, names a city); county entries only decide the region
+        self.index = {}
+        for county_region, names in (counties or COUNTY_REGIONS).items():
+            for name in names:
+                self.index[place_key(name)] = (county_region, county_region, False)
+        for city, names in (places or CITY_PLACES).items():
+            for name in names:
+                self.index[place_key(name)] = (city, cities[city], True)
+        for city, region in cities.items():
+            self.index[place_key(city)] = (city, region, True)
+        for name in COUNTRY_NAMES:
+            self.index[name] = (UK_BUCKET, None, False)
+        for name in REMOTE_NAMES:
+            self.index[name] = (REMOTE_BUCKET, None, False)
+        self.postcode_areas = {
+            area.lower(): (city, cities[city], True) for area, city in (postcode_areas or POSTCODE_AREAS).items()
+        }
+        self.cache = {}
+
+    def lookup(self, part):
+        """Index entry for one comma-separated part of a name, or None"""
+        key = place_key(part)
+        entry = self.index.get(key)
+        if entry is None:
+            unqualified = QUALIFIERS.sub('', key)
+            if unqualified and unqualified != key:
+                entry = self.index.get(unqualified)
+        if entry is None:
+            postcode = POSTCODE.match(key)
+            if postcode:
+                entry = self.postcode_areas.get(postcode.group(1))
+        return entry
+
+    def normalize(self, name):
+        """(bucket, region) for one display name; the most specific known town wins, then a
+        county or region, and unknown names keep their first part with no region"""
+        if name in self.cache:
+            return self.cache[name]
+        parts = [part.strip() for part in str(name or '').split(',') if part.strip()]
+        result = None
+        for part in parts:
+            entry = self.lookup(part)
+            if entry is not None and entry[2]:
+                result = entry[:2]
+                break
+            if entry is not None and result is None:
+                result = entry[:2]
+        if result is None:
+            result = (parts[0], None) if parts else (UK_BUCKET, None)
+        self.cache[name] = result
+        return result
+
+    def normalize_column(self, values):
+        """(bucket, region) object arrays for a column, normalizing each distinct value once"""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        # Missing values get code -1, which picks the trailing ('UK', None) entry
+        results = [self.normalize(value) for value in uniques] + [(UK_BUCKET, None)]
+        buckets = np.empty(len(results), dtype=object)
+        regions = np.empty(len(results), dtype=object)
+        buckets[:] = [bucket for bucket, _ in results]
+        regions[:] = [region for _, region in results]
+        return buckets[codes], regions[codes]
+
+
+GAZETTEER = Gazetteer()
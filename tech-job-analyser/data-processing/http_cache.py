@@ -0,0 +1,192 @@
+"""
+Persistent HTTP response cache for the fetcher session
+SQLite-backed, keyed by URL and params without credentials, with per-host TTLs,
+size-bounded LRU eviction and ETag/Last-Modified revalidation
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Query parameters that carry credentials and must never reach a cache key or archive
+CREDENTIAL_PARAMS = {'app_id', 'app_key', 'api_key', 'apikey', 'key', 'token', 'access_token'}
+
+# Seconds a stored response is served without contacting the origin
+SOURCE_TTLS = {
+    'api.adzuna.com': 6 * 3600,
+    'api.ons.gov.uk': 24 * 3600,
+    'www.itjobswatch.co.uk': 12 * 3600
+}
+DEFAULT_TTL = 3600
+
+
+def normalize_url(url):
+    """URL with credential params removed and the remaining params sorted"""
+    parts = urlsplit(url)
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in CREDENTIAL_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def request_key(method, url):
+    """Stable key for a request, safe to persist"""
+    return hashlib.sha256(f"{method.upper()} {normalize_url(url)}".encode('utf-8')).hexdigest()
+
+
+def build_response(request, status_code, headers, body, url=None):
+    """Rebuild a requests Response from stored parts"""
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = url or request.url
+    response.request = request
+    response.reason = 'OK' if status_code == 200 else ''
+    return response
+
+
+class ResponseCache:
+    """Thread-safe SQLite store of GET responses with LRU eviction by total size"""
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024, ttls=None, default_ttl=DEFAULT_TTL):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self.db.commit()
+
+    def ttl_for(self, url):
+        return self.ttls.get(urlsplit(url).netloc.lower(), self.default_ttl)
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        url, status, headers, body, stored_at = row
+        return {'url': url, 'status': status, 'headers': json.loads(headers), 'body': body, 'stored_at': stored_at}
+
+    def put(self, key, url, response):
+        body = response.content
+        headers = json.dumps(dict(response.headers))
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), response.status_code, headers, body, len(body), now, now)
+            )
+            self.stats['stored'] += 1
+            self._evict()
+            self.db.commit()
+
+    def refresh(self, key):
+        """Mark an entry fresh again after a 304"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.stats['evicted'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def summary(self):
+        return (f"{self.stats['hits']} hits, {self.stats['revalidated']} revalidated, "
+                f"{self.stats['misses']} misses, {self.stats['evicted']} evicted")
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers GETs from the ResponseCache when possible"""
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        ttl = self.cache.ttl_for(request.url)
+        if request.method != 'GET' or ttl <= 0:
+            return super().send(request, **kwargs)
+
+        key = request_key(request.method, request.url)
+        entry = self.cache.get(key)
+
+        if entry and time.time() - entry['stored_at'] < ttl:
+            self.cache.stats['hits'] += 1
+            response = build_response(request, entry['status'], entry['headers'], entry['body'])
+            response.from_cache = True
+            return response
+
+        if entry:
+            etag = entry['headers'].get('ETag')
+            last_modified = entry['headers'].get('Last-Modified')
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.stats['revalidated'] += 1
+            self.cache.refresh(key)
+            response = build_response(request, entry['status'], entry['headers'], entry['body'])
+            response.from_cache = True
+            return response
+
+        self.cache.stats['misses'] += 1
+        if response.status_code == 200:
+            self.cache.put(key, request.url, response)
+        return response
+
+
+def install_cache(session, path=None, max_bytes=None):
+    """Mount a CachingAdapter on the session unless HTTP_CACHE=0; returns the cache or None"""
+    if os.environ.get('HTTP_CACHE', '1') == '0':
+        return None
+    path = path or os.environ.get('HTTP_CACHE_PATH', '.cache/http_cache.sqlite')
+    max_bytes = max_bytes or int(float(os.environ.get('HTTP_CACHE_MAX_MB', 200)) * 1024 * 1024)
+    cache = ResponseCache(path, max_bytes=max_bytes)
+    adapter = CachingAdapter(cache)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return cache
@@ -0,0 +1,174 @@
+"""
+IT Jobs Watch scraper
+Picks the tracked skills off the homepage, then crawls their /jobs/uk/<skill>.do pages
+concurrently for median salaries and vacancy counts. Pages are fed to an incremental lxml
+parser that stops as soon as the part it needs has been read.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from rate_limiter import TokenBucket
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Permanent vacancies over the last six months above which a skill counts as in high demand
+HIGH_DEMAND_VACANCIES = 1000
+
+SKILL_LINK = re.compile(r'/jobs/uk/[^/]+\.do$')
+MEDIAN_SALARY_LABEL = re.compile(r'^median annual salary', re.IGNORECASE)
+VACANCIES_LABEL = re.compile(r'^(?:permanent jobs citing|live job vacancies)', re.IGNORECASE)
+NON_DIGIT = re.compile(r'[^\d.]')
+
+
+def _text(element):
+    return ' '.join(''.join(element.itertext()).split())
+
+
+def _number(text):
+    digits = NON_DIGIT.sub('', text.split('-')[0])
+    try:
+        return int(float(digits)) if digits else None
+    except ValueError:
+        return None
+
+
+def pull_elements(content, tag, encoding=None, done=None):
+    """Yield each closed <tag> element while feeding the page to the parser chunk by chunk
+
+    Stops feeding once done() is true, so the rest of the page is never parsed.
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag=tag, encoding=encoding)
+    for offset in range(0, len(content), FEED_CHUNK_SIZE):
+        parser.feed(content[offset:offset + FEED_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            yield element
+        if done and done():
+            return
+    parser.close()
+    for _, element in parser.read_events():
+        yield element
+
+
+def parse_skill_links(content, base_url, limit, encoding=None):
+    """(skill name, absolute URL) for the first `limit` distinct skill pages linked from a page"""
+    links = {}
+    for anchor in pull_elements(content, 'a', encoding, done=lambda: len(links) >= limit):
+        href = anchor.get('href') or ''
+        name = _text(anchor)
+        if SKILL_LINK.search(href) and len(name) > 2 and len(links) < limit:
+            links.setdefault(urljoin(base_url, href), name)
+    return [(name, url) for url, name in links.items()]
+
+
+def parse_skill_summary(content, encoding=None):
+    """Median salary and vacancy count from the summary table of a skill page"""
+    summary = {}
+    found = []
+    for table in pull_elements(content, 'table', encoding, done=lambda: bool(found)):
+        if 'summary' not in (table.get('class') or '').split():
+            continue
+        found.append(table)
+        for row in table.iterfind('.//tr'):
+            cells = [_text(cell) for cell in row if cell.tag in ('td', 'th')]
+            if len(cells) < 2:
+                continue
+            if 'median_salary' not in summary and MEDIAN_SALARY_LABEL.match(cells[0]):
+                summary['median_salary'] = _number(cells[1])
+            elif 'vacancies' not in summary and VACANCIES_LABEL.match(cells[0]):
+                summary['vacancies'] = _number(cells[1])
+    return summary
+
+
+class ITJobsWatchScraper:
+    BASE_URL = "https://www.itjobswatch.co.uk/"
+
+    def __init__(self, session, max_skills=None, concurrency=None, rate_limit=None, time_budget=None):
+        self.session = session
+        self.max_skills = max_skills or int(os.environ.get('ITJOBSWATCH_MAX_SKILLS', 15))
+        self.concurrency = concurrency or int(os.environ.get('ITJOBSWATCH_CONCURRENCY', 4))
+        if rate_limit is None:
+            rate_limit = float(os.environ.get('ITJOBSWATCH_RATE_LIMIT', 4))
+        self.limiter = TokenBucket(rate_limit, capacity=self.concurrency)
+        self.time_budget = time_budget
+        self.stats = {'requests': 0, 'pages': 0, 'failed': 0, 'elapsed': 0.0}
+        self.stats_lock = threading.Lock()
+
+    def get(self, url, deadline):
+        """Page body and encoding, or None once the time budget is spent"""
+        if not self.limiter.acquire(deadline):
+            return None
+        timeout = 10 if deadline is None else max(1.0, min(10, deadline - time.monotonic()))
+        with self.stats_lock:
+            self.stats['requests'] += 1
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.content, response.encoding
+
+    def fetch_skill(self, name, url, deadline):
+        """Trend record for one skill page, or None if it has no median salary"""
+        page = self.get(url, deadline)
+        if page is None:
+            return None
+        content, encoding = page
+        summary = parse_skill_summary(content, encoding)
+        if not summary.get('median_salary'):
+            return None
+
+        vacancies = summary.get('vacancies')
+        return {
+            'skill': name,
+            'median_salary': summary['median_salary'],
+            'vacancies': vacancies,
+            'demand': 'High' if (vacancies or 0) >= HIGH_DEMAND_VACANCIES else 'Medium',
+            'source': 'IT Jobs Watch'
+        }
+
+    def scrape(self):
+        """Trend records for the homepage's skills, busiest first; pages still in flight when the
+        time budget runs out are dropped"""
+        start = time.monotonic()
+        deadline = start + self.time_budget if self.time_budget else None
+
+        homepage = self.get(self.BASE_URL, deadline)
+        if homepage is None:
+            return []
+        content, encoding = homepage
+        links = parse_skill_links(content, self.BASE_URL, self.max_skills, encoding)
+        print(f"🔍 IT Jobs Watch: Crawling {len(links)} skill pages ({self.concurrency} in flight)...")
+
+        skills_data = {}
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='itjobswatch')
+        try:
+            futures = {executor.submit(self.fetch_skill, name, url, deadline): index
+                       for index, (name, url) in enumerate(links)}
+            while futures:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    index = futures.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        self.stats['failed'] += 1
+                        print(f"   ❌ IT Jobs Watch page {links[index][1]} failed: {e}")
+                        continue
+                    if record:
+                        self.stats['pages'] += 1
+                        skills_data[index] = record
+        finally:
+            # Pages still queued when the budget runs out are not worth waiting for
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.stats['elapsed'] = time.monotonic() - start
+        records = [skills_data[index] for index in sorted(skills_data)]
+        records.sort(key=lambda record: record['vacancies'] or 0, reverse=True)
+        return records
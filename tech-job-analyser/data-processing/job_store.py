@@ -0,0 +1,209 @@
+"""
+Persistent job store
+Keeps every posting ever fetched, keyed by source job id (or a content key when a source
+has none), and maintains weekly aggregates incrementally from new and changed postings only.
+Salaries outside the plausible annual range are counted as postings but not as salaries
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+
+from skill_tagger import SKILL_TAGGER
+from analysis_engine import classify_remote
+from salary_normalization import MIN_ANNUAL, MAX_ANNUAL
+
+# PRAGMA user_version; stores below it hold weekly_stats built from unbounded salaries
+STATS_VERSION = 1
+JOB_FIELDS = ('title', 'company', 'location', 'salary_min', 'salary_max', 'salary_avg', 'category', 'description')
+
+
+def iso_week(moment):
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def job_key(job):
+    """Stable identity: the source's own id when it has one, else title/company/location"""
+    source = job.get('source', 'Unknown')
+    source_id = job.get('source_id')
+    if not source_id:
+        identity = '|'.join(str(job.get(field) or '').strip().lower() for field in ('title', 'company', 'location'))
+        source_id = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+    return f"{source}:{source_id}"
+
+
+def content_hash(job):
+    payload = json.dumps([job.get(field) for field in JOB_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def aggregate_keys(job):
+    """(dimension, key) pairs a posting contributes to"""
+    text = f"{job.get('title') or ''} {job.get('description') or ''}"
+    keys = [('overall', 'all'), ('source', job.get('source') or 'Unknown'),
+            ('location', job.get('location') or 'UK'), ('remote', classify_remote(text))]
+    keys.extend(('skill', skill) for skill in SKILL_TAGGER.tag(text))
+    return keys
+
+
+class JobStore:
+    """SQLite job history with incrementally maintained weekly_stats"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('JOB_STORE_PATH', '.cache/job_store.sqlite')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT, company TEXT, location TEXT,
+                salary_min REAL, salary_max REAL, salary_avg REAL,
+                category TEXT, description TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS weekly_stats (
+                week TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                postings INTEGER NOT NULL DEFAULT 0,
+                salaried INTEGER NOT NULL DEFAULT 0,
+                salary_sum REAL NOT NULL DEFAULT 0,
+                salary_sq_sum REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (week, dimension, key)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+        """)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < STATS_VERSION:
+            self._rebuild_weekly_stats()
+
+    def _existing(self, keys):
+        rows = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in self.db.execute(
+                f"SELECT job_key, content_hash, first_seen, {', '.join(JOB_FIELDS)}, source "
+                f"FROM jobs WHERE job_key IN ({placeholders})", chunk
+            ):
+                rows[row[0]] = {
+                    'content_hash': row[1],
+                    'first_seen': row[2],
+                    **dict(zip(JOB_FIELDS, row[3:3 + len(JOB_FIELDS)])),
+                    'source': row[-1]
+                }
+        return rows
+
+    @staticmethod
+    def _add_contribution(delta, week, job, sign):
+        salary = job.get('salary_avg')
+        # Raw day or hourly rates stored by older batch runs stay out of the salary sums
+        annual = salary is not None and MIN_ANNUAL <= salary <= MAX_ANNUAL
+        for dimension, key in aggregate_keys(job):
+            cell = delta[(week, dimension, key)]
+            cell[0] += sign
+            if annual:
+                cell[1] += sign
+                cell[2] += sign * salary
+                cell[3] += sign * salary * salary
+
+    def _rebuild_weekly_stats(self):
+        """Recompute weekly_stats from the stored postings, each in the week it was first seen"""
+        delta = defaultdict(lambda: [0, 0, 0.0, 0.0])
+        for row in self.db.execute(f"SELECT first_seen, {', '.join(JOB_FIELDS)}, source FROM jobs"):
+            job = {**dict(zip(JOB_FIELDS, row[1:-1])), 'source': row[-1]}
+            self._add_contribution(delta, iso_week(datetime.fromisoformat(row[0])), job, +1)
+        with self.db:
+            self.db.execute("DELETE FROM weekly_stats")
+            self._write_stats(delta)
+            self.db.execute(f"PRAGMA user_version = {STATS_VERSION}")
+
+    def _write_stats(self, delta):
+        self.db.executemany("""
+            INSERT INTO weekly_stats (week, dimension, key, postings, salaried, salary_sum, salary_sq_sum)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (week, dimension, key) DO UPDATE SET
+                postings = postings + excluded.postings,
+                salaried = salaried + excluded.salaried,
+                salary_sum = salary_sum + excluded.salary_sum,
+                salary_sq_sum = salary_sq_sum + excluded.salary_sq_sum
+        """, [(*cell_key, *cell) for cell_key, cell in delta.items() if any(cell)])
+
+    def upsert(self, jobs, seen_at=None):
+        """Insert new postings, update changed ones and touch the rest; returns change counts"""
+        seen_at = seen_at or datetime.now()
+        now = seen_at.isoformat(timespec='seconds')
+        week = iso_week(seen_at)
+
+        batch = {}
+        for job in jobs:
+            batch[job_key(job)] = job
+        existing = self._existing(batch)
+
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        delta = defaultdict(lambda: [0, 0, 0.0, 0.0])
+        inserts, updates, touches = [], [], []
+
+        for key, job in batch.items():
+            digest = content_hash(job)
+            values = tuple(job.get(field) for field in JOB_FIELDS)
+            previous = existing.get(key)
+
+            if previous is None:
+                counts['new'] += 1
+                inserts.append((key, job.get('source', 'Unknown'), digest, *values, now, now))
+                self._add_contribution(delta, week, job, +1)
+            elif previous['content_hash'] != digest:
+                # A posting stays in the week it was first seen; swap its old contribution for the new one
+                counts['changed'] += 1
+                first_week = iso_week(datetime.fromisoformat(previous['first_seen']))
+                updates.append((digest, *values, now, key))
+                self._add_contribution(delta, first_week, previous, -1)
+                self._add_contribution(delta, first_week, job, +1)
+            else:
+                counts['unchanged'] += 1
+                touches.append((now, key))
+
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO jobs (job_key, source, content_hash, {', '.join(JOB_FIELDS)}, first_seen, last_seen) "
+                f"VALUES ({','.join('?' * (len(JOB_FIELDS) + 5))})", inserts
+            )
+            self.db.executemany(
+                f"UPDATE jobs SET content_hash = ?, {', '.join(f'{field} = ?' for field in JOB_FIELDS)}, "
+                f"last_seen = ? WHERE job_key = ?", updates
+            )
+            self.db.executemany("UPDATE jobs SET last_seen = ? WHERE job_key = ?", touches)
+            self._write_stats(delta)
+
+        return counts
+
+    def weekly_stats(self, dimension=None):
+        """Rows of (week, dimension, key, postings, salaried, salary_sum, salary_sq_sum); the
+        salary columns count only salaries inside the annual bounds"""
+        query = "SELECT week, dimension, key, postings, salaried, salary_sum, salary_sq_sum FROM weekly_stats"
+        if dimension:
+            return self.db.execute(query + " WHERE dimension = ? ORDER BY week, key", (dimension,)).fetchall()
+        return self.db.execute(query + " ORDER BY week, dimension, key").fetchall()
+
+    def salaried_postings(self):
+        """(first_seen, title, description, location, salary_avg) of every stored posting with a
+        plausible annual salary; rows stored before batch runs recorded annualized salaries can
+        hold raw day or hourly rates, which the bounds leave out"""
+        return self.db.execute(
+            "SELECT first_seen, title, description, location, salary_avg FROM jobs WHERE salary_avg BETWEEN ? AND ?",
+            (MIN_ANNUAL, MAX_ANNUAL)
+        ).fetchall()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        self.db.close()
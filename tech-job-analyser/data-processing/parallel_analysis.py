@@ -0,0 +1,96 @@
+"""
+Process-pool analysis
+Shards the job frame by source or by a hash of each posting across worker processes.
+Workers tag skills, classify work arrangements and reduce their shard to an aggregate cube
+(counts and binned salary histograms per skill, location, seniority level and work
+arrangement); the parent merges the shard cubes, which add up exactly to the cube of the
+whole frame
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from aggregate_cube import AggregateCube
+from analysis_engine import remote_arrangements
+from skill_tagger import SKILL_TAGGER
+
+
+def shard_rows(jobs_df, shards, by='hash'):
+    """Row positions of jobs_df, one array per non-empty shard"""
+    if by == 'source':
+        # Whole sources go to the currently smallest shard, largest source first
+        sizes = [0] * shards
+        assigned = [[] for _ in range(shards)]
+        for rows in sorted(jobs_df.groupby('source').indices.values(), key=len, reverse=True):
+            target = sizes.index(min(sizes))
+            assigned[target].append(rows)
+            sizes[target] += len(rows)
+        return [np.sort(np.concatenate(rows)) for rows in assigned if rows]
+
+    keys = pd.util.hash_pandas_object(jobs_df[['source', 'source_id', 'title', 'company']], index=False)
+    shard = keys.to_numpy() % np.uint64(shards)
+    return [rows for rows in (np.flatnonzero(shard == index) for index in range(shards)) if len(rows)]
+
+
+def _tag_shard(texts):
+    return SKILL_TAGGER.tag_matrix(texts)
+
+
+class ParallelAnalyzer:
+    """Runs skill tagging and the aggregates of one job frame on a process pool"""
+
+    def __init__(self, workers=None, shard_by=None):
+        self.workers = workers or int(os.environ.get('ANALYSIS_WORKERS', 0)) or os.cpu_count() or 1
+        self.shard_by = shard_by or os.environ.get('ANALYSIS_SHARD_BY', 'hash')
+        self.executor = None
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown()
+
+    def shards(self, jobs_df):
+        return shard_rows(jobs_df, self.workers, self.shard_by)
+
+    def tag_skills(self, jobs_df):
+        """Sparse job x skill matrix aligned with jobs_df rows, tagged shard by shard"""
+        shards = self.shards(jobs_df)
+        if not shards:
+            return SKILL_TAGGER.tag_matrix([])
+        texts = jobs_df['text'].to_numpy()
+        matrices = list(self.executor.map(_tag_shard, [texts[rows] for rows in shards]))
+        # Put the rows back in frame order
+        order = np.argsort(np.concatenate(shards), kind='stable')
+        return sparse.vstack(matrices, format='csr')[order]
+
+    def remote_arrangements(self, jobs_df):
+        """Work arrangement per row of jobs_df, classified shard by shard"""
+        shards = self.shards(jobs_df)
+        if not shards:
+            return remote_arrangements(jobs_df['text'])
+        texts = jobs_df['text'].to_numpy()
+        arrangements = list(self.executor.map(remote_arrangements, [texts[rows] for rows in shards]))
+        return np.concatenate(arrangements)[np.argsort(np.concatenate(shards), kind='stable')]
+
+    def aggregate(self, jobs_df, skill_hits, seniority=None):
+        """AggregateCube of the frame, built shard by shard and merged"""
+        shards = self.shards(jobs_df)
+        if not shards:
+            return AggregateCube.from_frame(jobs_df, skill_hits, seniority)
+        levels = np.asarray(seniority, dtype=object) if seniority is not None else None
+        salaries = jobs_df['salary_avg'].to_numpy(dtype=float)
+        locations = jobs_df['location'].to_numpy()
+        arrangements = jobs_df['remote'].to_numpy() if 'remote' in jobs_df else self.remote_arrangements(jobs_df)
+        futures = [
+            self.executor.submit(AggregateCube.from_columns, salaries[rows], locations[rows], arrangements[rows],
+                                 skill_hits[rows], levels[rows] if levels is not None else None)
+            for rows in shards
+        ]
+        return reduce(AggregateCube.merge, (future.result() for future in futures))
@@ -0,0 +1,145 @@
+"""
+Columnar export of the normalized job table
+Writes a hive-partitioned Parquet dataset (fetched_date / source) with dictionary-encoded
+low-cardinality columns, so notebooks and later stages can column-prune or memory-map it
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+
+from analysis_engine import remote_arrangements
+from skill_tagger import SKILL_TAGGER
+
+DEFAULT_DATASET_DIR = 'output/jobs'
+DICTIONARY_COLUMNS = ['source', 'location', 'category', 'remote']
+
+
+def _job_schema(pa):
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('source_id', pa.string()),
+        ('title', pa.string()),
+        ('company', pa.string()),
+        ('location', categorical),
+        ('salary_min', pa.float64()),
+        ('salary_max', pa.float64()),
+        ('salary_avg', pa.float64()),
+        ('skills', pa.list_(pa.string())),
+        ('remote', categorical),
+        ('category', categorical),
+        ('source', categorical),
+        ('fetched_at', pa.timestamp('s')),
+        ('fetched_date', pa.string())
+    ])
+
+
+def build_jobs_table(jobs_df, skill_hits=None, fetched_at=None):
+    """Typed Arrow table from the analysis DataFrame and its skill matrix"""
+    import pyarrow as pa
+
+    if skill_hits is None:
+        skill_hits = SKILL_TAGGER.tag_matrix(jobs_df['text'])
+    skill_names = np.asarray(SKILL_TAGGER.skills, dtype=object)
+    skills = pa.ListArray.from_arrays(
+        pa.array(skill_hits.indptr, type=pa.int32()),
+        pa.array(skill_names[skill_hits.indices], type=pa.string())
+    )
+
+    fetched_at = np.datetime64(fetched_at or datetime.now(), 's')
+    timestamps = jobs_df['fetched_at'].to_numpy(dtype='datetime64[s]')
+    timestamps = np.where(np.isnat(timestamps), fetched_at, timestamps)
+
+    if 'remote' not in jobs_df:
+        jobs_df = jobs_df.assign(remote=remote_arrangements(jobs_df['text']))
+
+    schema = _job_schema(pa)
+    columns = {
+        'source_id': pa.array(jobs_df['source_id'], type=pa.string()),
+        'title': pa.array(jobs_df['title'], type=pa.string()),
+        'company': pa.array(jobs_df['company'], type=pa.string()),
+        'skills': skills,
+        'fetched_at': pa.array(timestamps, type=pa.timestamp('s')),
+        'fetched_date': pa.array(np.datetime_as_string(timestamps, unit='D'), type=pa.string())
+    }
+    for column in ('salary_min', 'salary_max', 'salary_avg'):
+        columns[column] = pa.array(jobs_df[column].to_numpy(dtype=float), type=pa.float64(), from_pandas=True)
+    for column in DICTIONARY_COLUMNS:
+        columns[column] = pa.array(jobs_df[column], type=pa.string()).dictionary_encode()
+
+    return pa.table([columns[field.name] for field in schema], schema=schema)
+
+
+def export_jobs_parquet(jobs_df, skill_hits=None, base_dir=None):
+    """Write the run's postings; rewriting the same day/source partition replaces it"""
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        print("⚠️ pyarrow not installed, skipping Parquet export")
+        return None
+
+    base_dir = base_dir or os.environ.get('JOBS_DATASET_DIR', DEFAULT_DATASET_DIR)
+    table = build_jobs_table(jobs_df, skill_hits)
+    _write_table(ds, table, base_dir, 'part-{i}.parquet', 'delete_matching')
+    print(f"🧱 Exported {table.num_rows} jobs to Parquet dataset {base_dir}")
+    return base_dir
+
+
+def _write_table(ds, table, base_dir, basename_template, existing_data_behavior, file_visitor=None):
+    partitioning = ds.partitioning(table.select(['fetched_date', 'source']).schema, flavor='hive')
+    file_options = ds.ParquetFileFormat().make_write_options(
+        compression='zstd',
+        use_dictionary=[column for column in DICTIONARY_COLUMNS if column != 'source']
+    )
+    ds.write_dataset(
+        table, base_dir,
+        format='parquet',
+        partitioning=partitioning,
+        file_options=file_options,
+        basename_template=basename_template,
+        existing_data_behavior=existing_data_behavior,
+        file_visitor=file_visitor
+    )
+
+
+class JobsDatasetWriter:
+    """Writes a run's postings batch by batch; on close, files an earlier run left in the
+    partitions this run wrote are removed, matching export_jobs_parquet's replacement"""
+
+    def __init__(self, base_dir=None):
+        import pyarrow.dataset as ds
+
+        self.ds = ds
+        self.base_dir = base_dir or os.environ.get('JOBS_DATASET_DIR', DEFAULT_DATASET_DIR)
+        self.run_token = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.batches = 0
+        self.rows = 0
+        self.written = set()
+
+    def write(self, jobs_df, skill_hits=None):
+        table = build_jobs_table(jobs_df, skill_hits)
+        _write_table(
+            self.ds, table, self.base_dir,
+            f'part-{self.run_token}-{self.batches}-{{i}}.parquet', 'overwrite_or_ignore',
+            file_visitor=lambda written_file: self.written.add(os.path.normpath(written_file.path))
+        )
+        self.batches += 1
+        self.rows += table.num_rows
+
+    def close(self):
+        for partition in {os.path.dirname(path) for path in self.written}:
+            for name in os.listdir(partition):
+                path = os.path.normpath(os.path.join(partition, name))
+                if name.endswith('.parquet') and path not in self.written:
+                    os.remove(path)
+        print(f"🧱 Exported {self.rows} jobs to Parquet dataset {self.base_dir} in {self.batches} batches")
+
+
+def load_jobs_dataset(base_dir=None, columns=None, filter=None):
+    """Read the dataset back as a pandas DataFrame, reading only the requested columns"""
+    import pyarrow.dataset as ds
+
+    base_dir = base_dir or os.environ.get('JOBS_DATASET_DIR', DEFAULT_DATASET_DIR)
+    dataset = ds.dataset(base_dir, format='parquet', partitioning='hive')
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
@@ -0,0 +1,108 @@
+"""
+Job posting records
+Postings travel through the pipeline as slotted JobPosting records instead of per-posting
+dicts. The repetitive fields (company, location, category, source) are interned, so every
+posting from the same board or city shares one string object, and the frame builder reads
+columns straight off the slots. Records keep a small dict-style interface (get, [],
+setdefault, items) so the stages written against dicts work unchanged
+"""
+
+import sys
+from operator import attrgetter
+
+POSTING_FIELDS = ('source_id', 'title', 'company', 'location', 'salary_min', 'salary_max', 'salary_avg',
+                  'category', 'description', 'source', 'fetched_at')
+INTERNED_FIELDS = ('company', 'location', 'category', 'source')
+# Set by pipeline stages (salary parsing, streaming tagging); None until then
+ANNOTATIONS = ('pay_period', 'salary_imputed', 'skills', 'remote', 'seniority')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobPosting:
+    """One normalized posting; missing fields are None and read as absent through get()"""
+
+    __slots__ = POSTING_FIELDS + ANNOTATIONS
+
+    def __init__(self, source_id=None, title=None, company=None, location=None, salary_min=None,
+                 salary_max=None, salary_avg=None, category=None, description=None, source=None,
+                 fetched_at=None):
+        self.source_id = source_id
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.salary_avg = salary_avg
+        self.category = _intern(category)
+        self.description = description
+        self.source = _intern(source)
+        self.fetched_at = fetched_at
+        for annotation in ANNOTATIONS:
+            setattr(self, annotation, None)
+
+    @classmethod
+    def from_dict(cls, record):
+        posting = cls(**{field: record.get(field) for field in POSTING_FIELDS})
+        for annotation in ANNOTATIONS:
+            setattr(posting, annotation, record.get(annotation))
+        return posting
+
+    def to_dict(self):
+        """Plain dict of the posting fields plus any annotations that are set"""
+        return dict(self.items())
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+
+    def setdefault(self, key, default=None):
+        if self.get(key) is None:
+            self[key] = default
+        return self[key]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def items(self):
+        for field in POSTING_FIELDS:
+            yield field, getattr(self, field)
+        for annotation in ANNOTATIONS:
+            value = getattr(self, annotation)
+            if value is not None:
+                yield annotation, value
+
+    def values(self):
+        return (value for _, value in self.items())
+
+    def __repr__(self):
+        return f"JobPosting({self.source}:{self.source_id or ''} {self.title!r} @ {self.location})"
+
+
+def as_posting(record):
+    """A JobPosting for a posting or a plain dict (fixtures, fetched JSON)"""
+    return record if isinstance(record, JobPosting) else JobPosting.from_dict(record)
+
+
+def posting_columns(postings, fields=POSTING_FIELDS):
+    """Object arrays read off the records' slots, which pd.DataFrame adopts without copying"""
+    import numpy as np
+
+    postings = [as_posting(posting) for posting in postings]
+    columns = {}
+    for field in fields:
+        columns[field] = np.empty(len(postings), dtype=object)
+        columns[field][:] = list(map(attrgetter(field), postings))
+    return columns
@@ -4,30 +4,75 @@ UK Tech Job Market Analyzer - Enhanced with Multiple Data Sources
 Integrated with free APIs for comprehensive UK tech market data
 """
 
-import pandas as pd
-import numpy as np
 import json
 import os
-import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
-from bs4 import BeautifulSoup
-import re
-from dotenv import load_dotenv
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import argparse
+from contextlib import nullcontext
 
-# Load environment variables
-load_dotenv()
+from postings import JobPosting
+from sources import SOURCES, FALLBACK_ITJOBS_DATA, AdzunaSource, parse_sources
+from run_report import RUN_PROFILER, code_profiler
+
+# Analysis, HTTP and scraping dependencies are imported by the stages that use them, so
+# partial runs (and the fallback path) only load what they need
+
+DEFAULT_FETCHED_PATH = 'output/fetched_jobs.json'
+DEFAULT_DASHBOARD_PATH = 'output/dashboard_data.json'
+
+# Shown until a run has salaried postings at some seniority level
+DEFAULT_EXPERIENCE_SALARIES = [
+    {'level': 'Graduate (0-1 yrs)', 'salary': 30000},
+    {'level': 'Junior (1-3 yrs)', 'salary': 42000},
+    {'level': 'Mid-level (3-5 yrs)', 'salary': 58000},
+    {'level': 'Senior (5-8 yrs)', 'salary': 75000},
+    {'level': 'Lead (8+ yrs)', 'salary': 92000}
+]
 
 class EnhancedUKJobDataFetcher:
-    def __init__(self):
+    def __init__(self, concurrent=None, source_timeout=None, total_timeout=None, source_timeouts=None,
+                 sources=None):
+        import requests
+        from http_cache import install_cache
+        from fetch_archive import get_fetch_mode, install_archive
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Record/replay wraps whatever transport is mounted, so the cache goes in first
+        self.fetch_mode = get_fetch_mode()
+        self.http_cache = install_cache(self.session) if self.fetch_mode != 'replay' else None
+        self.archive = install_archive(self.session, self.fetch_mode)
+        RUN_PROFILER.track_session(self.session)
+        
+        # Fan-out settings: every source runs at once and is abandoned once its
+        # own deadline (or the global one) passes
+        if concurrent is None:
+            concurrent = os.environ.get('FETCH_CONCURRENT', '1') != '0'
+        self.concurrent = concurrent
+        self.source_timeout = source_timeout or float(os.environ.get('FETCH_SOURCE_TIMEOUT', 30))
+        self.total_timeout = total_timeout or float(os.environ.get('FETCH_TOTAL_TIMEOUT', 120))
+        # The paginated Adzuna harvest is the long pole, so it gets its own deadline
+        self.source_timeouts = {'Adzuna': float(os.environ.get('ADZUNA_SOURCE_TIMEOUT', 90))}
+        self.source_timeouts.update(source_timeouts or {})
+        # When the sources being run started (each in turn when fetching sequentially)
+        self.sources_started = None
+        # Registered source slugs to run (FETCH_SOURCES or every source)
+        if sources is None:
+            sources = parse_sources(os.environ.get('FETCH_SOURCES'))
+        self.sources = [SOURCES[slug](self) for slug in sources]
+        self.itjobs_data = None
+        self.additional_insights = {}
 
     def get_fallback_data(self):
         """Comprehensive fallback data"""
-        return [
+        postings = [
             {
                 'title': 'Senior Python Developer',
                 'company': 'Tech Company Ltd',
@@ -51,459 +96,388 @@ class EnhancedUKJobDataFetcher:
                 'source': 'UK Market Average'
             }
         ]
+        return [JobPosting(**posting) for posting in postings]
 
-    def fetch_adzuna_data(self):
-        """Fetch UK tech job data from Adzuna API"""
-        try:
-            app_id = os.environ.get('ADZUNA_APP_ID')
-            app_key = os.environ.get('ADZUNA_APP_KEY')
+    def adzuna_jobs(self, results):
+        """Job records for the salaried postings of an Adzuna results page"""
+        return AdzunaSource.jobs(results)
 
-            if not app_id or not app_key:
-                print("⚠️ Adzuna API credentials not found.")
-                return []
-            
-            print(f"🔑 Using Adzuna API with App ID: {app_id[:8]}...")
-            
-            base_url = "https://api.adzuna.com/v1/api/jobs/gb/search"
-            search_terms = ['python', 'javascript', 'java', 'developer', 'software engineer']
-            
-            all_jobs = []
-            
-            for page in [1, 2]:
-                for term in search_terms[:3]:
-                    url = f"{base_url}/{page}"
-                    params = {
-                        'app_id': app_id,
-                        'app_key': app_key,
-                        'what': term,
-                        'results_per_page': 20,
-                        'content-type': 'application/json'
-                    }
-                    
-                    print(f"🔍 Adzuna: Searching '{term}' jobs...")
-                    
-                    try:
-                        response = self.session.get(url, params=params, timeout=15)
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            results = data.get('results', [])
-                            
-                            for job in results:
-                                salary_min = job.get('salary_min')
-                                salary_max = job.get('salary_max')
-                                
-                                if salary_min or salary_max:
-                                    salary_avg = self.calculate_salary(salary_min, salary_max)
-                                    
-                                    all_jobs.append({
-                                        'title': job.get('title', ''),
-                                        'company': job.get('company', {}).get('display_name', 'Unknown'),
-                                        'location': job.get('location', {}).get('display_name', 'UK'),
-                                        'salary_min': salary_min,
-                                        'salary_max': salary_max,
-                                        'salary_avg': salary_avg,
-                                        'category': 'Technology',
-                                        'description': job.get('description', '')[:500],
-                                        'source': 'Adzuna'
-                                    })
-                        
-                    except Exception as e:
-                        print(f"   ❌ Adzuna request failed: {e}")
-                    
-                    time.sleep(0.5)
-            
-            # Remove duplicates
-            unique_jobs = []
-            seen_jobs = set()
-            for job in all_jobs:
-                job_key = f"{job['title']}_{job['company']}"
-                if job_key not in seen_jobs:
-                    seen_jobs.add(job_key)
-                    unique_jobs.append(job)
-            
-            print(f"📊 Adzuna: {len(unique_jobs)} unique jobs")
-            return unique_jobs
-            
-        except Exception as e:
-            print(f"❌ Adzuna API error: {e}")
-            return []
+    def estimate_salary(self, skill):
+        """Estimate salary based on technology"""
+        from salary_reference import get_salary_reference
+        return get_salary_reference().estimate(skill)
 
-    def fetch_reed_data(self):
-        """Fetch job data from Reed.co.uk using their API"""
-        try:
-            # Reed API requires authentication, but we can use their public data
-            # This is a simulated version - you'd need Reed API credentials
-            print("🔍 Reed: Simulating API call (requires credentials)")
-            return []
-            
-        except Exception as e:
-            print(f"❌ Reed API error: {e}")
-            return []
+    def get_fallback_itjobs_data(self):
+        """Fallback IT Jobs data"""
+        return [dict(row) for row in FALLBACK_ITJOBS_DATA]
 
-    def fetch_github_jobs_data(self):
-        """Fetch from GitHub Jobs archive (historical data)"""
-        try:
-            # GitHub Jobs was deprecated but archive data is available
-            print("🔍 GitHub Jobs: Fetching historical data...")
-            
-            # Simulated historical data based on past trends
-            github_jobs = [
-                {
-                    'title': 'Senior Software Engineer',
-                    'company': 'Tech Startup',
-                    'location': 'London',
-                    'salary_avg': 75000,
-                    'source': 'GitHub Jobs Archive'
-                },
-                {
-                    'title': 'Frontend Developer',
-                    'company': 'Digital Agency',
-                    'location': 'Manchester',
-                    'salary_avg': 52000,
-                    'source': 'GitHub Jobs Archive'
-                }
-            ]
-            
-            return github_jobs
-            
-        except Exception as e:
-            print(f"❌ GitHub Jobs error: {e}")
+    def run_sources(self, sources):
+        """Run (name, function) pairs and return (name, ok, result_or_error) in input order"""
+        if not sources:
             return []
+        outcomes = {}
+        sources = [(name, RUN_PROFILER.timed_source(name, fetch_function)) for name, fetch_function in sources]
 
-    def fetch_uk_gov_data(self):
-        """Fetch official UK government employment data"""
-        try:
-            # ONS (Office for National Statistics) API
-            print("🔍 UK Government: Fetching ONS data...")
-            
-            # Employment data
-            employment_url = "https://api.ons.gov.uk/employmentandlabourmarket/peopleinwork/earningsandworkinghours"
-            
-            response = self.session.get(employment_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'source': 'ONS',
-                    'average_weekly_pay': 650,
-                    'employment_rate': 75.8,
-                    'data_available': True
-                }
-            else:
-                return self.get_fallback_gov_data()
-                
-        except Exception as e:
-            print(f"⚠️ UK Gov data error: {e}")
-            return self.get_fallback_gov_data()
-
-    def get_fallback_gov_data(self):
-        """Fallback government data"""
-        return {
-            'source': 'ONS',
-            'average_weekly_pay': 650,
-            'employment_rate': 75.8,
-            'data_available': False,
-            'fallback_reason': 'API unavailable'
+        if not self.concurrent:
+            for name, fetch_function in sources:
+                self.sources_started = time.monotonic()
+                try:
+                    outcomes[name] = (True, fetch_function())
+                except Exception as e:
+                    outcomes[name] = (False, e)
+            return [(name, *outcomes[name]) for name, _ in sources]
+
+        start = self.sources_started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='source')
+        futures = {executor.submit(fetch_function): name for name, fetch_function in sources}
+        deadlines = {
+            future: start + min(self.source_timeouts.get(name, self.source_timeout), self.total_timeout)
+            for future, name in futures.items()
         }
+        pending = set(futures)
 
-    def fetch_tech_nation_data(self):
-        """Fetch UK tech sector data from Tech Nation reports"""
         try:
-            # Tech Nation provides excellent UK tech sector reports
-            print("🔍 Tech Nation: Fetching sector insights...")
-            
-            # Simulated data based on Tech Nation 2024 report
-            tech_nation_data = {
-                'source': 'Tech Nation',
-                'uk_tech_sector_growth': 8.7,
-                'tech_investment_2024': '£15.2bn',
-                'tech_jobs_growth': 5.2,
-                'top_tech_hubs': ['London', 'Manchester', 'Bristol', 'Cambridge', 'Edinburgh'],
-                'fastest_growing_skills': ['AI/ML', 'Cybersecurity', 'Cloud Computing', 'Data Science']
-            }
-            
-            return tech_nation_data
-            
-        except Exception as e:
-            print(f"⚠️ Tech Nation data error: {e}")
-            return {}
+            while pending:
+                now = time.monotonic()
+                expired = {future for future in pending if deadlines[future] <= now}
+                for future in expired:
+                    future.cancel()
+                    outcomes[futures[future]] = (False, TimeoutError(f"no result within {deadlines[future] - start:.0f}s"))
+                pending -= expired
+                if not pending:
+                    break
 
-    def fetch_linkedin_insights(self):
-        """Fetch tech hiring trends from LinkedIn insights"""
-        try:
-            # LinkedIn provides workforce reports (public data)
-            print("🔍 LinkedIn: Fetching hiring trends...")
-            
-            # Simulated LinkedIn Workforce Report data
-            linkedin_data = {
-                'source': 'LinkedIn Workforce Report',
-                'tech_hiring_growth': 12.4,
-                'most_in_demand_roles': [
-                    'Software Engineer',
-                    'Data Scientist', 
-                    'DevOps Engineer',
-                    'Product Manager',
-                    'UX Designer'
-                ],
-                'remote_work_adoption': 68,
-                'skills_gap_analysis': {
-                    'most_scarce_skills': ['AI Engineering', 'Cybersecurity', 'Cloud Architecture'],
-                    'growing_skills': ['Python', 'TypeScript', 'Kubernetes']
-                }
-            }
-            
-            return linkedin_data
-            
-        except Exception as e:
-            print(f"⚠️ LinkedIn insights error: {e}")
-            return {}
+                next_deadline = min(deadlines[future] for future in pending)
+                done, pending = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        outcomes[futures[future]] = (True, future.result())
+                    except Exception as e:
+                        outcomes[futures[future]] = (False, e)
+        finally:
+            # Stragglers keep running in the background but no longer block the run; the
+            # interpreter still joins them at exit, which their deadline-bound HTTP timeouts keep short
+            executor.shutdown(wait=False, cancel_futures=True)
 
-    def fetch_glassdoor_insights(self):
-        """Fetch salary insights from Glassdoor reports"""
-        try:
-            # Glassdoor provides salary reports and company insights
-            print("🔍 Glassdoor: Fetching salary insights...")
-            
-            # Simulated Glassdoor data
-            glassdoor_data = {
-                'source': 'Glassdoor Economic Research',
-                'average_tech_salary_uk': 62000,
-                'salary_satisfaction': 72,
-                'top_paying_companies': [
-                    {'company': 'Google', 'average_salary': 95000},
-                    {'company': 'Microsoft', 'average_salary': 88000},
-                    {'company': 'Amazon', 'average_salary': 85000},
-                    {'company': 'Meta', 'average_salary': 92000},
-                    {'company': 'Apple', 'average_salary': 87000}
-                ],
-                'salary_trends': {
-                    'year_over_year_growth': 5.2,
-                    'remote_premium': 8.7
-                }
-            }
-            
-            return glassdoor_data
-            
-        except Exception as e:
-            print(f"⚠️ Glassdoor insights error: {e}")
-            return {}
+        print(f"⏱️ Fetched {len(sources)} sources concurrently in {time.monotonic() - start:.1f}s")
+        return [(name, *outcomes[name]) for name, _ in sources]
 
-    def fetch_cwjobs_data(self):
-        """Fetch data from CWJobs (UK tech job board)"""
-        try:
-            # CWJobs is a major UK tech job board
-            print("🔍 CWJobs: Simulating data fetch...")
-            
-            # In a real implementation, you'd use their API or web scraping
-            cwjobs_data = [
-                {
-                    'title': '.NET Developer',
-                    'company': 'Financial Services',
-                    'location': 'Leeds',
-                    'salary_avg': 55000,
-                    'source': 'CWJobs Market Data'
-                },
-                {
-                    'title': 'Cloud Architect',
-                    'company': 'Consulting Firm',
-                    'location': 'Bristol',
-                    'salary_avg': 78000,
-                    'source': 'CWJobs Market Data'
-                }
-            ]
-            
-            return cwjobs_data
-            
-        except Exception as e:
-            print(f"⚠️ CWJobs data error: {e}")
-            return []
+    def sources_of_kind(self, kind):
+        """(name, fetch) pairs of the selected sources of one kind"""
+        return [(source.name, source.fetch) for source in self.sources if source.kind == kind]
 
-    def fetch_totaljobs_data(self):
-        """Fetch data from Totaljobs (UK job board)"""
-        try:
-            print("🔍 Totaljobs: Simulating data fetch...")
-            
-            totaljobs_data = [
-                {
-                    'title': 'IT Support Engineer',
-                    'company': 'Managed Services',
-                    'location': 'Birmingham',
-                    'salary_avg': 35000,
-                    'source': 'Totaljobs Market Data'
-                },
-                {
-                    'title': 'Senior DevOps Engineer',
-                    'company': 'E-commerce',
-                    'location': 'London',
-                    'salary_avg': 82000,
-                    'source': 'Totaljobs Market Data'
-                }
-            ]
-            
-            return totaljobs_data
-            
-        except Exception as e:
-            print(f"⚠️ Totaljobs data error: {e}")
-            return []
+    def job_sources(self):
+        """Job listing sources"""
+        return self.sources_of_kind('jobs')
 
-    def scrape_itjobswatch(self):
-        """Scrape IT Jobs Watch for UK tech salary data"""
-        try:
-            print("🔍 IT Jobs Watch: Scraping salary data...")
-            
-            url = "https://www.itjobswatch.co.uk/"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            skills_data = []
-            tech_elements = soup.find_all('a', href=re.compile(r'/jobs/uk/'))
-            
-            for element in tech_elements[:15]:
-                skill_name = element.text.strip()
-                if skill_name and len(skill_name) > 2:
-                    skills_data.append({
-                        'skill': skill_name,
-                        'median_salary': self.estimate_salary(skill_name),
-                        'demand': 'High' if len(skill_name) % 3 == 0 else 'Medium',
-                        'source': 'IT Jobs Watch'
-                    })
-            
-            return skills_data[:10]
-            
-        except Exception as e:
-            print(f"⚠️ IT Jobs Watch scraping error: {e}")
-            return self.get_fallback_itjobs_data()
-
-    def calculate_salary(self, min_sal, max_sal):
-        """Calculate average salary from min/max"""
-        if min_sal and max_sal:
-            return (min_sal + max_sal) / 2
-        elif min_sal:
-            return min_sal
-        elif max_sal:
-            return max_sal
-        else:
-            return None
+    def insight_sources(self):
+        """Additional insights sources"""
+        return self.sources_of_kind('insights')
 
-    def estimate_salary(self, skill):
-        """Estimate salary based on technology"""
-        salary_ranges = {
-            'python': (45000, 85000),
-            'java': (40000, 80000),
-            'javascript': (35000, 75000),
-            'typescript': (40000, 80000),
-            'aws': (50000, 90000),
-            'azure': (45000, 85000),
-            'react': (35000, 70000),
-            'node': (40000, 80000),
-            'docker': (45000, 85000),
-            'kubernetes': (50000, 95000),
-            'machine learning': (55000, 100000),
-            'data science': (45000, 90000)
-        }
+    def trend_sources(self):
+        """Technology trend sources"""
+        return self.sources_of_kind('trends')
+
+    def collect_insights(self, outcomes):
+        """Report insight and trend outcomes; returns the insights and sets itjobs_data"""
+        additional_insights = {}
+        insight_names = {name for name, _ in self.insight_sources()}
         
-        skill_lower = skill.lower()
-        for tech, (min_sal, max_sal) in salary_ranges.items():
-            if tech in skill_lower:
-                return (min_sal + max_sal) // 2
+        for source_name, ok, result in outcomes:
+            if source_name in insight_names:
+                if not ok:
+                    print(f"⚠️ {source_name} insights failed: {result}")
+                elif result:
+                    additional_insights[source_name.lower().replace(' ', '_')] = result
+                    print(f"✅ {source_name}: Insights added")
+            else:
+                if not ok:
+                    print(f"⚠️ {source_name} failed: {result}")
+                    result = self.get_fallback_itjobs_data()
+                self.itjobs_data = result
         
-        return 50000
-
-    def get_fallback_itjobs_data(self):
-        """Fallback IT Jobs data"""
-        return [
-            {'skill': 'Python', 'median_salary': 65000, 'demand': 'High', 'source': 'Fallback'},
-            {'skill': 'Java', 'median_salary': 60000, 'demand': 'High', 'source': 'Fallback'},
-            {'skill': 'JavaScript', 'median_salary': 55000, 'demand': 'High', 'source': 'Fallback'}
-        ]
+        return additional_insights
 
     def fetch_all_sources(self):
         """Fetch data from all available sources"""
+        from dedup import deduplicate_jobs
+        
         print("🔄 Fetching data from multiple sources...")
         
         all_jobs = []
-        additional_insights = {}
+        sources = self.job_sources()
+        with RUN_PROFILER.stage('fetch_sources'):
+            outcomes = self.run_sources(sources + self.insight_sources() + self.trend_sources())
+        job_names = {name for name, _ in sources}
         
-        # Job listing sources
-        sources = [
-            ('Adzuna', self.fetch_adzuna_data),
-            ('Reed', self.fetch_reed_data),
-            ('GitHub Jobs', self.fetch_github_jobs_data),
-            ('CWJobs', self.fetch_cwjobs_data),
-            ('Totaljobs', self.fetch_totaljobs_data)
-        ]
+        fetched_at = datetime.now().isoformat(timespec='seconds')
+        for source_name, ok, result in outcomes:
+            if source_name not in job_names:
+                continue
+            if not ok:
+                print(f"⚠️ {source_name} failed: {result}")
+            elif result:
+                for job in result:
+                    job.setdefault('fetched_at', fetched_at)
+                all_jobs.extend(result)
+                print(f"✅ {source_name}: Added {len(result)} jobs")
         
-        for source_name, fetch_function in sources:
-            try:
-                jobs = fetch_function()
-                if jobs:
-                    all_jobs.extend(jobs)
-                    print(f"✅ {source_name}: Added {len(jobs)} jobs")
-            except Exception as e:
-                print(f"⚠️ {source_name} failed: {e}")
+        additional_insights = self.collect_insights([outcome for outcome in outcomes if outcome[0] not in job_names])
         
-        # Additional insights sources
-        insight_sources = [
-            ('UK Government', self.fetch_uk_gov_data),
-            ('Tech Nation', self.fetch_tech_nation_data),
-            ('LinkedIn', self.fetch_linkedin_insights),
-            ('Glassdoor', self.fetch_glassdoor_insights)
-        ]
-        
-        for insight_name, fetch_function in insight_sources:
-            try:
-                insights = fetch_function()
-                if insights:
-                    additional_insights[insight_name.lower().replace(' ', '_')] = insights
-                    print(f"✅ {insight_name}: Insights added")
-            except Exception as e:
-                print(f"⚠️ {insight_name} insights failed: {e}")
-        
-        # Remove duplicates
-        unique_jobs = []
-        seen_jobs = set()
-        for job in all_jobs:
-            job_key = f"{job['title']}_{job['company']}_{job['location']}"
-            if job_key not in seen_jobs:
-                seen_jobs.add(job_key)
-                unique_jobs.append(job)
+        # Remove near-duplicates syndicated across boards
+        with RUN_PROFILER.stage('dedup') as stage:
+            unique_jobs, duplicates = deduplicate_jobs(all_jobs)
+            stage['records'] = len(all_jobs)
+        if duplicates:
+            breakdown = ', '.join(f"{source}: {count}" for source, count in sorted(duplicates.items()))
+            print(f"🧹 Removed {sum(duplicates.values())} near-duplicate jobs ({breakdown})")
         
         print(f"📊 Total unique jobs from all sources: {len(unique_jobs)}")
+        if self.http_cache:
+            print(f"💾 HTTP cache: {self.http_cache.summary()}")
         return unique_jobs, additional_insights
 
-def process_enhanced_data(fetcher):
-    """Process data from all enhanced sources"""
+    def stream_job_chunks(self, name, stream_function):
+        """Lists of postings from one source: Adzuna page by page, the others all at once"""
+        start = time.perf_counter()
+        outcome = {'name': name, 'ok': False, 'records': 0}
+        try:
+            for jobs in stream_function():
+                outcome['records'] += len(jobs or [])
+                yield jobs
+            outcome['ok'] = True
+        finally:
+            outcome['seconds'] = round(time.perf_counter() - start, 4)
+            RUN_PROFILER.add_source(outcome)
+
+    def stream_all_sources(self, queue_size=None):
+        """Yield job postings as the sources deliver them
+
+        Each job source runs in its own thread and hands over chunks through a bounded
+        queue, so a slow consumer holds back the harvest instead of buffering it. Insight
+        and trend sources run alongside; their results are in self.additional_insights
+        once the stream is exhausted.
+        """
+        print("🔄 Streaming data from multiple sources...")
+        queue_size = queue_size or int(os.environ.get('STREAM_QUEUE_SIZE', 16))
+        sources = [(source.name, source.stream) for source in self.sources if source.kind == 'jobs']
+        
+        background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='insights')
+        insights_future = background.submit(self.run_sources, self.insight_sources() + self.trend_sources())
+        
+        try:
+            if self.concurrent:
+                chunks = self._stream_concurrently(sources, queue.Queue(maxsize=queue_size))
+            else:
+                chunks = self._stream_sequentially(sources)
+            for source_name, jobs in chunks:
+                fetched_at = datetime.now().isoformat(timespec='seconds')
+                for job in jobs:
+                    job.setdefault('fetched_at', fetched_at)
+                    yield job
+        finally:
+            try:
+                outcomes = insights_future.result()
+            except Exception as e:
+                outcomes = [(name, False, e) for name, _ in self.insight_sources() + self.trend_sources()]
+            self.additional_insights = self.collect_insights(outcomes)
+            background.shutdown(wait=False)
+
+    def _stream_sequentially(self, sources):
+        for name, stream_function in sources:
+            added = 0
+            try:
+                for jobs in self.stream_job_chunks(name, stream_function):
+                    added += len(jobs or [])
+                    yield name, jobs or []
+            except Exception as e:
+                print(f"⚠️ {name} failed: {e}")
+                continue
+            if added:
+                print(f"✅ {name}: Added {added} jobs")
+
+    def _stream_concurrently(self, sources, chunks):
+        start = time.monotonic()
+        stop = threading.Event()
+        deadlines = {
+            name: start + min(self.source_timeouts.get(name, self.source_timeout), self.total_timeout)
+            for name, _ in sources
+        }
+
+        def hand_over(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(name, stream_function):
+            try:
+                for jobs in self.stream_job_chunks(name, stream_function):
+                    if jobs and not hand_over((name, 'jobs', jobs)):
+                        return
+                hand_over((name, 'done', None))
+            except Exception as e:
+                hand_over((name, 'error', e))
+
+        for name, stream_function in sources:
+            threading.Thread(target=produce, args=(name, stream_function), name=f'source-{name}', daemon=True).start()
+
+        pending = set(deadlines)
+        added = dict.fromkeys(deadlines, 0)
+        try:
+            while pending:
+                now = time.monotonic()
+                for name in [name for name in pending if deadlines[name] <= now]:
+                    print(f"⚠️ {name} failed: no result within {deadlines[name] - start:.0f}s")
+                    pending.discard(name)
+                if not pending:
+                    break
+
+                try:
+                    name, kind, payload = chunks.get(timeout=max(0, min(deadlines[name] for name in pending) - now))
+                except queue.Empty:
+                    continue
+                if name not in pending:
+                    continue
+                if kind == 'jobs':
+                    added[name] += len(payload)
+                    yield name, payload
+                    continue
+
+                pending.discard(name)
+                if kind == 'error':
+                    print(f"⚠️ {name} failed: {payload}")
+                elif added[name]:
+                    print(f"✅ {name}: Added {added[name]} jobs")
+        finally:
+            # Producers still running stop at their next hand-over
+            stop.set()
+
+        print(f"⏱️ Streamed {len(sources)} sources concurrently in {time.monotonic() - start:.1f}s")
+
+def fetch_enhanced_data(fetcher):
+    """Fetch every selected source; returns (postings, additional insights, technology trends)"""
     print("📡 Fetching enhanced UK job market data...")
     
     # Fetch from all sources
-    all_jobs, additional_insights = fetcher.fetch_all_sources()
+    with RUN_PROFILER.stage('fetch_all_sources') as stage:
+        all_jobs, additional_insights = fetcher.fetch_all_sources()
+        stage['records'] = len(all_jobs)
     
-    # Get IT Jobs Watch data
-    itjobs_data = fetcher.scrape_itjobswatch()
+    # IT Jobs Watch is scraped alongside the other sources (unless it was left out)
+    itjobs_data = fetcher.itjobs_data or []
     
     print(f"✅ Fetched {len(all_jobs)} total job listings")
+    
+    # Remember every posting across runs; replayed runs leave the history untouched
+    if fetcher.fetch_mode != 'replay' and os.environ.get('JOB_STORE', '1') != '0':
+        from job_store import JobStore
+        from salary_normalization import salary_stage
+        with RUN_PROFILER.stage('job_store') as stage:
+            store = JobStore()
+            # The store records annualized, bounded salaries, as streaming mode's batches do;
+            # copies keep the raw figures for the analysis, which normalizes whole columns
+            changes = store.upsert(salary_stage(JobPosting.from_dict(job.to_dict()) for job in all_jobs))
+            stage['records'] = len(all_jobs)
+        print(f"🗄️ Job store: {changes['new']} new, {changes['changed']} changed, "
+              f"{changes['unchanged']} unchanged ({store.count()} stored)")
+        store.close()
+    return all_jobs, additional_insights, itjobs_data
+
+def process_enhanced_data(fetcher):
+    """Process data from all enhanced sources"""
+    return analyze_jobs(*fetch_enhanced_data(fetcher))
+
+def analyze_jobs(all_jobs, additional_insights, itjobs_data):
+    """Dashboard aggregates, experience salaries and the salary model for fetched postings"""
+    from analysis_engine import build_jobs_frame, tag_skills, impute_salaries, remote_arrangements
+    from aggregate_cube import AggregateCube
+    from salary_reference import get_salary_reference
+    from salary_normalization import normalize_salaries
+    from parallel_analysis import ParallelAnalyzer
+    from salary_model import train_salary_model
+    from seniority import SENIORITY_CLASSIFIER
+    from parquet_export import export_jobs_parquet
+    
     print(f"✅ Processed {len(itjobs_data)} technology trends")
     print(f"✅ Additional insights from {len(additional_insights)} sources")
     
     # Determine data sources used
-    data_sources = ['IT Jobs Watch']
+    data_sources = ['IT Jobs Watch'] if itjobs_data else []
     job_sources = set(job.get('source', 'Unknown') for job in all_jobs)
-    data_sources.extend([source for source in job_sources if source != 'Unknown'])
+    # Sorted, since set order varies between runs and would change the metadata panel
+    data_sources.extend(sorted(source for source in job_sources if source != 'Unknown'))
     data_sources.extend(additional_insights.keys())
     
-    # Calculate overall metrics
-    salaries = [job['salary_avg'] for job in all_jobs if job.get('salary_avg')]
-    average_salary_uk = np.median(salaries) if salaries else 62000
+    # Load every posting into one DataFrame (and one skill matrix) that all the analyses share
+    with RUN_PROFILER.stage('build_frame') as stage:
+        jobs_df = build_jobs_frame(all_jobs)
+        stage['records'] = len(jobs_df)
+    
+    # ANALYSIS_MODE=parallel tags and aggregates shards of the frame on a process pool
+    parallel = os.environ.get('ANALYSIS_MODE', 'single') == 'parallel'
+    with (ParallelAnalyzer() if parallel else nullcontext()) as analyzer:
+        with RUN_PROFILER.stage('tag_skills') as stage:
+            skill_hits = analyzer.tag_skills(jobs_df) if analyzer else tag_skills(jobs_df)
+            stage['records'] = int(skill_hits.nnz)
+        with RUN_PROFILER.stage('classify_seniority') as stage:
+            seniority = SENIORITY_CLASSIFIER.levels(jobs_df)
+            stage['records'] = len(jobs_df)
+        with RUN_PROFILER.stage('classify_remote') as stage:
+            jobs_df['remote'] = analyzer.remote_arrangements(jobs_df) if analyzer else remote_arrangements(jobs_df['text'])
+            stage['records'] = len(jobs_df)
+        with RUN_PROFILER.stage('normalize_salaries') as stage:
+            stage['rules'] = normalize_salaries(jobs_df, skill_hits)
+            stage['records'] = len(jobs_df)
+        print(f"💷 Salary normalization: {', '.join(f'{rule} {count}' for rule, count in stage['rules'].items())}")
+        if os.environ.get('SALARY_IMPUTE', '0') != '0':
+            with RUN_PROFILER.stage('impute_salaries') as stage:
+                stage['records'] = impute_salaries(jobs_df, skill_hits, get_salary_reference())
+            print(f"🧮 Imputed {stage['records']} salaries from the {get_salary_reference().origin} salary reference")
+        if os.environ.get('JOBS_EXPORT', '1') != '0':
+            with RUN_PROFILER.stage('parquet_export') as stage:
+                export_jobs_parquet(jobs_df, skill_hits)
+                stage['records'] = len(jobs_df)
+        
+        # Every dashboard aggregate is a projection of one skill x location x seniority x remote cube
+        with RUN_PROFILER.stage('aggregate_cube') as stage:
+            if analyzer:
+                cube = analyzer.aggregate(jobs_df, skill_hits, seniority)
+            else:
+                cube = AggregateCube.from_frame(jobs_df, skill_hits, seniority)
+            stage['records'] = cube.total
+            stage['cells'] = len(cube)
+        if analyzer:
+            print(f"🧵 Aggregated {cube.total} jobs in {analyzer.workers} worker processes")
+    print(f"🧊 Aggregate cube of {len(cube)} cells")
+    if os.environ.get('CUBE_EXPORT', '1') != '0':
+        with RUN_PROFILER.stage('cube_export') as stage:
+            cube_path = cube.save()
+            stage['records'] = len(cube)
+        print(f"💾 Aggregate cube saved to {cube_path}")
+    
+    median = cube.median_salary()
+    average_salary_uk = int(median) if median is not None else 62000
+    language_salaries = cube.language_salaries(itjobs_data)
+    location_data = cube.location_data()
+    remote_trends = cube.remote_trends()
+    experience_salaries = cube.experience_salaries()
     
-    # Analyze data
-    language_salaries = analyze_language_salaries(all_jobs, itjobs_data)
-    location_data = analyze_location_data(all_jobs)
-    remote_trends = analyze_remote_trends(all_jobs)
+    # Coefficient table the dashboard's salary predictor scores client-side
+    with RUN_PROFILER.stage('salary_model') as stage:
+        salary_model = train_salary_model(jobs_df, skill_hits, seniority)
+        stage['records'] = salary_model.training_rows if salary_model else 0
+    if salary_model:
+        print(f"🤖 Salary model trained on {salary_model.training_rows} postings (R² {salary_model.r2:.2f})")
     
     return {
         'language_salaries': language_salaries,
         'location_data': location_data,
         'remote_trends': remote_trends,
+        'experience_salaries': experience_salaries,
         'market_overview': {
             'total_jobs_analyzed': len(all_jobs),
             'average_salary_uk': average_salary_uk,
@@ -512,14 +486,12 @@ def process_enhanced_data(fetcher):
             'additional_insights': additional_insights
         },
         'raw_data': {
-            'sample_jobs': all_jobs[:10],  # Sample for debugging
+            'sample_jobs': [job.to_dict() for job in all_jobs[:10]],  # Sample for debugging
             'technology_trends': itjobs_data
-        }
+        },
+        'salary_model': salary_model.to_dict() if salary_model else None
     }
 
-# [Keep all your existing analysis functions: analyze_language_salaries, analyze_location_data, etc.]
-# [They remain the same as in your previous version]
-
 def generate_enhanced_insights(processed_data):
     """Generate enhanced insights with multiple data sources"""
     market_data = processed_data['market_overview']
@@ -553,25 +525,40 @@ def generate_enhanced_insights(processed_data):
     # Enhanced predictions with multiple data sources
     current_year = datetime.now().year
     salary_trends = []
+    forecasts = processed_data.get('forecasts')
     
-    for year in range(2020, current_year + 2):
-        if year <= current_year:
-            # Historical data with adjustments
-            base_growth = 1.05  # 5% average growth
-            if 'tech_nation' in additional_insights:
-                tech_growth = additional_insights['tech_nation'].get('uk_tech_sector_growth', 8.7)
-                base_growth = 1 + (tech_growth / 100)  # Convert percentage to multiplier
-            
-            base = 48000 * (base_growth ** (year - 2020))
-        else:
-            # Future prediction with enhanced factors
-            base = market_data['average_salary_uk'] * 1.06  # 6% growth for enhanced data
-        
+    if forecasts and forecasts['overall']:
+        # Years observed in the job store, then the fitted trend with its 95% interval
+        salary_trends = [dict(record) for record in forecasts['history']]
+        overall = forecasts['overall']
+        remote = forecasts['remote_percentage']
         salary_trends.append({
-            'year': year,
-            'average_salary': int(base),
-            'remote_percentage': min(85, 20 + (year - 2020) * 16)  # Slightly faster remote adoption
+            'year': forecasts['target_year'],
+            'average_salary': overall['value'],
+            'salary_lower': overall['lower'],
+            'salary_upper': overall['upper'],
+            'remote_percentage': min(100, max(0, remote['value'])) if remote else salary_trends[-1]['remote_percentage'],
+            'forecast': True
         })
+    else:
+        for year in range(2020, current_year + 2):
+            if year <= current_year:
+                # Historical data with adjustments
+                base_growth = 1.05  # 5% average growth
+                if 'tech_nation' in additional_insights:
+                    tech_growth = additional_insights['tech_nation'].get('uk_tech_sector_growth', 8.7)
+                    base_growth = 1 + (tech_growth / 100)  # Convert percentage to multiplier
+                
+                base = 48000 * (base_growth ** (year - 2020))
+            else:
+                # Future prediction with enhanced factors
+                base = market_data['average_salary_uk'] * 1.06  # 6% growth for enhanced data
+            
+            salary_trends.append({
+                'year': year,
+                'average_salary': int(base),
+                'remote_percentage': min(85, 20 + (year - 2020) * 16)  # Slightly faster remote adoption
+            })
     
     # Enhanced market predictions
     market_predictions = {
@@ -588,6 +575,16 @@ def generate_enhanced_insights(processed_data):
     if 'linkedin' in additional_insights:
         market_predictions['hiring_growth'] = additional_insights['linkedin'].get('tech_hiring_growth', 12.4)
     
+    if forecasts:
+        # Only the technologies and locations shown on the dashboard
+        skills = {record['LanguageWorkedWith'] for record in processed_data['language_salaries']}
+        locations = {record['Country'] for record in processed_data['location_data']}
+        market_predictions['salary_forecasts'] = {
+            'year': forecasts['target_year'],
+            'skills': {skill: record for skill, record in forecasts['skills'].items() if skill in skills},
+            'locations': {location: record for location, record in forecasts['locations'].items() if location in locations}
+        }
+    
     return {
         'summary': {
             'total_respondents': market_data['total_jobs_analyzed'] * 15,  # Higher multiplier for enhanced data
@@ -610,13 +607,7 @@ def generate_enhanced_insights(processed_data):
             'language_salary': processed_data['language_salaries'],
             'location_salary': processed_data['location_data'],
             'remote_work_stats': processed_data['remote_trends'],
-            'experience_salary': [
-                {'level': 'Graduate (0-1 yrs)', 'salary': 30000},
-                {'level': 'Junior (1-3 yrs)', 'salary': 42000},
-                {'level': 'Mid-level (3-5 yrs)', 'salary': 58000},
-                {'level': 'Senior (5-8 yrs)', 'salary': 75000},
-                {'level': 'Lead (8+ yrs)', 'salary': 92000}
-            ]
+            'experience_salary': processed_data.get('experience_salaries') or DEFAULT_EXPERIENCE_SALARIES
         },
         'recommendations': {
             'top_roi_skills': top_roi_skills[:8],
@@ -632,54 +623,197 @@ def generate_enhanced_insights(processed_data):
         'predictions': {
             'salary_trends': salary_trends,
             'market_predictions': market_predictions
-        }
+        },
+        'salary_model': processed_data.get('salary_model') or {}
     }
 
 def save_enhanced_data(data):
-    """Save enhanced data as JSON files"""
+    """Save enhanced data as compact per-panel JSON files plus the combined file"""
+    from dashboard_payloads import write_panels, write_if_changed, compact_json
+    
     output_dir = '../react-dashboard/src/data'
     os.makedirs(output_dir, exist_ok=True)
     
-    with open(f'{output_dir}/ukFallbackData.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with RUN_PROFILER.stage('write_panels') as stage:
+        written = write_panels(data, output_dir)
+        stage['records'] = len(written)
     
-    print(f"✅ Enhanced UK data saved to {output_dir}")
+    # Dashboard.jsx still imports the combined file at bundle time
+    with RUN_PROFILER.stage('write_combined'):
+        if write_if_changed(f'{output_dir}/ukFallbackData.json', compact_json(data)):
+            written.append('ukFallbackData.json')
+    
+    print(f"✅ Enhanced UK data saved to {output_dir} ({len(written)} files changed)")
     print(f"📊 Processed {data['metadata']['total_data_points']} job listings")
     print(f"💰 Average UK salary: £{data['summary']['average_salary']:,}")
     print(f"🔍 Integrated {data['metadata']['sources_integrated']} data sources")
     print(f"🎯 Data quality: {data['metadata']['data_quality']}")
 
-def main():
+def add_forecasts(processed_data):
+    """Attach salary trend forecasts fitted on the job store's weekly history"""
+    from salary_forecast import forecast_from_store
+    
+    with RUN_PROFILER.stage('forecast') as stage:
+        forecasts = processed_data['forecasts'] = forecast_from_store()
+        stage['records'] = forecasts['series_fitted'] if forecasts else 0
+    if forecasts:
+        print(f"🔮 Forecast {forecasts['series_fitted']} salary series from {forecasts['weeks_observed']} weeks of history")
+    else:
+        print("🔮 Not enough job store history to forecast yet, using the default salary curve")
+
+def dashboard_data(processed_data):
+    """Dashboard payload for processed data, or the fallback data when no skill had a salary"""
+    from fallback_processor import create_fallback_data, save_experience_salaries
+
+    add_forecasts(processed_data)
+    # Saved so the fallback data can show real seniority medians without opening the job store
+    if processed_data.get('experience_salaries'):
+        try:
+            save_experience_salaries(processed_data['experience_salaries'])
+        except OSError as e:
+            print(f"⚠️ Could not save experience salaries: {e}")
+    if not processed_data['language_salaries']:
+        print("⚠️ No language salary data found, using fallback...")
+        return create_fallback_data()
+    with RUN_PROFILER.stage('generate_enhanced_insights'):
+        return generate_enhanced_insights(processed_data)
+
+def report_published(uk_data):
+    print("=" * 60)
+    print("🎉 Enhanced data processing complete!")
+    print(f"📍 Data sources: {', '.join(uk_data['metadata']['data_sources'])}")
+    print(f"🏆 Top technology: {uk_data['summary']['top_technology']}")
+    print(f"📈 Data quality: {uk_data['metadata']['data_quality']}")
+    print(f"🔗 Sources integrated: {uk_data['metadata']['sources_integrated']}")
+
+def publish_fallback():
+    print("🔄 Falling back to standard data...")
+    from fallback_processor import create_fallback_data
+    save_enhanced_data(create_fallback_data())
+
+def run_pipeline(sources=None):
     """Main enhanced data processing pipeline"""
     print("🚀 Starting Enhanced UK Tech Job Market Analysis...")
     print("=" * 60)
     
     try:
-        fetcher = EnhancedUKJobDataFetcher()
-        processed_data = process_enhanced_data(fetcher)
-        
-        if not processed_data['language_salaries']:
-            print("⚠️ No language salary data found, using fallback...")
-            from fallback_processor import create_fallback_data
-            uk_data = create_fallback_data()
+        fetcher = EnhancedUKJobDataFetcher(sources=sources)
+        if os.environ.get('PIPELINE_MODE', 'batch') == 'stream':
+            from streaming_pipeline import process_streaming_data
+            with RUN_PROFILER.stage('process_streaming_data'):
+                processed_data = process_streaming_data(fetcher)
         else:
-            uk_data = generate_enhanced_insights(processed_data)
-        
-        save_enhanced_data(uk_data)
+            with RUN_PROFILER.stage('process_enhanced_data'):
+                processed_data = process_enhanced_data(fetcher)
         
-        print("=" * 60)
-        print("🎉 Enhanced data processing complete!")
-        print(f"📍 Data sources: {', '.join(uk_data['metadata']['data_sources'])}")
-        print(f"🏆 Top technology: {uk_data['summary']['top_technology']}")
-        print(f"📈 Data quality: {uk_data['metadata']['data_quality']}")
-        print(f"🔗 Sources integrated: {uk_data['metadata']['sources_integrated']}")
+        uk_data = dashboard_data(processed_data)
+        with RUN_PROFILER.stage('save_enhanced_data'):
+            save_enhanced_data(uk_data)
+        report_published(uk_data)
         
     except Exception as e:
         print(f"❌ Error in enhanced data processing: {e}")
-        print("🔄 Falling back to standard data...")
-        from fallback_processor import create_fallback_data
-        fallback_data = create_fallback_data()
-        save_enhanced_data(fallback_data)
+        publish_fallback()
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, default=str)
+    print(f"💾 Wrote {path}")
+
+def read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def fetch_command(args):
+    """Fetch the selected sources into a JSON file that analyze reads"""
+    fetcher = EnhancedUKJobDataFetcher(sources=args.sources)
+    all_jobs, additional_insights, itjobs_data = fetch_enhanced_data(fetcher)
+    write_json(args.output or DEFAULT_FETCHED_PATH, {
+        'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        'sources': [source.name for source in fetcher.sources],
+        'jobs': [job.to_dict() for job in all_jobs],
+        'additional_insights': additional_insights,
+        'technology_trends': itjobs_data
+    })
+
+def analyze_command(args):
+    """Analyse a fetched file into the dashboard payload that publish writes out"""
+    fetched = read_json(args.input or DEFAULT_FETCHED_PATH)
+    with RUN_PROFILER.stage('process_enhanced_data'):
+        all_jobs = [JobPosting.from_dict(job) for job in fetched['jobs']]
+        processed_data = analyze_jobs(all_jobs, fetched['additional_insights'], fetched['technology_trends'])
+    write_json(args.output or DEFAULT_DASHBOARD_PATH, dashboard_data(processed_data))
+
+def publish_command(args):
+    """Write the dashboard panels from an analysed payload, or the fallback data"""
+    if args.fallback:
+        publish_fallback()
+        return
+    uk_data = read_json(args.input or DEFAULT_DASHBOARD_PATH)
+    with RUN_PROFILER.stage('save_enhanced_data'):
+        save_enhanced_data(uk_data)
+    report_published(uk_data)
+
+def serve_command(args):
+    """Serve read-only queries over the latest cube and postings until interrupted"""
+    from query_service import serve
+    serve(args.host, args.port, args.cube, args.dataset)
+
+def sources_argument(value):
+    try:
+        return parse_sources(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def main(argv=None):
+    """Run the pipeline (or one stage of it) and write the run report"""
+    parser = argparse.ArgumentParser(description='Fetch, analyse and publish UK tech job market data')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help='also profile the whole run and write the profile to output/')
+    parser.add_argument('--report', help='run report path (default: RUN_REPORT_PATH or output/run_report.json)')
+    sources_help = f"comma-separated sources to fetch (default: FETCH_SOURCES or all of {','.join(SOURCES)})"
+    parser.add_argument('--sources', type=sources_argument, help=sources_help)
+    commands = parser.add_subparsers(dest='command')
+    
+    # Also accepted after the subcommand, without resetting a value given before it
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument('--sources', type=sources_argument, default=argparse.SUPPRESS, help=sources_help)
+    commands.add_parser('run', parents=[selection], help='fetch, analyse and publish in one go (the default)')
+    fetch = commands.add_parser('fetch', parents=[selection], help='fetch sources into a JSON file')
+    fetch.add_argument('--output', help=f'fetched data path (default: {DEFAULT_FETCHED_PATH})')
+    analyze = commands.add_parser('analyze', help='analyse fetched data into the dashboard payload')
+    analyze.add_argument('--input', help=f'fetched data path (default: {DEFAULT_FETCHED_PATH})')
+    analyze.add_argument('--output', help=f'dashboard payload path (default: {DEFAULT_DASHBOARD_PATH})')
+    publish = commands.add_parser('publish', help='write the dashboard panels')
+    publish.add_argument('--input', help=f'dashboard payload path (default: {DEFAULT_DASHBOARD_PATH})')
+    publish.add_argument('--fallback', action='store_true', help='publish the fallback data without fetching')
+    serve = commands.add_parser('serve', help='serve local read-only queries over the latest analysis')
+    serve.add_argument('--host', help='interface to listen on (default: QUERY_HOST or 127.0.0.1)')
+    serve.add_argument('--port', type=int, help='port to listen on (default: QUERY_PORT or 8765)')
+    serve.add_argument('--cube', help='aggregate cube path (default: AGGREGATE_CUBE_PATH or output/aggregate_cube.npz)')
+    serve.add_argument('--dataset', help='Parquet dataset directory (default: JOBS_DATASET_DIR or output/jobs)')
+    args = parser.parse_args(argv)
+    
+    # Environment variables from .env, read when the CLI runs rather than on import
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    # A long-running server has no run report
+    if args.command == 'serve':
+        serve_command(args)
+        return
+    
+    with code_profiler(args.profile):
+        if args.command == 'fetch':
+            fetch_command(args)
+        elif args.command == 'analyze':
+            analyze_command(args)
+        elif args.command == 'publish':
+            publish_command(args)
+        else:
+            run_pipeline(args.sources)
+    RUN_PROFILER.write(args.report)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,354 @@
+"""
+Local query service
+A read-only HTTP service over the latest aggregate cube and the latest normalized postings,
+both loaded once at startup. Each query is normalized (canonical skill, gazetteer location
+bucket, defaults filled in, parameters sorted) into a cache key, and the encoded response is
+kept in an in-memory LRU cache so a repeated question is a dict lookup; /stats reports
+latency percentiles for cached and uncached requests
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from aggregate_cube import DEFAULT_CUBE_PATH, DIMENSIONS, AggregateCube
+from analysis_engine import REMOTE_ORDER
+from gazetteer import GAZETTEER
+from parquet_export import DEFAULT_DATASET_DIR, load_jobs_dataset
+from seniority import SENIORITY_LEVELS
+from skill_tagger import SKILL_TAGGER
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 200
+# Requests per latency bucket the percentiles are taken over
+LATENCY_WINDOW = 10000
+
+POSTING_COLUMNS = ['source_id', 'title', 'company', 'location', 'salary_min', 'salary_max', 'salary_avg',
+                   'skills', 'remote', 'source', 'fetched_at']
+POSTING_FILTERS = ('skill', 'location', 'remote', 'source', 'min_salary', 'max_salary', 'page', 'per_page')
+AGGREGATE_FILTERS = DIMENSIONS + ('by',)
+
+
+class LRUCache:
+    """Thread-safe mapping of at most capacity entries, least recently used evicted first"""
+
+    def __init__(self, capacity=DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'entries': len(self.entries), 'capacity': self.capacity, 'hits': self.hits,
+                    'misses': self.misses, 'hit_rate': round(self.hits / lookups, 3) if lookups else None}
+
+
+class LatencyTracker:
+    """Recent request latencies per bucket (cached / uncached)"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = {'cached': deque(maxlen=window), 'uncached': deque(maxlen=window)}
+        self.lock = threading.Lock()
+
+    def record(self, bucket, seconds):
+        with self.lock:
+            self.samples[bucket].append(seconds)
+
+    def percentiles(self):
+        with self.lock:
+            samples = {bucket: np.array(values) for bucket, values in self.samples.items()}
+        report = {}
+        for bucket, values in samples.items():
+            report[bucket] = {'requests': len(values)}
+            if len(values):
+                for name, value in zip(('p50_ms', 'p95_ms', 'p99_ms'), np.percentile(values, [50, 95, 99])):
+                    report[bucket][name] = round(float(value) * 1000, 3)
+        return report
+
+
+class PostingIndex:
+    """Normalized postings with integer codes per filter column and a skill -> rows index"""
+
+    def __init__(self, frame):
+        self.frame = frame.reindex(columns=POSTING_COLUMNS).reset_index(drop=True)
+        self.salaries = pd.to_numeric(self.frame['salary_avg'], errors='coerce').to_numpy(dtype=float)
+        self.codes = {}
+        self.lookup = {}
+        for column in ('location', 'remote', 'source'):
+            codes, uniques = pd.factorize(self.frame[column].astype(object))
+            self.codes[column] = codes
+            self.lookup[column] = {value: code for code, value in enumerate(uniques)}
+        # Case-insensitive source names, resolved to the stored spelling
+        self.sources = {str(source).lower(): source for source in self.lookup['source']}
+
+        skills = self.frame['skills'].explode().dropna()
+        self.skill_rows = {skill: rows.to_numpy() for skill, rows in
+                           pd.Series(skills.index, index=skills.to_numpy()).groupby(level=0)}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def query(self, filters, page, per_page):
+        mask = np.ones(len(self.frame), dtype=bool)
+        for column in ('location', 'remote', 'source'):
+            if column in filters:
+                mask &= self.codes[column] == self.lookup[column].get(filters[column], -2)
+        if 'skill' in filters:
+            with_skill = np.zeros(len(self.frame), dtype=bool)
+            with_skill[self.skill_rows.get(filters['skill'], [])] = True
+            mask &= with_skill
+        if 'min_salary' in filters:
+            mask &= self.salaries >= filters['min_salary']
+        if 'max_salary' in filters:
+            mask &= self.salaries <= filters['max_salary']
+
+        rows = np.flatnonzero(mask)
+        selected = rows[(page - 1) * per_page:page * per_page]
+        return {
+            'total': len(rows),
+            'page': page,
+            'per_page': per_page,
+            'pages': (len(rows) + per_page - 1) // per_page,
+            'postings': [self.record(row) for row in selected]
+        }
+
+    def record(self, row):
+        record = {}
+        for column, value in self.frame.iloc[row].items():
+            if column == 'skills':
+                value = list(value) if value is not None and not isinstance(value, float) else []
+            elif isinstance(value, pd.Timestamp):
+                value = value.isoformat()
+            elif pd.isna(value):
+                value = None
+            elif isinstance(value, np.generic):
+                value = value.item()
+            record[column] = value
+        return record
+
+
+def load_latest_postings(base_dir=None):
+    """Postings of the most recent fetched_date partition of the Parquet dataset, or None"""
+    base_dir = base_dir or os.environ.get('JOBS_DATASET_DIR', DEFAULT_DATASET_DIR)
+    if not os.path.isdir(base_dir):
+        return None
+    dates = sorted(name for name in os.listdir(base_dir) if name.startswith('fetched_date='))
+    if not dates:
+        return None
+    try:
+        # Only the latest partition, so older files written without a column cannot drop it
+        # from the schema pyarrow infers
+        return load_jobs_dataset(os.path.join(base_dir, dates[-1]))
+    except ImportError:
+        print("⚠️ pyarrow not installed, posting queries are unavailable")
+        return None
+
+
+class QueryService:
+    """Answers normalized queries over one cube and one posting index, through the LRU cache"""
+
+    def __init__(self, cube=None, postings=None, cache_size=None):
+        self.cube = cube
+        self.postings = postings
+        self.cache = LRUCache(cache_size or int(os.environ.get('QUERY_CACHE_SIZE', DEFAULT_CACHE_SIZE)))
+        self.latency = LatencyTracker()
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+
+    @classmethod
+    def load(cls, cube_path=None, dataset_dir=None, cache_size=None):
+        cube_path = cube_path or os.environ.get('AGGREGATE_CUBE_PATH', DEFAULT_CUBE_PATH)
+        cube = AggregateCube.load(cube_path) if os.path.exists(cube_path) else None
+        frame = load_latest_postings(dataset_dir)
+        return cls(cube, PostingIndex(frame) if frame is not None else None, cache_size)
+
+    def normalize(self, path, params):
+        """Cache key (path, sorted (name, value) pairs) with canonical values and defaults;
+        raises ValueError for parameters the endpoint does not take or cannot parse"""
+        allowed = {'/postings': POSTING_FILTERS, '/aggregates': AGGREGATE_FILTERS}.get(path)
+        if allowed is None:
+            raise LookupError(f"unknown endpoint {path} (choose from /postings, /aggregates, /stats)")
+        unknown = set(params) - set(allowed)
+        if unknown:
+            raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))} (choose from {', '.join(allowed)})")
+
+        query = {}
+        for name, value in params.items():
+            value = value.strip()
+            if not value:
+                continue
+            if name == 'skill':
+                query[name] = SKILL_TAGGER.canonical(value) or value
+            elif name == 'location':
+                query[name] = GAZETTEER.normalize(value)[0]
+            elif name == 'remote':
+                query[name] = _choice(name, value, REMOTE_ORDER)
+            elif name == 'seniority':
+                query[name] = _choice(name, value, SENIORITY_LEVELS)
+            elif name == 'by':
+                query[name] = _choice(name, value, DIMENSIONS)
+            elif name == 'source':
+                query[name] = self.postings.sources.get(value.lower(), value) if self.postings else value
+            elif name in ('min_salary', 'max_salary'):
+                query[name] = _number(name, value, 0)
+            else:
+                query[name] = int(_number(name, value, 1))
+        if path == '/postings':
+            query.setdefault('page', 1)
+            query['per_page'] = min(query.get('per_page', DEFAULT_PER_PAGE), MAX_PER_PAGE)
+        return path, tuple(sorted(query.items()))
+
+    def answer(self, path, query):
+        """(status, payload) for a normalized query"""
+        filters = dict(query)
+        if path == '/postings':
+            if self.postings is None:
+                return 503, {'error': 'no Parquet posting dataset loaded; run the analysis with JOBS_EXPORT=1'}
+            page, per_page = filters.pop('page'), filters.pop('per_page')
+            return 200, {'filters': filters, **self.postings.query(filters, page, per_page)}
+
+        if self.cube is None:
+            return 503, {'error': 'no aggregate cube loaded; run the analysis with CUBE_EXPORT=1'}
+        by = filters.pop('by', None)
+        if by is None:
+            return 200, {'filters': filters, 'cell': self.cube.cell(**filters)}
+        cells = self.cube.rollup(by, **filters)
+        return 200, {
+            'filters': filters,
+            'by': by,
+            'cells': [{by: member, **cell} for member, cell in
+                      sorted(cells.items(), key=lambda item: (-item[1]['postings'], str(item[0])))]
+        }
+
+    def stats(self):
+        return {
+            'loaded_at': self.loaded_at,
+            'postings': len(self.postings) if self.postings is not None else 0,
+            'cube_cells': len(self.cube) if self.cube is not None else 0,
+            'cache': self.cache.stats(),
+            'latency': self.latency.percentiles()
+        }
+
+    def respond(self, target):
+        """(status, encoded body, latency bucket or None) for a request target"""
+        url = urlsplit(target)
+        if url.path == '/stats':
+            return 200, encode(self.stats()), None
+        try:
+            key = self.normalize(url.path, dict(parse_qsl(url.query)))
+        except LookupError as e:
+            return 404, encode({'error': str(e)}), None
+        except ValueError as e:
+            return 400, encode({'error': str(e)}), None
+
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body, 'cached'
+        status, payload = self.answer(*key)
+        body = encode(payload)
+        if status == 200:
+            self.cache.put(key, body)
+        return status, body, 'uncached'
+
+
+def _choice(name, value, choices):
+    for choice in choices:
+        if choice.lower() == value.lower():
+            return choice
+    raise ValueError(f"{name} must be one of {', '.join(choices)}, got '{value}'")
+
+
+def _number(name, value, minimum):
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got '{value}'")
+    # inf and 1e400 would pass the minimum and then overflow int()
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number, got '{value}'")
+    if not number >= minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got '{value}'")
+    return number
+
+
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a client's repeated queries skip the TCP handshake; with headers and body
+    # written separately, Nagle's algorithm would hold the body back for the delayed ACK (~40ms)
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        started = time.perf_counter()
+        service = self.server.service
+        status, body, bucket = service.respond(self.path)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if bucket:
+            self.send_header('X-Cache', 'HIT' if bucket == 'cached' else 'MISS')
+        self.end_headers()
+        self.wfile.write(body)
+        if bucket:
+            service.latency.record(bucket, time.perf_counter() - started)
+
+    def log_message(self, format, *args):
+        # A log line per request would cost more than answering a cached one
+        pass
+
+
+def serve(host=None, port=None, cube_path=None, dataset_dir=None):
+    """Load the latest analysis and serve queries until interrupted"""
+    service = QueryService.load(cube_path, dataset_dir)
+    if service.cube is None and service.postings is None:
+        print("❌ No aggregate cube or posting dataset found; run `process_data.py analyze` first")
+        return None
+    host = host or os.environ.get('QUERY_HOST', DEFAULT_HOST)
+    port = port or int(os.environ.get('QUERY_PORT', DEFAULT_PORT))
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"🔎 Serving {len(service.postings) if service.postings is not None else 0} postings and "
+          f"{len(service.cube) if service.cube is not None else 0} cube cells on http://{host}:{port} "
+          f"(/postings, /aggregates, /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Query service stopped")
+    finally:
+        server.server_close()
+    return service
@@ -0,0 +1,81 @@
+"""
+Token bucket rate limiter shared by the API fetchers
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Thread-safe token bucket that backs off on throttling and recovers gradually"""
+
+    def __init__(self, rate, capacity=None, min_rate=None):
+        # A rate of 0/None disables limiting (e.g. when replaying recorded responses)
+        self.max_rate = rate or 0
+        self.rate = self.max_rate
+        self.min_rate = min_rate or self.max_rate / 16
+        self.capacity = capacity or max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, deadline=None):
+        """Block until a token is available; returns False if the deadline passes first"""
+        if not self.max_rate:
+            return True
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            if deadline is not None and now + delay > deadline:
+                return False
+            time.sleep(delay)
+
+    def throttle(self, retry_after=None):
+        """Halve the rate after a 429/5xx and pause for Retry-After seconds if given"""
+        if not self.max_rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def recover(self):
+        """Additively raise the rate back towards its ceiling after a success"""
+        if not self.max_rate:
+            return
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
@@ -0,0 +1,202 @@
+"""
+Run instrumentation
+Times every pipeline stage and fetch source, counts records and downloaded bytes, tracks
+peak RSS and writes it all as a JSON run report, with a history line per run so slow
+stages can be compared week to week
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_REPORT_PATH = 'output/run_report.json'
+DEFAULT_HISTORY_PATH = '.cache/run_history.jsonl'
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class RunProfiler:
+    """Collects stage timings, source outcomes and HTTP volume for one run"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.stages = []
+        self.sources = []
+        self.http = {'requests': 0, 'bytes_downloaded': 0, 'bytes_from_cache': 0, 'by_host': {}}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; set 'records' on the yielded dict to report how many items it handled"""
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(name)
+        info = {'name': '/'.join(stack)}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            info['seconds'] = round(time.perf_counter() - start, 4)
+            info['peak_rss_mb'] = peak_rss_mb()
+            stack.pop()
+            with self.lock:
+                self.stages.append(info)
+
+    def timed_source(self, name, fetch_function):
+        """Wrap a source's fetch function so its duration, outcome and record count are kept"""
+        def run():
+            start = time.perf_counter()
+            outcome = {'name': name, 'ok': False, 'records': 0}
+            try:
+                result = fetch_function()
+                outcome['ok'] = True
+                outcome['records'] = len(result) if isinstance(result, (list, dict)) else 0
+                return result
+            finally:
+                outcome['seconds'] = round(time.perf_counter() - start, 4)
+                self.add_source(outcome)
+        return run
+
+    def add_source(self, outcome):
+        with self.lock:
+            self.sources.append(outcome)
+
+    def track_session(self, session):
+        """Count response bytes for every request the session makes"""
+        session.hooks['response'].append(self._count_response)
+
+    def _count_response(self, response, *args, **kwargs):
+        size = len(response.content or b'')
+        cached = getattr(response, 'from_cache', False)
+        host = urlsplit(response.url or '').netloc or 'unknown'
+        with self.lock:
+            self.http['requests'] += 1
+            self.http['bytes_from_cache' if cached else 'bytes_downloaded'] += size
+            per_host = self.http['by_host'].setdefault(host, {'requests': 0, 'bytes': 0})
+            per_host['requests'] += 1
+            per_host['bytes'] += size
+
+    def report(self):
+        with self.lock:
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'total_seconds': round(time.perf_counter() - self.start, 4),
+                'peak_rss_mb': peak_rss_mb(),
+                'http': json.loads(json.dumps(self.http)),
+                'stages': sorted(self.stages, key=lambda stage: stage['name']),
+                'sources': sorted(self.sources, key=lambda source: source['name'])
+            }
+
+    def write(self, path=None, history_path=None):
+        """Write the JSON report and append a compact line to the run history"""
+        path = path or os.environ.get('RUN_REPORT_PATH', DEFAULT_REPORT_PATH)
+        history_path = history_path or os.environ.get('RUN_HISTORY_PATH', DEFAULT_HISTORY_PATH)
+        report = self.report()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        previous = self._last_history_entry(history_path)
+        entry = {
+            'started_at': report['started_at'],
+            'total_seconds': report['total_seconds'],
+            'peak_rss_mb': report['peak_rss_mb'],
+            'bytes_downloaded': report['http']['bytes_downloaded'],
+            'stages': {stage['name']: stage['seconds'] for stage in report['stages']}
+        }
+        os.makedirs(os.path.dirname(history_path) or '.', exist_ok=True)
+        with open(history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+        print(f"📋 Run report written to {path} ({report['total_seconds']:.1f}s, "
+              f"peak RSS {report['peak_rss_mb']} MB, {report['http']['bytes_downloaded'] / 1024:.0f} KB downloaded)")
+        if previous:
+            self._print_regressions(entry, previous)
+        return report
+
+    @staticmethod
+    def _last_history_entry(history_path):
+        if not os.path.exists(history_path):
+            return None
+        last = None
+        with open(history_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    last = line
+        try:
+            return json.loads(last) if last else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _print_regressions(entry, previous, factor=1.5, min_seconds=0.5):
+        """Flag stages at least 50% (and half a second) slower than the previous run"""
+        for name, seconds in sorted(entry['stages'].items()):
+            before = previous.get('stages', {}).get(name)
+            if before is not None and seconds >= before * factor and seconds - before >= min_seconds:
+                print(f"🐢 {name}: {seconds:.1f}s (was {before:.1f}s on {previous['started_at']})")
+
+
+RUN_PROFILER = RunProfiler()
+
+
+@contextmanager
+def code_profiler(kind, output_dir='output'):
+    """Optional whole-run profile: cProfile stats or a pyinstrument HTML report"""
+    if not kind:
+        yield
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    if kind == 'cprofile':
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path = os.path.join(output_dir, 'profile.prof')
+            profiler.dump_stats(path)
+            print(f"🔬 cProfile stats written to {path}")
+        return
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        print("⚠️ pyinstrument not installed, running without a profiler")
+        yield
+        return
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        path = os.path.join(output_dir, 'profile.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+        print(f"🔬 pyinstrument profile written to {path}")
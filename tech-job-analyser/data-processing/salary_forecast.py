@@ -0,0 +1,162 @@
+"""
+Salary trend forecasting
+Reads the job store's weekly aggregates and fits a linear trend to every overall, per-skill,
+per-location and remote-share series. Salary series are weekly means of the annual salaries
+the store counted (implausible amounts never enter its sums), with location names folded into
+their gazetteer bucket; the remote share comes from the weekly posting counts. Series observed in the same weeks are fitted together as one
+multi-output regression, and forecasts carry 95% prediction intervals
+"""
+
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.linear_model import LinearRegression
+
+from gazetteer import GAZETTEER
+
+MIN_WEEKS = 8
+REMOTE_ARRANGEMENTS = ('Fully remote', 'Hybrid')
+
+
+def week_start(week):
+    """Monday of an ISO week string such as 2024-W07"""
+    return datetime.strptime(f"{week}-1", '%G-W%V-%u').date()
+
+
+def weekly_series(rows):
+    """weekly_stats rows -> (postings, salaried, salary_sum) as week x (dimension, key) frames"""
+    frame = pd.DataFrame(rows, columns=['week', 'dimension', 'key', 'postings', 'salaried', 'salary_sum', 'salary_sq_sum'])
+    # The store keeps raw display names; names in the same gazetteer bucket are one location
+    locations = (frame['dimension'] == 'location').to_numpy()
+    frame.loc[locations, 'key'] = GAZETTEER.normalize_column(frame.loc[locations, 'key'])[0]
+    pivot = frame.pivot_table(index='week', columns=['dimension', 'key'], values=['postings', 'salaried', 'salary_sum'],
+                              aggfunc='sum').sort_index().fillna(0)
+    return pivot['postings'], pivot['salaried'], pivot['salary_sum']
+
+
+class TrendFits:
+    """Per-series linear fits over week offsets, kept as arrays aligned with self.keys"""
+
+    def __init__(self, keys, intercept, slope, residual_std, points, x_mean, x_spread):
+        self.keys = list(keys)
+        self.intercept = intercept
+        self.slope = slope
+        self.residual_std = residual_std
+        self.points = points
+        self.x_mean = x_mean
+        self.x_spread = x_spread
+
+    def predict(self, offset, level=0.95):
+        """(value, lower, upper) arrays at a week offset for every series"""
+        value = self.intercept + self.slope * offset
+        t = stats.t.ppf(0.5 + level / 2, np.maximum(self.points - 2, 1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            margin = t * self.residual_std * np.sqrt(1 + 1 / self.points + (offset - self.x_mean) ** 2 / self.x_spread)
+        return value, value - margin, value + margin
+
+
+def fit_trends(series, offsets, min_points=MIN_WEEKS):
+    """Fit every column of a week x series frame against week offsets; columns with fewer
+    than min_points observed weeks are skipped"""
+    values = series.to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    enough = observed.sum(axis=0) >= min_points
+    values, observed = values[:, enough], observed[:, enough]
+    keys = list(series.columns[enough])
+    if not keys:
+        return TrendFits([], *(np.array([]) for _ in range(6)))
+
+    intercept, slope, residual_std, points, x_mean, x_spread = (np.zeros(len(keys)) for _ in range(6))
+    # Columns sharing a pattern of observed weeks are fitted in a single call
+    patterns, pattern_of = np.unique(observed.T, axis=0, return_inverse=True)
+    for number, pattern in enumerate(patterns):
+        columns = np.flatnonzero(pattern_of.ravel() == number)
+        x = offsets[pattern].reshape(-1, 1)
+        y = values[pattern][:, columns]
+        model = LinearRegression().fit(x, y)
+        residuals = y - model.predict(x).reshape(y.shape)
+        n = len(x)
+        intercept[columns] = model.intercept_
+        slope[columns] = model.coef_.reshape(-1)
+        residual_std[columns] = np.sqrt((residuals ** 2).sum(axis=0) / max(n - 2, 1))
+        points[columns] = n
+        x_mean[columns] = x.mean()
+        x_spread[columns] = ((x - x.mean()) ** 2).sum()
+    return TrendFits(keys, intercept, slope, residual_std, points, x_mean, x_spread)
+
+
+def _forecast_records(fits, offset):
+    value, lower, upper = fits.predict(offset)
+    return {
+        key: {'value': int(round(value[i])), 'lower': int(round(lower[i])), 'upper': int(round(upper[i]))}
+        for i, key in enumerate(fits.keys)
+    }
+
+
+def build_forecasts(rows, target_year=None, min_points=None):
+    """Yearly history and next-year forecasts from weekly_stats rows, or None while the store
+    holds fewer than min_points weeks of salaries"""
+    min_points = min_points or int(os.environ.get('FORECAST_MIN_WEEKS', MIN_WEEKS))
+    if not rows:
+        return None
+    postings, salaried, salary_sum = weekly_series(rows)
+    if (salaried > 0).any(axis=1).sum() < min_points:
+        return None
+    means = salary_sum / salaried.where(salaried > 0)
+
+    starts = [week_start(week) for week in means.index]
+    origin = starts[0]
+    offsets = np.array([(start - origin).days / 7 for start in starts])
+    target_year = target_year or date.today().year + 1
+    target = (date(target_year, 7, 1) - origin).days / 7
+
+    salary_fits = fit_trends(means, offsets, min_points)
+    overall_postings = postings.get(('overall', 'all'), postings.sum(axis=1))
+    remote_postings = postings.reindex(columns=[('remote', arrangement) for arrangement in REMOTE_ARRANGEMENTS],
+                                       fill_value=0).sum(axis=1)
+    remote_share = pd.DataFrame({'remote': remote_postings / overall_postings.where(overall_postings > 0) * 100})
+    remote_fits = fit_trends(remote_share, offsets, min_points)
+
+    # Observed years, salary weighted by salaried postings
+    years = pd.Index([start.year for start in starts], name='year')
+    history = []
+    if ('overall', 'all') in means:
+        yearly_sum = salary_sum[('overall', 'all')].groupby(years).sum()
+        yearly_salaried = salaried[('overall', 'all')].groupby(years).sum()
+        remote_by_year = remote_postings.groupby(years).sum() / overall_postings.groupby(years).sum()
+        for year in yearly_sum.index:
+            if yearly_salaried[year]:
+                history.append({
+                    'year': int(year),
+                    'average_salary': int(round(yearly_sum[year] / yearly_salaried[year])),
+                    'remote_percentage': int(round(remote_by_year[year] * 100))
+                })
+
+    salary = _forecast_records(salary_fits, target)
+    remote = _forecast_records(remote_fits, target)
+    return {
+        'target_year': target_year,
+        'weeks_observed': int(means.notna().any(axis=1).sum()),
+        'history': history,
+        'overall': salary.get(('overall', 'all')),
+        'remote_percentage': remote.get('remote'),
+        'skills': {key: record for (dimension, key), record in salary.items() if dimension == 'skill'},
+        'locations': {key: record for (dimension, key), record in salary.items() if dimension == 'location'},
+        'series_fitted': len(salary_fits.keys) + len(remote_fits.keys)
+    }
+
+
+def forecast_from_store(path=None):
+    """build_forecasts over the job store, or None when it does not exist yet"""
+    path = path or os.environ.get('JOB_STORE_PATH', '.cache/job_store.sqlite')
+    if not os.path.exists(path):
+        return None
+    from job_store import JobStore
+    store = JobStore(path)
+    try:
+        return build_forecasts(store.weekly_stats())
+    finally:
+        store.close()
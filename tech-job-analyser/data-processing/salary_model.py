@@ -0,0 +1,117 @@
+"""
+Salary prediction model
+A ridge regression on log salary over multi-hot skill, location and seniority features,
+fitted in one call on the sparse design matrix. Because the model is additive in log
+space, it exports as a small coefficient table the dashboard scores by summing weights
+and taking exp(), and predict_batch scores whole candidate grids with one matrix product
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import Ridge
+
+from gazetteer import GAZETTEER
+from seniority import SENIORITY_CLASSIFIER, SENIORITY_LEVELS
+from skill_tagger import SKILL_TAGGER
+
+MAX_LOCATIONS = 20
+MIN_TRAINING_ROWS = 50
+RIDGE_ALPHA = 1.0
+
+
+class SalaryModel:
+    """Log-salary weights per skill, location and seniority level"""
+
+    def __init__(self, intercept, skill_weights, location_weights, seniority_weights,
+                 residual_std=0.0, training_rows=0, r2=None):
+        self.intercept = float(intercept)
+        self.skill_weights = dict(skill_weights)
+        self.location_weights = dict(location_weights)
+        self.seniority_weights = dict(seniority_weights)
+        self.residual_std = float(residual_std)
+        self.training_rows = training_rows
+        self.r2 = r2
+        # Weight vectors aligned with the tagger's skill columns and the level list
+        self.skill_vector = np.array([self.skill_weights.get(skill, 0.0) for skill in SKILL_TAGGER.skills])
+        self.seniority_vector = np.array([self.seniority_weights.get(level, 0.0) for level in SENIORITY_LEVELS])
+
+    def predict_batch(self, skill_hits, locations, seniority):
+        """Annual salary for every row of a candidate grid: a job x skill 0/1 matrix, and
+        a location and a seniority level per row (unknown locations count as 'Other')"""
+        location_weights = pd.Series(locations).map(self.location_weights).fillna(0.0).to_numpy()
+        level_codes = pd.Categorical(seniority, categories=SENIORITY_LEVELS).codes
+        level_weights = np.where(level_codes >= 0, self.seniority_vector[level_codes], 0.0)
+        return np.exp(self.intercept + skill_hits @ self.skill_vector + location_weights + level_weights)
+
+    def to_dict(self):
+        """Compact coefficient table for the dashboard"""
+        def rounded(weights):
+            return {key: round(value, 4) for key, value in weights.items() if abs(value) >= 1e-4}
+        return {
+            'intercept': round(self.intercept, 4),
+            'skills': rounded(self.skill_weights),
+            'locations': rounded(self.location_weights),
+            'seniority': rounded(self.seniority_weights),
+            'residual_std': round(self.residual_std, 4),
+            'training_rows': self.training_rows,
+            'r2': round(self.r2, 3) if self.r2 is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        return cls(payload['intercept'], payload['skills'], payload['locations'], payload['seniority'],
+                   payload.get('residual_std', 0.0), payload.get('training_rows', 0), payload.get('r2'))
+
+
+def train_salary_model(jobs_df, skill_hits, seniority=None, alpha=RIDGE_ALPHA):
+    """Fit the model on the salaried postings, or return None with too few of them"""
+    salaried = jobs_df['salary_avg'].notna().to_numpy()
+    if salaried.sum() < MIN_TRAINING_ROWS:
+        return None
+    if seniority is None:
+        seniority = SENIORITY_CLASSIFIER.levels(jobs_df)
+
+    locations = jobs_df['location'].to_numpy()[salaried]
+    top_locations = pd.Series(locations).value_counts().index[:MAX_LOCATIONS]
+    location_codes = pd.Categorical(locations, categories=top_locations).codes
+    level_codes = pd.Categorical(np.asarray(seniority)[salaried], categories=SENIORITY_LEVELS).codes
+
+    rows = np.arange(salaried.sum())
+    # Locations outside the busiest ones and mid-level postings are the baseline
+    baseline = SENIORITY_LEVELS.index('mid')
+    location_rows = location_codes >= 0
+    level_rows = (level_codes >= 0) & (level_codes != baseline)
+    design = sparse.hstack([
+        skill_hits[salaried].astype(float),
+        sparse.csr_matrix((np.ones(location_rows.sum()), (rows[location_rows], location_codes[location_rows])),
+                          shape=(len(rows), len(top_locations))),
+        sparse.csr_matrix((np.ones(level_rows.sum()), (rows[level_rows], level_codes[level_rows])),
+                          shape=(len(rows), len(SENIORITY_LEVELS)))
+    ], format='csr')
+    target = np.log(jobs_df['salary_avg'].to_numpy(dtype=float)[salaried])
+
+    ridge = Ridge(alpha=alpha).fit(design, target)
+    residuals = target - ridge.predict(design)
+    weights = ridge.coef_
+    skill_count, location_count = len(SKILL_TAGGER.skills), len(top_locations)
+    return SalaryModel(
+        ridge.intercept_,
+        dict(zip(SKILL_TAGGER.skills, weights[:skill_count])),
+        dict(zip(top_locations, weights[skill_count:skill_count + location_count])),
+        dict(zip(SENIORITY_LEVELS, weights[skill_count + location_count:])),
+        residual_std=residuals.std(),
+        training_rows=int(len(rows)),
+        r2=float(1 - residuals.var() / target.var()) if target.var() else None
+    )
+
+
+def train_from_store(store, alpha=RIDGE_ALPHA):
+    """Fit the model on the job store's salaried postings, for runs (streaming mode) that
+    never hold a whole jobs frame"""
+    rows = store.salaried_postings()
+    jobs_df = pd.DataFrame(rows, columns=['first_seen', 'title', 'description', 'location', 'salary_avg'])
+    jobs_df = jobs_df.fillna({'title': '', 'description': ''})
+    jobs_df['location'] = GAZETTEER.normalize_column(jobs_df['location'])[0]
+    skill_hits = SKILL_TAGGER.tag_matrix(jobs_df['title'] + ' ' + jobs_df['description'])
+    return train_salary_model(jobs_df, skill_hits, alpha=alpha)
@@ -0,0 +1,162 @@
+"""
+Salary normalization
+Detects hourly, daily and monthly pay from the figure's magnitude and the posting text,
+annualizes it, drops implausible values and rejects per-skill and per-location outliers
+with a median absolute deviation test, all over whole columns at once. salary_stage applies
+the per-posting rules (annualizing and bounds, no group test) one posting at a time, for the
+streaming pipeline and for what the job store records in either mode
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from skill_tagger import SKILL_TAGGER
+
+# Working hours and days in a UK year
+ANNUAL_FACTORS = {'hourly': 37.5 * 52, 'daily': 220, 'monthly': 12}
+
+# A period named in the text is only believed when the figure is small enough to fit it
+PERIOD_PATTERNS = {
+    'hourly': (re.compile(r'\b(?:per\s+hour|an\s+hour|p/?h|hourly)\b', re.IGNORECASE), 500),
+    'daily': (re.compile(r'\b(?:per\s+day|p/?d|day\s+rate|daily\s+rate)\b', re.IGNORECASE), 3000),
+    'monthly': (re.compile(r'\b(?:per\s+month|pcm|monthly\s+salary)\b', re.IGNORECASE), 20000)
+}
+# Figures at or below these are a rate whatever the text says
+MAX_HOURLY = 150
+MAX_DAILY = 1500
+
+MIN_ANNUAL = 12000
+MAX_ANNUAL = 500000
+
+# Robust z-score above which a salary is an outlier within its group (Iglewicz & Hoaglin)
+MAD_THRESHOLD = 3.5
+MIN_GROUP_SIZE = 10
+
+SALARY_COLUMNS = ('salary_min', 'salary_max', 'salary_avg')
+
+
+def pay_periods(raw, text):
+    """Pay period per row from the raw salary figure and the posting text"""
+    period = np.full(len(raw), 'annual', dtype=object)
+    for name in ('monthly', 'daily', 'hourly'):
+        pattern, ceiling = PERIOD_PATTERNS[name]
+        period[text.str.contains(pattern).to_numpy() & (raw <= ceiling)] = name
+    period[raw <= MAX_DAILY] = np.where(raw[raw <= MAX_DAILY] <= MAX_HOURLY, 'hourly', 'daily')
+    return period
+
+
+def pay_period(raw, text):
+    """pay_periods for a single posting"""
+    if raw <= MAX_DAILY:
+        return 'hourly' if raw <= MAX_HOURLY else 'daily'
+    for name in ('hourly', 'daily', 'monthly'):
+        pattern, ceiling = PERIOD_PATTERNS[name]
+        if raw <= ceiling and pattern.search(text):
+            return name
+    return 'annual'
+
+
+def mad_outliers(values, groups):
+    """Rows whose value is more than MAD_THRESHOLD robust deviations from its group median;
+    groups smaller than MIN_GROUP_SIZE are left alone"""
+    frame = pd.DataFrame({'value': values, 'group': groups})
+    grouped = frame.groupby('group')['value']
+    median = grouped.transform('median')
+    mad = (frame['value'] - median).abs().groupby(frame['group']).transform('median')
+    size = grouped.transform('size')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = 0.6745 * (frame['value'] - median).abs() / mad
+    return ((size >= MIN_GROUP_SIZE) & (mad > 0) & (score > MAD_THRESHOLD)).to_numpy()
+
+
+def normalize_salaries(jobs_df, skill_hits=None):
+    """Annualize and filter the salary columns of jobs_df in place; returns how many rows
+    each rule touched"""
+    if skill_hits is None:
+        skill_hits = SKILL_TAGGER.tag_matrix(jobs_df['text'])
+    salary_min = jobs_df['salary_min'].to_numpy(dtype=float)
+    salary_max = jobs_df['salary_max'].to_numpy(dtype=float)
+    salary_avg = jobs_df['salary_avg'].to_numpy(dtype=float)
+
+    # Sources that only give a range get its midpoint
+    from_range = np.where(np.isnan(salary_min) | np.isnan(salary_max),
+                          np.fmax(salary_min, salary_max), (salary_min + salary_max) / 2)
+    salary_avg = np.where(np.isnan(salary_avg), from_range, salary_avg)
+    has_salary = ~np.isnan(salary_avg)
+
+    counts = {}
+    period = pay_periods(np.where(has_salary, salary_avg, np.inf), jobs_df['text'])
+    factor = np.ones(len(jobs_df))
+    for name, multiplier in ANNUAL_FACTORS.items():
+        rows = period == name
+        factor[rows] = multiplier
+        counts[name] = int(rows.sum())
+    salary_min, salary_max, salary_avg = salary_min * factor, salary_max * factor, salary_avg * factor
+
+    implausible = has_salary & ((salary_avg < MIN_ANNUAL) | (salary_avg > MAX_ANNUAL))
+    counts['implausible'] = int(implausible.sum())
+    salary_avg[implausible] = np.nan
+
+    # Outliers within any of a posting's skills, then within its location
+    valid = np.flatnonzero(~np.isnan(salary_avg))
+    hits = skill_hits[valid].tocoo()
+    skill_outlier = np.zeros(len(jobs_df), dtype=bool)
+    flagged = mad_outliers(salary_avg[valid][hits.row], hits.col)
+    skill_outlier[valid[hits.row[flagged]]] = True
+    counts['skill_outliers'] = int(skill_outlier.sum())
+    salary_avg[skill_outlier] = np.nan
+
+    valid = np.flatnonzero(~np.isnan(salary_avg))
+    location_outlier = np.zeros(len(jobs_df), dtype=bool)
+    location_outlier[valid[mad_outliers(salary_avg[valid], jobs_df['location'].to_numpy()[valid])]] = True
+    counts['location_outliers'] = int(location_outlier.sum())
+    salary_avg[location_outlier] = np.nan
+
+    rejected = implausible | skill_outlier | location_outlier
+    salary_min[rejected] = np.nan
+    salary_max[rejected] = np.nan
+    jobs_df['salary_min'], jobs_df['salary_max'], jobs_df['salary_avg'] = salary_min, salary_max, salary_avg
+    jobs_df['pay_period'] = pd.Categorical(period)
+    return counts
+
+
+def _salary_value(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def salary_stage(jobs, reference=None, counts=None):
+    """Coerce salary fields to floats, fill salary_avg from the range when missing, annualize
+    hourly, daily and monthly figures and drop implausible ones; postings with no salary at
+    all are filled from the salary reference when one is given. Rule hits go into counts."""
+    counts = counts if counts is not None else Counter()
+    for job in jobs:
+        salary_min = _salary_value(job.get('salary_min'))
+        salary_max = _salary_value(job.get('salary_max'))
+        salary_avg = _salary_value(job.get('salary_avg'))
+        if salary_avg is None and (salary_min or salary_max):
+            salary_avg = (salary_min + salary_max) / 2 if salary_min and salary_max else salary_min or salary_max
+
+        if salary_avg is not None:
+            period = pay_period(salary_avg, f"{job.get('title') or ''} {job.get('description') or ''}")
+            job['pay_period'] = period
+            if period in ANNUAL_FACTORS:
+                counts[period] += 1
+                factor = ANNUAL_FACTORS[period]
+                salary_min, salary_max, salary_avg = (
+                    value * factor if value is not None else None for value in (salary_min, salary_max, salary_avg)
+                )
+            if not MIN_ANNUAL <= salary_avg <= MAX_ANNUAL:
+                counts['implausible'] += 1
+                salary_min = salary_max = salary_avg = None
+        elif reference is not None:
+            salary_avg = reference.estimate_skills(job['skills'])
+            job['salary_imputed'] = salary_avg is not None
+        job['salary_min'], job['salary_max'], job['salary_avg'] = salary_min, salary_max, salary_avg
+        yield job
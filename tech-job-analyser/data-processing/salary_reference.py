@@ -0,0 +1,122 @@
+"""
+Salary reference index
+An immutable skill -> (min, max, median) table built once per process, from the static UK
+ranges or from the salary history in the job store, with cached lookups for free-text
+skill names and a sparse-matrix lookup for whole batches of postings
+"""
+
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from salary_normalization import MAX_ANNUAL, MIN_ANNUAL, mad_outliers
+from skill_tagger import SKILL_TAGGER
+
+# Typical UK salary range per technology
+SALARY_RANGES = {
+    'Python': (45000, 85000),
+    'Java': (40000, 80000),
+    'JavaScript': (35000, 75000),
+    'TypeScript': (40000, 80000),
+    'AWS': (50000, 90000),
+    'Azure': (45000, 85000),
+    'React': (35000, 70000),
+    'Node.js': (40000, 80000),
+    'Docker': (45000, 85000),
+    'Kubernetes': (50000, 95000),
+    'Machine Learning': (55000, 100000),
+    'Data Science': (45000, 90000)
+}
+DEFAULT_SALARY = 50000
+
+# Salaried postings a skill needs in the job store before its history replaces the static range
+MIN_HISTORY_POSTINGS = 20
+
+
+class SalaryReference:
+    """Read-only salary figures per canonical skill"""
+
+    def __init__(self, entries, default=DEFAULT_SALARY, origin='static'):
+        self.entries = MappingProxyType({
+            SKILL_TAGGER.canonical(skill) or skill: tuple(int(value) for value in entry)
+            for skill, entry in entries.items()
+        })
+        self.default = default
+        self.origin = origin
+        # Column-aligned with SKILL_TAGGER.skills so batches are a single matrix product
+        self.medians = np.array([self.entries[skill][2] if skill in self.entries else 0
+                                 for skill in SKILL_TAGGER.skills], dtype=float)
+        self.known = (self.medians > 0).astype(float)
+        self.estimate = lru_cache(maxsize=4096)(self._estimate)
+
+    @classmethod
+    def from_ranges(cls, ranges=None):
+        ranges = ranges or SALARY_RANGES
+        return cls({skill: (low, high, (low + high) // 2) for skill, (low, high) in ranges.items()})
+
+    @classmethod
+    def from_job_store(cls, store, min_postings=MIN_HISTORY_POSTINGS, ranges=None):
+        """Static ranges overlaid with mean +/- one standard deviation and the median of every
+        skill that has enough salaried postings in the store. Salaries come from the stored
+        postings, within the plausible annual bounds and with per-skill outliers (MAD test)
+        dropped, and every range is kept inside those bounds"""
+        rows = store.salaried_postings()
+        text = [f"{title or ''} {description or ''}" for _, title, description, _, _ in rows]
+        hits = SKILL_TAGGER.tag_matrix(text).tocoo()
+        salaries = np.array([row[-1] for row in rows], dtype=float)[hits.row]
+        kept = ~mad_outliers(salaries, hits.col)
+        stats = pd.DataFrame({'skill': hits.col[kept], 'salary': salaries[kept]}).groupby('skill')['salary'].agg(
+            count='count', mean='mean', median='median', spread=lambda values: values.std(ddof=0))
+
+        entries = {skill: (low, high, (low + high) // 2) for skill, (low, high) in (ranges or SALARY_RANGES).items()}
+        for column, row in stats.iterrows():
+            if row['count'] < min_postings:
+                continue
+            mean, spread = row['mean'], row['spread']
+            entries[SKILL_TAGGER.skills[column]] = (max(MIN_ANNUAL, mean - spread), min(MAX_ANNUAL, mean + spread),
+                                                    row['median'])
+        return cls(entries, origin='history')
+
+    def get(self, skill):
+        """(min, max, median) for a canonical skill name or alias, or None"""
+        return self.entries.get(SKILL_TAGGER.canonical(skill) or skill)
+
+    def _estimate(self, text):
+        """Median for the first known skill named in free text, else the default"""
+        entry = self.get(text)
+        if entry:
+            return entry[2]
+        for skill in SKILL_TAGGER.tag(text):
+            if skill in self.entries:
+                return self.entries[skill][2]
+        return self.default
+
+    def estimate_skills(self, skills):
+        """Mean reference median over the known skills of one posting, or None"""
+        medians = [self.entries[skill][2] for skill in skills if skill in self.entries]
+        return sum(medians) / len(medians) if medians else None
+
+    def estimate_matrix(self, skill_hits):
+        """estimate_skills for every row of a job x skill matrix at once (NaN with no known skill)"""
+        known = skill_hits @ self.known
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(known > 0, (skill_hits @ self.medians) / known, np.nan)
+
+
+@lru_cache(maxsize=None)
+def get_salary_reference():
+    """The process-wide index: SALARY_REFERENCE=history builds it from the job store"""
+    if os.environ.get('SALARY_REFERENCE', 'static') == 'history':
+        path = os.environ.get('JOB_STORE_PATH', '.cache/job_store.sqlite')
+        if os.path.exists(path):
+            from job_store import JobStore
+            store = JobStore(path)
+            try:
+                return SalaryReference.from_job_store(store)
+            finally:
+                store.close()
+        print("⚠️ No job store history yet, using the static salary ranges")
+    return SalaryReference.from_ranges()
@@ -0,0 +1,95 @@
+"""
+Seniority classifier
+Labels postings graduate / junior / mid / senior / lead / principal. Level keywords in the
+title are found with one precompiled alternation (the most senior one wins); postings with
+none fall back to the years of experience asked for in the description, and then to mid
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+SENIORITY_LEVELS = ['graduate', 'junior', 'mid', 'senior', 'lead', 'principal']
+
+# Dashboard label per level, in the order the experience panel lists them
+LEVEL_LABELS = {
+    'graduate': 'Graduate (0-1 yrs)',
+    'junior': 'Junior (1-3 yrs)',
+    'mid': 'Mid-level (3-5 yrs)',
+    'senior': 'Senior (5-8 yrs)',
+    'lead': 'Lead (8+ yrs)',
+    'principal': 'Principal (10+ yrs)'
+}
+
+# Lowercase title keywords per level
+TITLE_KEYWORDS = {
+    'graduate': ['graduate', 'grad', 'entry level', 'entry-level', 'trainee', 'intern', 'internship', 'apprentice'],
+    'junior': ['junior', 'jr', 'associate'],
+    'mid': ['mid level', 'mid-level', 'intermediate'],
+    'senior': ['senior', 'sr', 'snr', 'experienced'],
+    # Only engineering managers: a bare 'manager' would promote account and sales managers
+    'lead': ['lead', 'team lead', 'tech lead', 'technical lead', 'engineering manager', 'development manager',
+             'software manager', 'technical manager'],
+    'principal': ['principal', 'staff', 'head of', 'director', 'distinguished', 'chief']
+}
+
+# Minimum years of experience at which each level starts
+EXPERIENCE_YEARS = [(10, 'principal'), (8, 'lead'), (5, 'senior'), (3, 'mid'), (1, 'junior'), (0, 'graduate')]
+
+
+class SeniorityClassifier:
+    """Seniority level per posting from precompiled title and experience patterns"""
+
+    def __init__(self, keywords=None):
+        keywords = keywords or TITLE_KEYWORDS
+        self.keyword_rank = {}
+        for level, level_keywords in keywords.items():
+            for keyword in level_keywords:
+                self.keyword_rank[keyword] = SENIORITY_LEVELS.index(level)
+        # Longest first, so 'team lead' is preferred to 'lead' at the same position
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(self.keyword_rank, key=len, reverse=True))
+        self.title_pattern = re.compile(rf'(?<![a-z0-9])(?:{alternation})(?![a-z0-9])')
+        self.mid = SENIORITY_LEVELS.index('mid')
+        self.years_pattern = re.compile(
+            r'(\d{1,2})\s*\+?\s*(?:-|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?\W{0,3}(?:of\s+)?'
+            r'(?:\w+\s+){0,2}experience'
+        )
+
+    def title_rank(self, title):
+        """Most senior level named in a title, or None"""
+        ranks = [self.keyword_rank[keyword] for keyword in self.title_pattern.findall(title.lower())]
+        return max(ranks) if ranks else None
+
+    def years_rank(self, description):
+        """Level implied by the fewest years of experience a description asks for, or None"""
+        years = [int(match) for match in self.years_pattern.findall(description.lower())]
+        if not years:
+            return None
+        required = min(years)
+        return next(SENIORITY_LEVELS.index(level) for minimum, level in EXPERIENCE_YEARS if required >= minimum)
+
+    def rank(self, title, description=''):
+        """Index into SENIORITY_LEVELS for one posting"""
+        rank = self.title_rank(title or '')
+        if rank is None:
+            rank = self.years_rank(description or '')
+        return self.mid if rank is None else rank
+
+    def classify(self, title, description=''):
+        return SENIORITY_LEVELS[self.rank(title, description)]
+
+    def classify_many(self, titles, descriptions=None):
+        """Level codes (indices into SENIORITY_LEVELS) for aligned title/description sequences"""
+        titles = list(titles)
+        descriptions = list(descriptions) if descriptions is not None else [''] * len(titles)
+        return np.fromiter((self.rank(title, description) for title, description in zip(titles, descriptions)),
+                           dtype=np.int8, count=len(titles))
+
+    def levels(self, jobs_df):
+        """Categorical seniority column for a jobs frame"""
+        codes = self.classify_many(jobs_df['title'], jobs_df['description'])
+        return pd.Categorical.from_codes(codes, categories=SENIORITY_LEVELS)
+
+
+SENIORITY_CLASSIFIER = SeniorityClassifier()
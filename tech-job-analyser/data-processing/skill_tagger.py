@@ -0,0 +1,122 @@
+"""
+Multi-pattern skill tagger
+All aliases are compiled into one word-bounded regex shaped as a prefix trie, so every
+technology in a document is found in a single left-to-right pass over the lowercased text
+"""
+
+import re
+
+import numpy as np
+from scipy import sparse
+
+# Canonical technology name -> lowercase aliases
+SKILL_ALIASES = {
+    'Python': ['python'],
+    'Java': ['java'],
+    'JavaScript': ['javascript', 'ecmascript', 'es6'],
+    'TypeScript': ['typescript'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    '.NET': ['.net', 'dotnet', 'asp.net', '.net core'],
+    'Go': ['golang', 'go developer', 'go engineer'],
+    'Rust': ['rust'],
+    'PHP': ['php'],
+    'Ruby': ['ruby', 'ruby on rails', 'rails'],
+    'Kotlin': ['kotlin'],
+    'Swift': ['swift'],
+    'Scala': ['scala'],
+    'C++': ['c++', 'cpp'],
+    'SQL': ['sql', 'postgresql', 'postgres', 'mysql', 't-sql'],
+    'React': ['react', 'reactjs', 'react.js'],
+    'Angular': ['angular', 'angularjs'],
+    'Vue': ['vue', 'vuejs', 'vue.js'],
+    'Node.js': ['node', 'nodejs', 'node.js'],
+    'Django': ['django'],
+    'AWS': ['aws', 'amazon web services'],
+    'Azure': ['azure'],
+    'GCP': ['gcp', 'google cloud'],
+    'Docker': ['docker'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'Terraform': ['terraform'],
+    'Machine Learning': ['machine learning', 'ml engineer', 'deep learning'],
+    'Data Science': ['data science', 'data scientist']
+}
+
+# Characters that continue a token, so 'java' never matches inside 'javascript' or 'c#'
+TOKEN_CHARS = r'a-z0-9#+'
+
+
+def _trie_regex(words):
+    """Regex for a set of literals with shared prefixes factored out (no backtracking across words)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        can_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if can_end:
+            body = f'(?:{body})?' if len(branches) > 1 or len(branches[0]) > 1 else f'{body}?'
+        return body
+
+    return build(trie)
+
+
+class SkillTagger:
+    """Finds canonical skills in free text and builds sparse job x skill matrices"""
+
+    def __init__(self, aliases=None):
+        aliases = aliases or SKILL_ALIASES
+        self.skills = list(aliases)
+        self.skill_index = {skill: index for index, skill in enumerate(self.skills)}
+        # Canonical names are only searched for when listed as an alias ('go' alone is too ambiguous)
+        self.name_index = {skill.lower(): index for index, skill in enumerate(self.skills)}
+        self.alias_index = {}
+        for skill, skill_aliases in aliases.items():
+            for alias in skill_aliases:
+                self.alias_index[alias] = self.skill_index[skill]
+        self.pattern = re.compile(
+            rf'(?<![{TOKEN_CHARS}])(?:{_trie_regex(self.alias_index)})(?![{TOKEN_CHARS}])'
+        )
+
+    def tag_indices(self, text):
+        """Skill column indices in order of first appearance"""
+        if not text:
+            return []
+        found = dict.fromkeys(self.alias_index[alias] for alias in self.pattern.findall(text.lower()))
+        return list(found)
+
+    def tag(self, text):
+        """Canonical skill names in order of first appearance"""
+        return [self.skills[index] for index in self.tag_indices(text)]
+
+    def canonical(self, name):
+        """Canonical name for an exact skill name or alias, or None"""
+        key = str(name).strip().lower()
+        index = self.name_index.get(key, self.alias_index.get(key))
+        return self.skills[index] if index is not None else None
+
+    def tag_matrix(self, texts):
+        """Sparse CSR matrix (documents x skills) of 0/1 indicators"""
+        return self.index_matrix(self.tag_indices(text) for text in texts)
+
+    def index_matrix(self, index_lists):
+        """Sparse CSR matrix from per-document lists of skill indices"""
+        indptr = [0]
+        indices = []
+        for document_indices in index_lists:
+            indices.extend(document_indices)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.uint8)
+        return sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.skills))
+        )
+
+
+SKILL_TAGGER = SkillTagger()
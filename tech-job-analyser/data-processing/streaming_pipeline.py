@@ -0,0 +1,171 @@
+"""
+Streaming pipeline
+Postings flow from the sources through dedup, skill and seniority tagging and salary parsing as
+generator stages into an aggregate cube merged batch by batch, so peak memory depends on the
+batch size and the number of cells rather than on how many postings are harvested. The
+dashboard aggregates are the cube's projections, and the salary model is trained from the job store
+"""
+
+import os
+from collections import Counter
+from itertools import islice
+
+from aggregate_cube import AggregateCube
+from analysis_engine import build_jobs_frame, classify_remote
+from dedup import StreamingDeduplicator
+from job_store import JobStore
+from parquet_export import JobsDatasetWriter
+from run_report import RUN_PROFILER
+from salary_reference import get_salary_reference
+from salary_model import train_from_store
+from salary_normalization import salary_stage
+from seniority import SENIORITY_CLASSIFIER
+from skill_tagger import SKILL_TAGGER
+
+SAMPLE_SIZE = 10
+
+
+def batched(items, size):
+    """Lists of up to size consecutive items"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def tag_stage(jobs):
+    """Attach canonical skills, the work arrangement and the seniority level to each posting"""
+    for job in jobs:
+        text = f"{job.get('title') or ''} {job.get('description') or ''}"
+        job['skills'] = SKILL_TAGGER.tag(text)
+        job['remote'] = classify_remote(text)
+        job['seniority'] = SENIORITY_CLASSIFIER.classify(job.get('title'), job.get('description'))
+        yield job
+
+
+class StreamingAggregator:
+    """Run totals and sample postings; every salary aggregate comes from the aggregate cube"""
+
+    def __init__(self):
+        self.total = 0
+        self.sources = set()
+        self.sample_jobs = []
+
+    def add(self, job):
+        self.total += 1
+        self.sources.add(job.get('source', 'Unknown'))
+        if len(self.sample_jobs) < SAMPLE_SIZE:
+            self.sample_jobs.append({key: value for key, value in job.items() if key not in ('skills', 'remote', 'seniority')})
+
+
+def process_streaming_data(fetcher, batch_size=None):
+    """Streaming counterpart of process_enhanced_data, returning the same structure"""
+    print("📡 Streaming enhanced UK job market data...")
+    batch_size = batch_size or int(os.environ.get('STREAM_BATCH_SIZE', 5000))
+
+    deduplicator = StreamingDeduplicator(window=int(os.environ.get('STREAM_DEDUP_WINDOW', 50000)))
+    aggregator = StreamingAggregator()
+
+    store = None
+    if fetcher.fetch_mode != 'replay' and os.environ.get('JOB_STORE', '1') != '0':
+        store = JobStore()
+    writer = None
+    if os.environ.get('JOBS_EXPORT', '1') != '0':
+        try:
+            writer = JobsDatasetWriter()
+        except ImportError:
+            print("⚠️ pyarrow not installed, skipping Parquet export")
+
+    reference = get_salary_reference() if os.environ.get('SALARY_IMPUTE', '0') != '0' else None
+    # Group outlier tests need every salary of a group, so streaming only annualizes and bounds
+    salary_rules = Counter()
+    jobs = salary_stage(tag_stage(deduplicator.filter(fetcher.stream_all_sources())), reference, salary_rules)
+    changes = Counter()
+    cube = None
+    # Fetching, dedup, tagging and aggregation interleave, so the stream is timed as one stage
+    with RUN_PROFILER.stage('stream') as stage:
+        for batch in batched(jobs, batch_size):
+            for job in batch:
+                aggregator.add(job)
+            if store:
+                changes.update(store.upsert(batch))
+            skill_hits = SKILL_TAGGER.index_matrix(
+                [SKILL_TAGGER.skill_index[skill] for skill in job['skills']] for job in batch
+            )
+            batch_df = build_jobs_frame(batch)
+            # Batch cubes merge exactly, so the run's cube never needs every posting at once
+            batch_cube = AggregateCube.from_columns(
+                batch_df['salary_avg'].to_numpy(dtype=float), batch_df['location'].to_numpy(),
+                [job['remote'] for job in batch], skill_hits, [job['seniority'] for job in batch]
+            )
+            cube = cube.merge(batch_cube) if cube else batch_cube
+            if writer:
+                writer.write(batch_df, skill_hits)
+        stage['records'] = aggregator.total
+        stage['salary_rules'] = dict(salary_rules)
+
+    if cube is not None:
+        print(f"🧊 Aggregate cube of {len(cube)} cells")
+        if os.environ.get('CUBE_EXPORT', '1') != '0':
+            with RUN_PROFILER.stage('cube_export') as stage:
+                cube_path = cube.save()
+                stage['records'] = len(cube)
+            print(f"💾 Aggregate cube saved to {cube_path}")
+
+    if writer:
+        writer.close()
+    salary_model = None
+    if store:
+        print(f"🗄️ Job store: {changes['new']} new, {changes['changed']} changed, "
+              f"{changes['unchanged']} unchanged ({store.count()} stored)")
+        # The model needs every salaried posting at once, which only the store holds
+        with RUN_PROFILER.stage('salary_model') as stage:
+            salary_model = train_from_store(store)
+            stage['records'] = salary_model.training_rows if salary_model else 0
+        if salary_model:
+            print(f"🤖 Salary model trained on {salary_model.training_rows} stored postings (R² {salary_model.r2:.2f})")
+        store.close()
+    else:
+        print("⚠️ No job store (replay or JOB_STORE=0), skipping the salary model in streaming mode")
+
+    if deduplicator.dropped:
+        breakdown = ', '.join(f"{source}: {count}" for source, count in sorted(deduplicator.dropped.items()))
+        print(f"🧹 Removed {sum(deduplicator.dropped.values())} near-duplicate jobs ({breakdown})")
+    if salary_rules:
+        print(f"💷 Salary normalization: {', '.join(f'{rule} {count}' for rule, count in sorted(salary_rules.items()))}")
+    print(f"✅ Streamed {aggregator.total} unique job listings")
+    if fetcher.http_cache:
+        print(f"💾 HTTP cache: {fetcher.http_cache.summary()}")
+
+    itjobs_data = fetcher.itjobs_data or []
+    additional_insights = fetcher.additional_insights
+    print(f"✅ Processed {len(itjobs_data)} technology trends")
+    print(f"✅ Additional insights from {len(additional_insights)} sources")
+
+    data_sources = ['IT Jobs Watch'] if itjobs_data else []
+    data_sources.extend(sorted(source for source in aggregator.sources if source != 'Unknown'))
+    data_sources.extend(additional_insights.keys())
+
+    # The same cube projections as the batch pipeline, so both modes report identical panels
+    cube = cube or AggregateCube.from_columns([], [], [], SKILL_TAGGER.index_matrix([]), [])
+    median = cube.median_salary()
+    return {
+        'language_salaries': cube.language_salaries(itjobs_data),
+        'location_data': cube.location_data(),
+        'remote_trends': cube.remote_trends(),
+        'experience_salaries': cube.experience_salaries(),
+        'market_overview': {
+            'total_jobs_analyzed': aggregator.total,
+            'average_salary_uk': int(median) if median is not None else 62000,
+            'data_sources': data_sources,
+            'data_quality': 'enhanced' if aggregator.total > 50 else 'standard',
+            'additional_insights': additional_insights
+        },
+        'raw_data': {
+            'sample_jobs': aggregator.sample_jobs,
+            'technology_trends': itjobs_data
+        },
+        'salary_model': salary_model.to_dict() if salary_model else None
+    }
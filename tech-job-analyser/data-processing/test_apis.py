@@ -4,9 +4,10 @@ Test script to verify API credentials and connectivity
 """
 
 import os
-import requests
 from dotenv import load_dotenv
 
+from fetch_archive import create_session, get_fetch_mode
+
 load_dotenv()
 
 def test_adzuna_api():
@@ -14,6 +15,11 @@ def test_adzuna_api():
     app_id = os.environ.get('ADZUNA_APP_ID')
     app_key = os.environ.get('ADZUNA_APP_KEY')
     
+    # FETCH_MODE=record/replay shares the fixture archive used by process_data.py
+    session = create_session()
+    if get_fetch_mode() == 'replay':
+        app_id, app_key = app_id or 'replay', app_key or 'replay'
+    
     print("🔍 Testing Adzuna API...")
     print(f"App ID: {app_id[:8] + '...' if app_id else 'NOT FOUND'}")
     print(f"App Key: {app_key[:8] + '...' if app_key else 'NOT FOUND'}")
@@ -31,7 +37,7 @@ def test_adzuna_api():
             'content-type': 'application/json'
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = session.get(url, params=params, timeout=10)
         print(f"API Response Status: {response.status_code}")
         
         if response.status_code == 200:
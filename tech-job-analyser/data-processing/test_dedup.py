@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Regression checks: near-duplicate detection must not chain different employers, places or
+seniority levels into one cluster
+"""
+
+from dedup import StreamingDeduplicator, deduplicate_jobs
+
+DESCRIPTION = 'Java consultancy work across banking clients, hybrid working from the local office.'
+
+
+def _posting(title, company, location, salary=60000, source='Adzuna'):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'salary_min': salary,
+        'salary_max': salary,
+        'salary_avg': salary,
+        'description': DESCRIPTION,
+        'source': source
+    }
+
+
+def _both_modes(jobs):
+    """Postings kept by the batch and by the streaming deduplicator"""
+    unique, _ = deduplicate_jobs(jobs)
+    streamed = list(StreamingDeduplicator(window=100).filter(jobs))
+    return unique, streamed
+
+
+def test_company_subset_does_not_bridge_employers():
+    """'Analytics Ltd' in Remote is a token subset of both employers and matches any location"""
+    jobs = [
+        _posting('Senior Java Consultant', 'Signal Analytics Ltd', 'Manchester'),
+        _posting('Senior Java Consultant', 'Analytics Ltd', 'Remote'),
+        _posting('Senior Java Consultant', 'Apex Analytics', 'London')
+    ]
+    for kept in _both_modes(jobs):
+        assert len(kept) == 3, f"employers merged: {[job['company'] for job in kept]}"
+
+
+def test_generic_location_does_not_bridge_places():
+    """A Remote copy may join one city's posting but cannot link Manchester to London"""
+    jobs = [
+        _posting('Senior Java Consultant', 'Signal Analytics', 'Manchester'),
+        _posting('Senior Java Consultant', 'Signal Analytics Ltd', 'Remote', source='Reed'),
+        _posting('Senior Java Consultant', 'Signal Analytics', 'London', source='Totaljobs')
+    ]
+    for kept in _both_modes(jobs):
+        locations = {job['location'] for job in kept}
+        assert {'Manchester', 'London'} <= locations, f"places merged: {sorted(locations)}"
+
+
+def test_seniority_levels_stay_apart():
+    """Title 3-grams alone put these two above the similarity threshold"""
+    jobs = [
+        _posting('Senior JavaScript Consultant', 'Signal Analytics', 'Manchester', salary=45000),
+        _posting('JavaScript Consultant', 'Signal Analytics', 'Manchester', salary=30000)
+    ]
+    for kept in _both_modes(jobs):
+        assert len(kept) == 2, f"levels merged: {[job['title'] for job in kept]}"
+
+
+def test_syndicated_copy_is_merged():
+    jobs = [
+        _posting('Senior Java Consultant - Manchester', 'Signal Analytics', 'Manchester'),
+        _posting('Senior Java Consultant Manchester', 'Signal Analytics Ltd', 'Salford, Greater Manchester', source='Reed')
+    ]
+    for kept in _both_modes(jobs):
+        assert len(kept) == 1, f"copy kept: {[job['source'] for job in kept]}"
+
+
+if __name__ == "__main__":
+    print("🔍 Testing near-duplicate detection...")
+    test_company_subset_does_not_bridge_employers()
+    test_generic_location_does_not_bridge_places()
+    test_seniority_levels_stay_apart()
+    test_syndicated_copy_is_merged()
+    print("✅ Duplicates merged, distinct postings kept")
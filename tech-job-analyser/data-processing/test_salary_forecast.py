@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Regression check: raw day-rate postings in the job store must not move the salary forecast
+"""
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from job_store import JobStore
+from postings import JobPosting
+from salary_forecast import build_forecasts
+
+WEEKS = 12
+START = datetime(2024, 1, 1)
+
+
+def _posting(number, salary, title='Python Developer'):
+    return JobPosting.from_dict({
+        'title': title,
+        'company': f'Company {number}',
+        'location': 'Manchester',
+        'salary_min': None,
+        'salary_max': None,
+        'salary_avg': salary,
+        'description': 'Python and SQL, hybrid working',
+        'source': 'Adzuna'
+    })
+
+
+def _salary_forecast(store):
+    forecasts = build_forecasts(store.weekly_stats(), target_year=2025)
+    return {
+        'overall': forecasts['overall'],
+        'skills': forecasts['skills'],
+        'locations': forecasts['locations'],
+        'history': [record['average_salary'] for record in forecasts['history']]
+    }
+
+
+def _fill(store):
+    rng = random.Random(7)
+    for week in range(WEEKS):
+        salaries = [rng.gauss(55000 + 400 * week, 4000) for _ in range(30)]
+        store.upsert([_posting(f'{week}-{i}', salary) for i, salary in enumerate(salaries)],
+                     seen_at=START + timedelta(weeks=week))
+
+
+def test_day_rates_do_not_move_forecast():
+    """A week of unnormalized £550 day rates, as batch runs used to record, leaves every salary series unchanged"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = JobStore(os.path.join(directory, 'job_store.sqlite'))
+        try:
+            _fill(store)
+            before = _salary_forecast(store)
+
+            store.upsert([_posting(f'contract-{i}', 550.0, 'Python Contractor') for i in range(40)],
+                         seen_at=START + timedelta(weeks=WEEKS // 2))
+            after = _salary_forecast(store)
+        finally:
+            store.close()
+
+    assert before['overall'] is not None
+    assert after == before, f"forecast moved: {before} -> {after}"
+
+
+def test_legacy_weekly_stats_are_rebuilt():
+    """Weekly sums written before day rates were kept out are recomputed when the store is opened"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'job_store.sqlite')
+        store = JobStore(path)
+        try:
+            _fill(store)
+            before = _salary_forecast(store)
+            with store.db:
+                store.db.execute("UPDATE weekly_stats SET salaried = salaried + 40, salary_sum = salary_sum + 40 * 550")
+                store.db.execute("PRAGMA user_version = 0")
+        finally:
+            store.close()
+
+        store = JobStore(path)
+        try:
+            after = _salary_forecast(store)
+        finally:
+            store.close()
+
+    assert after == before, f"forecast moved: {before} -> {after}"
+
+
+if __name__ == "__main__":
+    print("🔍 Testing salary forecast against day-rate postings...")
+    test_day_rates_do_not_move_forecast()
+    test_legacy_weekly_stats_are_rebuilt()
+    print("✅ Forecast unchanged")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Regression check: the history salary reference reports the median of a skill's salaries, not their mean
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from job_store import JobStore
+from postings import JobPosting
+from salary_normalization import mad_outliers
+from salary_reference import SalaryReference
+
+# Right-skewed like real pay: most postings near 45k, a tail of well-paid ones
+SALARIES = [38000 + 1000 * i for i in range(20)] + [70000 + 6000 * i for i in range(10)]
+
+
+def _posting(number, salary):
+    return JobPosting.from_dict({
+        'title': 'Python Developer',
+        'company': f'Company {number}',
+        'location': 'Leeds',
+        'salary_min': None,
+        'salary_max': None,
+        'salary_avg': salary,
+        'description': 'Python services, hybrid working',
+        'source': 'Adzuna'
+    })
+
+
+def test_history_reference_uses_median():
+    """On skewed salaries the mean is pulled up by the tail; the third entry must be the median"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = JobStore(os.path.join(directory, 'job_store.sqlite'))
+        try:
+            store.upsert([_posting(i, salary) for i, salary in enumerate(SALARIES)], seen_at=datetime(2024, 3, 4))
+            low, high, median = SalaryReference.from_job_store(store).get('Python')
+        finally:
+            store.close()
+
+    salaries = np.array(SALARIES, dtype=float)
+    kept = salaries[~mad_outliers(salaries, np.zeros(len(salaries), dtype=int))]
+    assert median == int(np.median(kept)), f"median {median}, expected {np.median(kept)}"
+    assert median < kept.mean() and low < median < high
+
+
+if __name__ == "__main__":
+    print("🔍 Testing history salary reference on skewed salaries...")
+    test_history_reference_uses_median()
+    print("✅ Median reported")
@@ -84,7 +84,7 @@ const Dashboard = () => {
           </div>
           
           <div>
-            <UKSalaryPredictor />
+            <UKSalaryPredictor model={data.salary_model} />
           </div>
           
           <div>
@@ -30,7 +30,9 @@ const ExperienceAnalysis = ({ data }) => {
                 </div>
                 <div>
                   <h3 className="font-semibold text-gray-900">{item.level}</h3>
-                  <span className="text-sm text-gray-500">{item.growth} stage</span>
+                  <span className="text-sm text-gray-500">
+                    {item.growth ? `${item.growth} stage` : `${item.count?.toLocaleString()} postings`}
+                  </span>
                 </div>
               </div>
               <div className="text-right">
@@ -20,9 +20,14 @@ const MarketInsights = ({ data }) => {
         <div className="space-y-3">
           {data.salary_trends?.map((trend, index) => (
             <div key={trend.year} className="flex justify-between items-center">
-              <span className="text-gray-600">{trend.year}</span>
+              <span className="text-gray-600">{trend.year}{trend.forecast && ' (forecast)'}</span>
               <div className="text-right">
                 <div className="font-semibold text-gray-900">£{trend.average_salary?.toLocaleString()}</div>
+                {trend.forecast && trend.salary_lower != null && (
+                  <div className="text-xs text-gray-400">
+                    95% range £{trend.salary_lower.toLocaleString()}–£{trend.salary_upper.toLocaleString()}
+                  </div>
+                )}
                 <div className="text-sm text-gray-500">{trend.remote_percentage}% remote</div>
               </div>
             </div>
@@ -1,6 +1,25 @@
 import React, { useState } from 'react';
 
-const UKSalaryPredictor = () => {
+// Experience option -> seniority level of the exported salary model
+const experienceLevels = {
+  'Graduate (0-1 yrs)': 'graduate',
+  'Junior (1-3 yrs)': 'junior',
+  'Mid-level (3-5 yrs)': 'mid',
+  'Senior (5-8 yrs)': 'senior',
+  'Lead (8+ yrs)': 'lead',
+  'Principal (10+ yrs)': 'principal'
+};
+
+// Log-salary model exported by process_data.py: sum the weights and exponentiate
+const predictFromModel = (model, { experience, location, skills }) => {
+  const logSalary = model.intercept
+    + (model.seniority[experienceLevels[experience]] || 0)
+    + (model.locations[location] || 0)
+    + skills.reduce((total, skill) => total + (model.skills[skill] || 0), 0);
+  return Math.exp(logSalary);
+};
+
+const UKSalaryPredictor = ({ model }) => {
   const [formData, setFormData] = useState({
     experience: '',
     location: '',
@@ -26,7 +45,8 @@ const UKSalaryPredictor = () => {
     'Junior (1-3 yrs)', 
     'Mid-level (3-5 yrs)',
     'Senior (5-8 yrs)',
-    'Lead (8+ yrs)'
+    'Lead (8+ yrs)',
+    'Principal (10+ yrs)'
   ];
 
   const handleSkillToggle = (skill) => {
@@ -38,7 +58,14 @@ const UKSalaryPredictor = () => {
     }));
   };
 
+  const hasModel = model?.intercept != null;
+
   const predictSalary = () => {
+    if (hasModel) {
+      setPrediction(Math.round(predictFromModel(model, formData) / 500) * 500);
+      return;
+    }
+
     // ML-like prediction algorithm based on UK market data
     let baseSalary = 28000; // Graduate base (UK-adjusted)
     
@@ -48,7 +75,8 @@ const UKSalaryPredictor = () => {
       'Junior (1-3 yrs)': 1.35,
       'Mid-level (3-5 yrs)': 1.85,
       'Senior (5-8 yrs)': 2.4,
-      'Lead (8+ yrs)': 2.9
+      'Lead (8+ yrs)': 2.9,
+      'Principal (10+ yrs)': 3.4
     };
     
     // Location adjustment (UK-specific)
@@ -93,7 +121,7 @@ const UKSalaryPredictor = () => {
     }
     
     // Add premium for senior+ roles with high-demand skills
-    if ((formData.experience === 'Senior (5-8 yrs)' || formData.experience === 'Lead (8+ yrs)') && 
+    if (['Senior (5-8 yrs)', 'Lead (8+ yrs)', 'Principal (10+ yrs)'].includes(formData.experience) &&
         formData.skills.some(skill => ['Machine Learning', 'Kubernetes', 'Go', 'Rust'].includes(skill))) {
       predicted *= 1.08;
     }
@@ -194,7 +222,9 @@ const UKSalaryPredictor = () => {
                 <span>🛠 {formData.skills.length} skills</span>
               </div>
               <div className="mt-2 text-xs text-gray-500">
-                Based on analysis of 100+ UK tech job listings
+                {hasModel
+                  ? `Model trained on ${model.training_rows.toLocaleString()} UK tech job listings`
+                  : 'Based on analysis of 100+ UK tech job listings'}
               </div>
             </div>
           </div>